@@ -1,9 +1,8 @@
-import os
 from ._version import VERSION
 from ._stub_generator import StubGenerator
 from ._token import Token
 from ._token_kind import TokenKind
-from ._apiview import ApiView, Navigation, NavigationTag, Kind
+from ._apiview import ApiView, APIViewSerializer, Navigation, NavigationTag, Kind
 from ._diagnostic import Diagnostic
 
 __version__ = VERSION
@@ -13,6 +12,7 @@ __all__ = [
     "Token",
     "TokenKind",
     "ApiView",
+    "APIViewSerializer",
     "Navigation",
     "NavigationTag",
     "Kind",
@@ -22,15 +22,13 @@ __all__ = [
 
 def console_entry_point():
     stub_generator = StubGenerator()
-    apiview = stub_generator.generate_tokens()
-    json_tokens = stub_generator.serialize(apiview)
-    # Write to JSON file
-    out_file_path = stub_generator.out_path
-    # Generate JSON file name if outpath doesn't have json file name
-    if not out_file_path.endswith(".json"):
-        out_file_path = os.path.join(
-            stub_generator.out_path, "{0}_python.json".format(apiview.Name)
-        )
-    with open(out_file_path, "w") as json_file:
-        json_file.write(json_tokens)
+    if stub_generator.batch:
+        stub_generator.generate_batch()
+        return
+    stub_generator.generate_token_file()
 
+
+def server_entry_point():
+    from ._server import main
+
+    main()
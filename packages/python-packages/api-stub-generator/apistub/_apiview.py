@@ -3,7 +3,7 @@ from json import JSONEncoder
 import logging
 import re
 import importlib
-import inspect
+import shutil
 
 from ._token import Token
 from ._token_kind import TokenKind
@@ -15,6 +15,11 @@ JSON_FIELDS = ["Name", "Version", "VersionString", "Navigation", "Tokens", "Diag
 HEADER_TEXT = "# Package is parsed using api-stub-generator(version:{})".format(VERSION)
 TYPE_NAME_REGEX = re.compile("(~?[a-zA-Z\d._]+)")
 TYPE_OR_SEPERATOR = " or "
+# Number of tokens encoded at a time when writing API view into a file
+TOKEN_CHUNK_SIZE = 10000
+
+# Member names of modules imported to validate type names. Value is None if module failed to import
+_module_members = {}
 
 # Lint warnings
 SOURCE_LINK_NOT_AVAILABLE = "Source definition link is not available for [{0}]. Please check and ensure type is fully qualified name in docstring"
@@ -27,9 +32,11 @@ class ApiView:
     :param str: pkg_name
     :param str: pkg_version
     :param str: ver_string
+    :param list: sinks
+        Sinks that receive each token added to API view to generate other outputs in same pass
     """
 
-    def __init__(self, nodeindex, pkg_name="", pkg_version="", namespace = ""):
+    def __init__(self, nodeindex, pkg_name="", pkg_version="", namespace = "", sinks=None):
         self.Name = pkg_name
         self.Version = 0
         self.VersionString = ""
@@ -41,11 +48,17 @@ class ApiView:
         self.namespace = namespace
         self.nodeindex = nodeindex
         self.PackageName = pkg_name
+        # Tokens and diagnostics generated for a type name are cached as template to reuse for same type name
+        self._type_token_cache = {}
+        self.sinks = list(sinks or [])
         self.add_literal(HEADER_TEXT)
         self.add_new_line(2)
 
     def add_token(self, token):
         self.Tokens.append(token)
+        if self.sinks:
+            for sink in self.sinks:
+                sink.add_token(token)
 
     def begin_group(self, group_name=""):
         """Begin a new group in API view by shifting to right
@@ -102,6 +115,46 @@ class ApiView:
         if not type_name:
             return
 
+        # Diagnostics are generated only if line ID is available so line ID is part of the cache key
+        cache_key = (type_name, bool(line_id))
+        template = self._type_token_cache.get(cache_key)
+        if template is None:
+            self._type_token_cache[cache_key] = self._create_type_template(type_name, line_id)
+            return
+
+        tokens, diagnostics, lookups = template
+        for value, kind, navigate_to_id in tokens:
+            token = Token(value, kind)
+            token.NavigateToId = navigate_to_id
+            self.add_token(token)
+        for text in diagnostics:
+            self.add_diagnostic(text, line_id)
+        # Names looked up in node index are recorded same as generating tokens for the type again
+        if self.nodeindex.lookups is not None:
+            self.nodeindex.lookups.update(lookups)
+
+
+    def _create_type_template(self, type_name, line_id):
+        # Generate tokens for type and return generated tokens, diagnostics and node index lookups as template
+        token_start = len(self.Tokens)
+        diagnostic_start = len(self.Diagnostics)
+        outer_lookups = self.nodeindex.lookups
+        self.nodeindex.lookups = {}
+        try:
+            self._tokenize_type(type_name, line_id)
+            lookups = self.nodeindex.lookups
+        finally:
+            self.nodeindex.lookups = outer_lookups
+        if outer_lookups is not None:
+            outer_lookups.update(lookups)
+        return (
+            [(t.Value, t.Kind, t.NavigateToId) for t in self.Tokens[token_start:]],
+            [d.Text for d in self.Diagnostics[diagnostic_start:]],
+            lookups,
+        )
+
+
+    def _tokenize_type(self, type_name, line_id):
         type_name = type_name.replace(":class:", "")
         logging.debug("Processing type {}".format(type_name))
         # Check if multiple types are listed with 'or' seperator
@@ -196,14 +249,15 @@ class APIViewEncoder(JSONEncoder):
                     if key in obj.__dict__:
                         obj_dict[key] = obj.__dict__[key]
             elif isinstance(obj, Token):
-                obj_dict = obj.__dict__
+                obj_dict["Kind"] = obj.Kind
                 # Remove properties from serialization to reduce size if property is not set
-                if not obj.DefinitionId:
-                    del obj_dict["DefinitionId"]
-                if not obj.NavigateToId:
-                    del obj_dict["NavigateToId"]
+                if obj.DefinitionId:
+                    obj_dict["DefinitionId"] = obj.DefinitionId
+                if obj.NavigateToId:
+                    obj_dict["NavigateToId"] = obj.NavigateToId
+                obj_dict["Value"] = obj.Value
             elif isinstance(obj, Diagnostic):
-                obj_dict = obj.__dict__
+                obj_dict = dict(obj.__dict__)
                 if not obj.HelpLinkUri:
                     del obj_dict["HelpLinkUri"]
             else:
@@ -220,6 +274,137 @@ class APIViewEncoder(JSONEncoder):
                 return obj_dict
 
 
+class APIViewSerializer:
+    """Serializer to generate json for APIview object.
+    Each type is converted to a dictionary using a precomputed plan of fields for that type instead of checking
+    type of every object. JSON generated by this serializer is same as APIViewEncoder when json module is used.
+    :param bool: use_orjson
+        Use orjson to encode if it is installed. orjson generates compact json without whitespace between items
+    """
+
+    def __init__(self, use_orjson=False):
+        self._plan = {
+            ApiView: _serialize_apiview,
+            Token: _serialize_token,
+            Navigation: _serialize_navigation,
+            NavigationTag: _serialize_navigation_tag,
+            Diagnostic: _serialize_diagnostic,
+            TokenKind: _serialize_enum,
+        }
+        self._dumps = None
+        if use_orjson:
+            try:
+                import orjson
+
+                self._dumps = lambda obj: orjson.dumps(obj, default=self._default).decode("utf-8")
+            except ImportError:
+                logging.warning("orjson is not installed. Tokens are serialized using json module")
+        if not self._dumps:
+            self._dumps = JSONEncoder(default=self._default).encode
+
+    def encode(self, obj):
+        return self._dumps(obj)
+
+    def _default(self, obj):
+        serialize = self._plan.get(type(obj))
+        if serialize is None:
+            serialize = self._find_plan(obj)
+        return serialize(obj)
+
+    def _find_plan(self, obj):
+        # Find plan for sub class using base classes and keep it for next objects of same type
+        for base in type(obj).__mro__:
+            if base in self._plan:
+                self._plan[type(obj)] = self._plan[base]
+                return self._plan[base]
+        raise TypeError("Object of type {} is not JSON serializable".format(type(obj).__name__))
+
+
+def _serialize_apiview(apiview):
+    # Remove fields in APIview that are not required in json
+    return dict((key, apiview.__dict__[key]) for key in JSON_FIELDS if key in apiview.__dict__)
+
+
+def _serialize_token(token):
+    obj_dict = {"Kind": token.Kind.value}
+    # Remove properties from serialization to reduce size if property is not set
+    if token.DefinitionId:
+        obj_dict["DefinitionId"] = token.DefinitionId
+    if token.NavigateToId:
+        obj_dict["NavigateToId"] = token.NavigateToId
+    obj_dict["Value"] = token.Value
+    return obj_dict
+
+
+def _serialize_navigation(navigation):
+    return {
+        "Text": navigation.Text,
+        "NavigationId": navigation.NavigationId,
+        "ChildItems": navigation.ChildItems,
+        "Tags": navigation.Tags,
+    }
+
+
+def _serialize_navigation_tag(tag):
+    return {"TypeKind": tag.TypeKind}
+
+
+def _serialize_diagnostic(diagnostic):
+    obj_dict = {"DiagnosticId": diagnostic.DiagnosticId, "Text": diagnostic.Text}
+    if diagnostic.HelpLinkUri:
+        obj_dict["HelpLinkUri"] = diagnostic.HelpLinkUri
+    obj_dict["TargetId"] = diagnostic.TargetId
+    return obj_dict
+
+
+def _serialize_enum(value):
+    return value.value
+
+
+def write_apiview(apiview, file, json_encoder=None, chunk_size=TOKEN_CHUNK_SIZE, encoded_tokens=None):
+    """Write API view as JSON into a file handle. Tokens are encoded and written in chunks so complete JSON string
+    is never created in memory. Written JSON is same as JSON returned by encoder for API view.
+    :param ApiView: apiview
+    :param file: file
+        File handle opened in text mode
+    :param json_encoder: json_encoder
+        Encoder to encode fields of API view. APIViewSerializer is used if encoder is not passed
+    :param int: chunk_size
+        Number of tokens to encode at a time
+    :param file: encoded_tokens
+        File handle to read tokens already encoded as comma separated JSON values. Tokens in API view are encoded
+        if this is not passed
+    """
+    if json_encoder is None:
+        json_encoder = APIViewSerializer()
+    file.write("{")
+    fields = [key for key in JSON_FIELDS if key in apiview.__dict__]
+    for index, key in enumerate(fields):
+        if index:
+            file.write(", ")
+        file.write(json_encoder.encode(key))
+        file.write(": ")
+        if key == "Tokens" and encoded_tokens is not None:
+            file.write("[")
+            shutil.copyfileobj(encoded_tokens, file)
+            file.write("]")
+        elif key == "Tokens":
+            _write_list_in_chunks(apiview.Tokens, file, json_encoder, chunk_size)
+        else:
+            file.write(json_encoder.encode(apiview.__dict__[key]))
+    file.write("}")
+
+
+def _write_list_in_chunks(values, file, json_encoder, chunk_size):
+    file.write("[")
+    for start in range(0, len(values), chunk_size):
+        if start:
+            file.write(", ")
+        # Remove enclosing brackets from encoded list of values in the chunk
+        file.write(json_encoder.encode(values[start:start + chunk_size])[1:-1])
+    file.write("]")
+
+
 class NavigationTag:
     def __init__(self, kind):
         self.TypeKind = kind
@@ -250,13 +435,32 @@ class Navigation:
 
 
 def is_valid_type_name(type_name):
-    try:
-        module_end_index = type_name.rfind(".")
-        if module_end_index > 0:
-            module_name = type_name[:module_end_index]
-            class_name = type_name[module_end_index+1:]
-            mod = importlib.import_module(module_name)
-            return class_name in [x[0] for x in inspect.getmembers(mod)]
-    except:
-        logging.error("Failed to import {}".format(type_name))    
+    module_end_index = type_name.rfind(".")
+    if module_end_index > 0:
+        module_name = type_name[:module_end_index]
+        class_name = type_name[module_end_index+1:]
+        members = _get_module_members(module_name)
+        if members is not None:
+            return class_name in members
+        logging.error("Failed to import {}".format(type_name))
     return False
+
+
+def clear_module_members():
+    """Remove member names of modules cached while validating type names in earlier run
+    """
+    _module_members.clear()
+
+
+def _get_module_members(module_name):
+    # Returns set of member names in module or None if module cannot be imported
+    # Result is cached for each module including failed imports to avoid importing and inspecting module again
+    if module_name not in _module_members:
+        import inspect
+
+        try:
+            mod = importlib.import_module(module_name)
+            _module_members[module_name] = set(x[0] for x in inspect.getmembers(mod))
+        except:
+            _module_members[module_name] = None
+    return _module_members[module_name]
@@ -0,0 +1,125 @@
+# --------------------------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for license information.
+# --------------------------------------------------------------------------------------------
+
+import io
+import json
+import logging
+import multiprocessing
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from ._diagnostic import Diagnostic
+
+PACKAGE_FILE_EXTENSIONS = (".whl", ".zip")
+SUMMARY_FILE_NAME = "apistub_batch_summary.json"
+
+
+def find_batch_packages(batch_path):
+    """Returns package files to parse in batch mode
+    :param str: batch_path
+        Directory of wheel and sdist packages or a manifest file that lists path to a package in each line.
+        Relative paths in manifest are relative to the directory of manifest file.
+    """
+    if os.path.isdir(batch_path):
+        return sorted(
+            os.path.join(batch_path, x) for x in os.listdir(batch_path) if x.endswith(PACKAGE_FILE_EXTENSIONS)
+        )
+
+    manifest_dir = os.path.dirname(os.path.abspath(batch_path))
+    packages = []
+    with io.open(batch_path, "r", encoding="utf-8") as manifest:
+        for line in manifest:
+            line = line.strip()
+            # Skip empty lines and comments
+            if line and not line.startswith("#"):
+                packages.append(os.path.join(manifest_dir, line))
+    return packages
+
+
+class BatchGenerator:
+    """Generates token files for many packages using a pool of worker processes.
+    Worker processes are reused for multiple packages so start up cost of interpreter and api stub generator is paid
+    only once for each worker. Packages installed into current environment are installed and inspected one at a time
+    since pip cannot install packages into same environment in parallel and an install can change modules imported by
+    another worker. Packages are parsed in parallel with `--static`, `--skip-install` or `--venv-pool`.
+    :param list: packages
+        Path to package files
+    :param function: get_args
+        Function that returns command line arguments to generate token file for a package
+    :param int: jobs
+        Max number of packages to parse in parallel
+    """
+
+    def __init__(self, packages, get_args, jobs):
+        self.packages = packages
+        self.get_args = get_args
+        self.jobs = jobs
+
+    def generate(self):
+        """Generate token files and return summary of each package in same order as packages
+        """
+        logging.info("Generating token files for {0} packages using {1} workers".format(len(self.packages), self.jobs))
+        install_lock = multiprocessing.Lock()
+        with ProcessPoolExecutor(
+            max_workers=self.jobs,
+            initializer=init_worker,
+            initargs=(logging.getLogger().level, install_lock),
+        ) as executor:
+            return list(executor.map(generate_package, [self.get_args(x) for x in self.packages]))
+
+
+def write_summary(summary, out_path):
+    """Write summary of batch into a json file in out path and print it to console
+    :param list: summary
+    :param str: out_path
+    """
+    summary_path = os.path.join(out_path, SUMMARY_FILE_NAME)
+    with io.open(summary_path, "w", encoding="utf-8") as summary_file:
+        json.dump(summary, summary_file, indent=2)
+
+    print("************************** Batch Summary **************************")
+    for result in summary:
+        status = "Failed: {}".format(result["Error"]) if result["Error"] else "Diagnostics: {}".format(
+            "n/a" if result["Diagnostics"] is None else result["Diagnostics"]
+        )
+        print("{0}  {1:.2f}s  {2}".format(os.path.basename(result["Package"]), result["Seconds"], status))
+    failed = len([x for x in summary if x["Error"]])
+    print("Parsed {0} packages. Failed: {1}. Summary: {2}".format(len(summary), failed, summary_path))
+
+
+def init_worker(log_level, install_lock):
+    """Initialize worker process that generates token files. Used by batch mode and server
+    :param int: log_level
+    :param Lock: install_lock
+        Lock shared by worker processes to install and inspect one package at a time
+    """
+    from ._stub_generator import StubGenerator
+
+    logging.getLogger().setLevel(log_level)
+    StubGenerator.install_lock = install_lock
+
+
+def generate_package(args):
+    """Generate token file for a package in worker process and return summary with token file path, time taken,
+    number of diagnostics and error if any. Used by batch mode and server
+    :param list: args
+        Command line arguments of api stub generator for the package
+    """
+    from ._stub_generator import StubGenerator
+
+    pkg_path = args[args.index("--pkg-path") + 1]
+    result = {"Package": pkg_path, "TokenFile": None, "Seconds": 0, "Diagnostics": None, "Error": None}
+    start_time = time.time()
+    # Diagnostic IDs are generated in each package same as parsing the package in a new process
+    Diagnostic.id_counter = 1
+    try:
+        stub_generator = StubGenerator(args)
+        result["TokenFile"], result["Diagnostics"] = stub_generator.generate_token_file()
+    except (Exception, SystemExit) as e:
+        logging.error("Failed to generate token file for {0}: {1}".format(pkg_path, e))
+        result["Error"] = str(e) or type(e).__name__
+    result["Seconds"] = round(time.time() - start_time, 3)
+    return result
@@ -0,0 +1,227 @@
+# --------------------------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for license information.
+# --------------------------------------------------------------------------------------------
+
+import hashlib
+import io
+import json
+import logging
+import os
+
+from ._apiview import Navigation, NavigationTag
+from ._diagnostic import Diagnostic
+from ._token import Token
+from ._token_kind import TokenKind
+from ._version import VERSION
+
+FINGERPRINT_FILE_EXTENSION = ".fingerprint.json"
+READ_CHUNK_SIZE = 1024 * 1024
+
+
+class IndexEntry:
+    """Node index entry of a module that is not inspected again. Only navigation ID of a node is required
+    to generate tokens for other modules
+    :param str: namespace_id
+    """
+
+    def __init__(self, namespace_id):
+        self.namespace_id = namespace_id
+
+
+class IncrementalState:
+    """Fingerprints of modules in previously generated token file.
+    Fingerprint of a module is the hash of source files that node tree of the module is created from, i.e. module
+    source and source of modules where it's members and their base classes are defined. Names looked up in node
+    index while generating tokens are also stored for each module. Tokens of a module are reused from previous
+    token file if fingerprint is same and all names looked up by the module are resolved to same navigation ID.
+    :param str: token_file_path
+        Path of token file. Fingerprints are stored next to token file
+    :param str: pkg_root_path
+    :param dict: options
+        Options used to generate tokens. Previous token file is reused only if it was generated using same options
+    :param PackageArchive: archive
+        Wheel or sdist that source files are read from if package is not extracted
+    """
+
+    def __init__(self, token_file_path, pkg_root_path, options, archive=None):
+        self.token_file_path = token_file_path
+        self.fingerprint_file_path = token_file_path + FINGERPRINT_FILE_EXTENSION
+        self.pkg_root_path = os.path.abspath(pkg_root_path)
+        self.options = dict(options, ApiStubVersion=VERSION)
+        self.previous_modules = {}
+        self.previous_apiview = None
+        self.modules = {}
+        self._file_hashes = {}
+        self.archive = archive
+
+    def load(self):
+        """Load fingerprints and token file generated earlier
+        """
+        if not os.path.exists(self.fingerprint_file_path) or not os.path.exists(self.token_file_path):
+            logging.info("Fingerprints of previous token file are not available. Generating tokens for all modules")
+            return
+        try:
+            with io.open(self.fingerprint_file_path, "r", encoding="utf-8") as fingerprint_file:
+                fingerprints = json.load(fingerprint_file)
+            if fingerprints.get("Options") != self.options:
+                logging.info("Previous token file was generated using different options")
+                return
+            if fingerprints.get("TokenFileHash") != _hash_file(self.token_file_path):
+                logging.info("Token file is modified after generating fingerprints")
+                return
+            with io.open(self.token_file_path, "r", encoding="utf-8") as token_file:
+                self.previous_apiview = json.load(token_file)
+            self.previous_modules = fingerprints["Modules"]
+        except (ValueError, KeyError, OSError):
+            logging.warning("Failed to load fingerprints from {}".format(self.fingerprint_file_path))
+            self.previous_modules = {}
+            self.previous_apiview = None
+
+    def find_unchanged_modules(self, modules):
+        """Returns modules with same fingerprint as in previous token file
+        :param list: modules
+        """
+        unchanged_modules = []
+        for m in modules:
+            previous = self.previous_modules.get(m)
+            if previous and previous["Fingerprint"] == self._get_fingerprint(previous["SourceFiles"]):
+                unchanged_modules.append(m)
+        logging.info("{0} of {1} modules are not changed".format(len(unchanged_modules), len(modules)))
+        return unchanged_modules
+
+    def add_index_entries(self, module_name, nodeindex):
+        """Add node index entries of a module that is not inspected again
+        """
+        for name, namespace_id in self.previous_modules[module_name]["Index"].items():
+            nodeindex.add(name, IndexEntry(namespace_id))
+
+    def remove_index_entries(self, module_name, nodeindex):
+        for name in self.previous_modules[module_name]["Index"]:
+            del nodeindex.index[name]
+
+    def is_lookup_valid(self, module_name, nodeindex):
+        """Returns True if all names looked up by module in previous run are resolved to same navigation ID
+        """
+        for name, navigation_id in self.previous_modules[module_name]["Lookups"].items():
+            if nodeindex.get_id(name) != navigation_id:
+                logging.debug("Navigation ID of {0} used in module {1} is changed".format(name, module_name))
+                return False
+        return True
+
+    def add_module(self, module_node, lookups, token_range, diagnostic_range, navigation_index):
+        """Add fingerprint of a module that is inspected in current run
+        :param ModuleNode: module_node
+        :param dict: lookups
+            Names looked up in node index while generating tokens for the module and navigation ID found
+        :param list: token_range
+        :param list: diagnostic_range
+        :param int: navigation_index
+            Index of module navigation in package navigation
+        """
+        source_files = sorted(self._get_relative_path(x) for x in module_node.source_files)
+        self.modules[module_node.namespace] = {
+            "Fingerprint": self._get_fingerprint(source_files),
+            "SourceFiles": source_files,
+            "Index": dict(
+                ("{0}.{1}".format(module_node.namespace, c.name), c.namespace_id) for c in module_node.child_nodes
+            ),
+            "Lookups": lookups,
+            "Tokens": token_range,
+            "Diagnostics": diagnostic_range,
+            "Navigation": navigation_index,
+        }
+
+    def copy_module(self, module_name, apiview, navigation):
+        """Copy tokens, diagnostics and navigation of an unchanged module from previous token file
+        :param str: module_name
+        :param ApiView: apiview
+        :param Navigation: navigation
+            Package level navigation
+        """
+        previous = self.previous_modules[module_name]
+        token_start = len(apiview.Tokens)
+        start, end = previous["Tokens"]
+        for token_dict in self.previous_apiview["Tokens"][start:end]:
+            token = Token(token_dict["Value"], TokenKind(token_dict["Kind"]))
+            token.DefinitionId = token_dict.get("DefinitionId")
+            token.NavigateToId = token_dict.get("NavigateToId")
+            apiview.add_token(token)
+
+        # Diagnostics are created again to generate diagnostic IDs in same order as generating all modules
+        diagnostic_start = len(apiview.Diagnostics)
+        start, end = previous["Diagnostics"]
+        for diagnostic_dict in self.previous_apiview["Diagnostics"][start:end]:
+            diagnostic = Diagnostic(diagnostic_dict["TargetId"], diagnostic_dict["Text"])
+            diagnostic.set_helplink(diagnostic_dict.get("HelpLinkUri", ""))
+            apiview.Diagnostics.append(diagnostic)
+
+        navigation_index = None
+        if previous["Navigation"] is not None:
+            navigation_index = len(navigation.ChildItems)
+            previous_navigation = self.previous_apiview["Navigation"][0]["ChildItems"][previous["Navigation"]]
+            navigation.add_child(_load_navigation(previous_navigation))
+
+        self.modules[module_name] = dict(
+            previous,
+            Tokens=[token_start, len(apiview.Tokens)],
+            Diagnostics=[diagnostic_start, len(apiview.Diagnostics)],
+            Navigation=navigation_index,
+        )
+
+    def save(self):
+        """Save fingerprints of all modules. This must be called after writing token file
+        """
+        fingerprints = {
+            "Options": self.options,
+            "TokenFileHash": _hash_file(self.token_file_path),
+            "Modules": self.modules,
+        }
+        temp_path = "{0}.{1}".format(self.fingerprint_file_path, os.getpid())
+        with io.open(temp_path, "w", encoding="utf-8") as fingerprint_file:
+            json.dump(fingerprints, fingerprint_file)
+        os.replace(temp_path, self.fingerprint_file_path)
+        logging.debug("Saved fingerprints into {}".format(self.fingerprint_file_path))
+
+    def _get_fingerprint(self, source_files):
+        sha = hashlib.sha256()
+        for source_file in source_files:
+            file_hash = self._get_file_hash(source_file)
+            if file_hash is None:
+                return None
+            sha.update("{0}:{1}\n".format(source_file, file_hash).encode("utf-8"))
+        return sha.hexdigest()
+
+    def _get_file_hash(self, source_file):
+        if source_file not in self._file_hashes:
+            path = os.path.join(self.pkg_root_path, source_file)
+            if self.archive and self.archive.contains(source_file):
+                self._file_hashes[source_file] = self.archive.get_hash(source_file)
+            else:
+                self._file_hashes[source_file] = _hash_file(path) if os.path.exists(path) else None
+        return self._file_hashes[source_file]
+
+    def _get_relative_path(self, path):
+        # Files within package are stored using relative path so fingerprints are valid when package is
+        # extracted to a different path
+        path = os.path.abspath(path)
+        if path.startswith(self.pkg_root_path + os.sep):
+            return os.path.relpath(path, self.pkg_root_path).replace(os.sep, "/")
+        return path
+
+
+def _hash_file(path):
+    sha = hashlib.sha256()
+    with open(path, "rb") as source_file:
+        for chunk in iter(lambda: source_file.read(READ_CHUNK_SIZE), b""):
+            sha.update(chunk)
+    return sha.hexdigest()
+
+
+def _load_navigation(navigation_dict):
+    navigation = Navigation(navigation_dict["Text"], navigation_dict["NavigationId"])
+    if navigation_dict.get("Tags"):
+        navigation.set_tag(NavigationTag(navigation_dict["Tags"]["TypeKind"]))
+    for child in navigation_dict["ChildItems"]:
+        navigation.add_child(_load_navigation(child))
+    return navigation
@@ -0,0 +1,99 @@
+# --------------------------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for license information.
+# --------------------------------------------------------------------------------------------
+
+import os
+
+INIT_PY_FILE = "__init__.py"
+
+
+class ModuleInfo:
+    """Module found in a package
+    :param str: name
+    :param str: source_file
+        Path of module source relative to package root using "/" as separator, same as source files in
+        fingerprints of incremental mode
+    :param bool: is_package
+    """
+
+    def __init__(self, name, source_file, is_package):
+        self.name = name
+        self.source_file = source_file
+        self.is_package = is_package
+
+    def __eq__(self, other):
+        return isinstance(other, ModuleInfo) and self.to_dict() == other.to_dict()
+
+    def __repr__(self):
+        return "ModuleInfo({0!r}, {1!r}, {2!r})".format(self.name, self.source_file, self.is_package)
+
+    def to_dict(self):
+        return {"Name": self.name, "SourceFile": self.source_file, "IsPackage": self.is_package}
+
+
+def find_modules(pkg_root_path, namespace=""):
+    """Find modules within namespace in package root path. Only directories that can contain modules within
+    namespace are scanned
+    :param str: pkg_root_path
+    :param str: namespace
+    :rtype: list
+    """
+    return collect_modules(lambda x: _list_directory(os.path.join(pkg_root_path, *x.split("/"))), namespace)
+
+
+def collect_modules(list_directory, namespace=""):
+    """Find modules using a function that returns names of sub directories and files in a directory of package.
+    Directories are visited in same order as os.walk. Directories with name starting with "_" or "." are skipped.
+    Directory with __init__.py is a module and public py files in it are its submodules. Directory without
+    __init__.py is a namespace package and public py files in it are modules if it's within a regular package.
+    Module name must start with namespace
+    :param function: list_directory
+        Called with directory path relative to package root using "/" as separator
+    :param str: namespace
+    :rtype: list
+    """
+    modules = []
+    pending = [("", False)]
+    while pending:
+        directory, in_package = pending.pop()
+        subdirs, files = list_directory(directory)
+        module_name = directory.replace("/", ".")
+        is_package = bool(directory) and INIT_PY_FILE in files
+        if is_package and module_name.startswith(namespace):
+            modules.append(ModuleInfo(module_name, "{0}/{1}".format(directory, INIT_PY_FILE), True))
+        if is_package or in_package:
+            for file_name in files:
+                if not file_name.endswith(".py") or file_name.startswith("_"):
+                    continue
+                name = "{0}.{1}".format(module_name, file_name[:-len(".py")])
+                if name.startswith(namespace):
+                    modules.append(ModuleInfo(name, "{0}/{1}".format(directory, file_name), False))
+
+        # Sub directories are visited in order after current directory
+        subdirs = ["{0}/{1}".format(directory, x) if directory else x for x in subdirs if not x.startswith(("_", "."))]
+        pending.extend(reversed([
+            (x, is_package or in_package) for x in subdirs if _may_contain(x.replace("/", "."), namespace)
+        ]))
+    return modules
+
+
+def _may_contain(module_name, namespace):
+    # Returns True if a module within namespace can be found in directory of module name
+    prefix = module_name + "."
+    return prefix.startswith(namespace) or namespace.startswith(prefix)
+
+
+def _list_directory(path):
+    # Directory entries returned by scandir have file type so is_dir doesn't need another system call
+    subdirs = []
+    files = []
+    with os.scandir(path) as entries:
+        for entry in entries:
+            if entry.is_dir():
+                # Symbolic links to directories are not followed same as os.walk
+                if not entry.is_symlink():
+                    subdirs.append(entry.name)
+            else:
+                files.append(entry.name)
+    return subdirs, files
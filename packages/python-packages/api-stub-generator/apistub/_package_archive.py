@@ -0,0 +1,141 @@
+# --------------------------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for license information.
+# --------------------------------------------------------------------------------------------
+
+import hashlib
+import io
+import logging
+import os
+import tokenize
+import zipfile
+
+from ._module_discovery import INIT_PY_FILE, collect_modules
+
+TOP_LEVEL_WHEEL_FILE = "top_level.txt"
+METADATA_FILES = ("METADATA", "PKG-INFO")
+
+
+class PackageArchive:
+    """Reads modules and metadata of a wheel or sdist package directly from the zip file without extracting it.
+    Members are read on demand so only the files that are parsed are decompressed.
+    :param str: pkg_path
+    """
+
+    def __init__(self, pkg_path):
+        self.pkg_path = os.path.abspath(pkg_path)
+        self._zip_file = None
+        self._pid = None
+        # Directory entries are skipped. Directories are identified using path of files within them
+        self.members = [x for x in self._get_zip_file().namelist() if not x.endswith("/")]
+        self._member_set = set(self.members)
+
+    def _get_zip_file(self):
+        # Zip file handle can't be shared with forked worker processes since they share file offset
+        if self._zip_file is None or self._pid != os.getpid():
+            self._zip_file = zipfile.ZipFile(self.pkg_path)
+            self._pid = os.getpid()
+        return self._zip_file
+
+    def close(self):
+        if self._zip_file is not None and self._pid == os.getpid():
+            self._zip_file.close()
+        self._zip_file = None
+
+    def find_modules(self, namespace=""):
+        """Find modules within namespace in the package same as in an extracted package
+        :param str: namespace
+        :rtype: list
+        """
+        subdirs = {"": []}
+        files = {"": []}
+        for member in self.members:
+            parts = member.split("/")
+            # Add each parent directory of the file in the order they appear in archive
+            for index in range(1, len(parts)):
+                directory = "/".join(parts[:index])
+                if directory not in subdirs:
+                    subdirs[directory] = []
+                    files[directory] = []
+                    subdirs["/".join(parts[:index - 1])].append(parts[index - 1])
+            files["/".join(parts[:-1])].append(parts[-1])
+        return collect_modules(lambda x: (subdirs[x], files[x]), namespace)
+
+    def get_root_module_name(self):
+        """Returns root module name listed in top_level.txt of dist-info or an empty string if it is not present
+        """
+        files = [x for x in self.members if x.count("/") == 1 and x.endswith("/" + TOP_LEVEL_WHEEL_FILE)]
+        if not files:
+            logging.warning(
+                "File {0} is not found in {1} to identify root module name. All modules in package will be parsed".format(
+                    TOP_LEVEL_WHEEL_FILE, self.pkg_path
+                )
+            )
+            return ""
+        with io.TextIOWrapper(self._get_zip_file().open(files[0])) as top_lvl_file:
+            root_module_name = top_lvl_file.readline().strip()
+        logging.info("Root module found in {0}: '{1}'".format(TOP_LEVEL_WHEEL_FILE, root_module_name))
+        return root_module_name
+
+    def read_metadata(self):
+        """Returns metadata of the package from METADATA in dist-info or PKG-INFO in sdist. Returns None if package
+        doesn't have metadata
+        :rtype: email.message.Message
+        """
+        from email.parser import HeaderParser
+
+        files = [x for x in self.members if x.count("/") == 1 and x.endswith(METADATA_FILES)]
+        if not files:
+            return None
+        return HeaderParser().parsestr(self.read(files[0]).decode("utf-8", errors="replace"))
+
+    def get_path(self, member):
+        """Returns path of a member within the archive. The path doesn't exist on disk and is used only to identify
+        the source file of parsed modules
+        :param str: member
+        """
+        return os.path.join(self.pkg_path, *member.split("/"))
+
+    def get_member(self, path):
+        """Returns member name of a path returned by get_path or None if the path is not within the archive
+        :param str: path
+        """
+        if not path.startswith(self.pkg_path + os.sep):
+            return None
+        member = path[len(self.pkg_path) + 1:].replace(os.sep, "/")
+        return member if self.contains(member) else None
+
+    def contains(self, member):
+        return member in self._member_set
+
+    def get_module_member(self, module_name):
+        """Returns member name of source file of a module or None if module is not in the archive
+        :param str: module_name
+        """
+        module_path = module_name.replace(".", "/")
+        for member in ("{}/{}".format(module_path, INIT_PY_FILE), module_path + ".py"):
+            if self.contains(member):
+                return member
+        return None
+
+    def is_directory(self, module_name):
+        """Returns True if a directory exists for module name. It is a namespace package if it has no __init__.py
+        :param str: module_name
+        """
+        prefix = module_name.replace(".", "/") + "/"
+        return any(x.startswith(prefix) for x in self.members)
+
+    def read(self, member):
+        return self._get_zip_file().read(member)
+
+    def read_source(self, member):
+        """Returns source code of a python file in the archive decoded same as reading it from disk
+        :param str: member
+        """
+        data = self.read(member)
+        encoding, _ = tokenize.detect_encoding(io.BytesIO(data).readline)
+        with io.TextIOWrapper(io.BytesIO(data), encoding) as source_file:
+            return source_file.read()
+
+    def get_hash(self, member):
+        return hashlib.sha256(self.read(member)).hexdigest()
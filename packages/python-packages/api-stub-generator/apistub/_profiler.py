@@ -0,0 +1,184 @@
+# --------------------------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for license information.
+# --------------------------------------------------------------------------------------------
+
+import io
+import json
+import logging
+import sys
+import time
+
+PROFILE_FILE_EXTENSION = ".profile.json"
+FOLDED_FILE_EXTENSION = ".profile.folded"
+
+# Profiler of current process. Timers are not recorded if profiler is not enabled
+_active_profiler = None
+
+
+class ProfileFrame:
+    """Time spent in a phase of token generation and in phases nested within it. Repeated calls of a phase
+    with same name within same parent are added to same frame.
+    :param str: name
+    """
+
+    def __init__(self, name):
+        self.name = name
+        self.calls = 0
+        self.wall_time = 0.0
+        self.cpu_time = 0.0
+        # Net number of memory blocks allocated by interpreter in this phase
+        self.allocated_blocks = 0
+        self.children = {}
+
+    def get_child(self, name):
+        if name not in self.children:
+            self.children[name] = ProfileFrame(name)
+        return self.children[name]
+
+    def merge(self, frame_dict):
+        """Add time of a frame recorded in another process, for e.g. a worker process that inspected a module
+        :param dict: frame_dict
+        """
+        frame = self.get_child(frame_dict["Name"])
+        frame.calls += frame_dict["Calls"]
+        frame.wall_time += frame_dict["WallTime"]
+        frame.cpu_time += frame_dict["CpuTime"]
+        frame.allocated_blocks += frame_dict["AllocatedBlocks"]
+        for child in frame_dict["Children"]:
+            frame.merge(child)
+
+    def to_dict(self):
+        return {
+            "Name": self.name,
+            "Calls": self.calls,
+            "WallTime": round(self.wall_time, 6),
+            "CpuTime": round(self.cpu_time, 6),
+            "AllocatedBlocks": self.allocated_blocks,
+            "Children": [x.to_dict() for x in self.children.values()],
+        }
+
+    def get_folded_stacks(self, prefix=""):
+        """Returns lines in folded stack format, i.e. frame names separated by ";" followed by self wall time in
+        microseconds. This format is supported by flamegraph.pl and speedscope
+        """
+        stack = "{0};{1}".format(prefix, self.name) if prefix else self.name
+        self_time = self.wall_time - sum(x.wall_time for x in self.children.values())
+        lines = ["{0} {1}".format(stack, max(int(self_time * 1000000), 0))]
+        for child in self.children.values():
+            lines.extend(child.get_folded_stacks(stack))
+        return lines
+
+
+class _Timer:
+    # Context manager that records time of a frame in profiler
+    def __init__(self, profiler, name):
+        self.profiler = profiler
+        self.name = name
+
+    def __enter__(self):
+        self.frame = self.profiler.stack[-1].get_child(self.name)
+        self.profiler.stack.append(self.frame)
+        self.start_blocks = sys.getallocatedblocks()
+        self.start_cpu = time.process_time()
+        self.start_wall = time.perf_counter()
+        return self.frame
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.frame.wall_time += time.perf_counter() - self.start_wall
+        self.frame.cpu_time += time.process_time() - self.start_cpu
+        self.frame.allocated_blocks += sys.getallocatedblocks() - self.start_blocks
+        self.frame.calls += 1
+        self.profiler.stack.pop()
+        return False
+
+
+class _NullTimer:
+    # Context manager used when profiler is not enabled
+    def __enter__(self):
+        return None
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        return False
+
+
+_NULL_TIMER = _NullTimer()
+
+
+class Profiler:
+    """Records wall time, CPU time and allocated memory blocks of nested phases of token generation
+    :param str: name
+        Name of root frame
+    """
+
+    def __init__(self, name):
+        self.root = ProfileFrame(name)
+        self.root.calls = 1
+        self.stack = [self.root]
+        self._start_wall = time.perf_counter()
+        self._start_cpu = time.process_time()
+        self._start_blocks = sys.getallocatedblocks()
+
+    def timer(self, name):
+        return _Timer(self, name)
+
+    def stop(self):
+        """Set total time since profiler is created in root frame
+        """
+        self.root.wall_time = time.perf_counter() - self._start_wall
+        self.root.cpu_time = time.process_time() - self._start_cpu
+        self.root.allocated_blocks = sys.getallocatedblocks() - self._start_blocks
+
+    def get_report(self):
+        return self.root.to_dict()
+
+    def write_report(self, out_file_path):
+        """Write report as json and in folded stack format to generate a flame graph. Returns path of json report
+        :param str: out_file_path
+            Path of token file. Reports are created next to token file
+        """
+        base_path = out_file_path[:-len(".json")] if out_file_path.endswith(".json") else out_file_path
+        report_path = base_path + PROFILE_FILE_EXTENSION
+        with io.open(report_path, "w", encoding="utf-8") as report_file:
+            json.dump(self.get_report(), report_file, indent=2)
+        with io.open(base_path + FOLDED_FILE_EXTENSION, "w", encoding="utf-8") as folded_file:
+            folded_file.write("\n".join(self.root.get_folded_stacks()) + "\n")
+        logging.debug("Profile report is written to {}".format(report_path))
+        return report_path
+
+    def print_summary(self):
+        print("************************** Profile Summary **************************")
+        for frame in self.root.children.values():
+            print("{0:<20} wall: {1:8.3f}s  cpu: {2:8.3f}s  blocks: {3}".format(
+                frame.name, frame.wall_time, frame.cpu_time, frame.allocated_blocks
+            ))
+
+
+def enable_profiler(name):
+    """Start recording timers in current process and return the profiler
+    :param str: name
+    """
+    global _active_profiler
+    _active_profiler = Profiler(name)
+    return _active_profiler
+
+
+def disable_profiler():
+    """Stop recording timers and return the profiler
+    """
+    global _active_profiler
+    profiler = _active_profiler
+    _active_profiler = None
+    if profiler:
+        profiler.stop()
+    return profiler
+
+
+def profile(name):
+    """Returns context manager that records time spent within it as a phase named name nested in current phase.
+    Nothing is recorded if profiler is not enabled
+    :param str: name
+    """
+    if _active_profiler is None:
+        return _NULL_TIMER
+    return _active_profiler.timer(name)
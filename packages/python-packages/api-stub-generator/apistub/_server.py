@@ -0,0 +1,258 @@
+# --------------------------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for license information.
+# --------------------------------------------------------------------------------------------
+
+import argparse
+import collections
+import json
+import logging
+import multiprocessing
+import os
+import shutil
+import tempfile
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+from ._batch import PACKAGE_FILE_EXTENSIONS, generate_package, init_worker
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8080
+DEFAULT_WORKERS = 2
+# Number of recent requests used to calculate latency percentiles
+LATENCY_WINDOW = 1000
+COPY_CHUNK_SIZE = 1024 * 1024
+
+
+class ServerMetrics:
+    """Metrics of token generation requests processed by server
+    :param int: workers
+    """
+
+    def __init__(self, workers):
+        self.workers = workers
+        self.pending = 0
+        self.completed = 0
+        self.failed = 0
+        self.latencies = collections.deque(maxlen=LATENCY_WINDOW)
+        self._lock = threading.Lock()
+
+    def start_request(self):
+        with self._lock:
+            self.pending += 1
+
+    def end_request(self, latency, failed):
+        with self._lock:
+            self.pending -= 1
+            if failed:
+                self.failed += 1
+            else:
+                self.completed += 1
+                self.latencies.append(latency)
+
+    def to_dict(self):
+        with self._lock:
+            latencies = sorted(self.latencies)
+            return {
+                "Workers": self.workers,
+                "Pending": self.pending,
+                # Requests waiting for a free worker
+                "QueueDepth": max(self.pending - self.workers, 0),
+                "Completed": self.completed,
+                "Failed": self.failed,
+                "LatencyAvg": round(sum(latencies) / len(latencies), 3) if latencies else None,
+                "LatencyP50": _percentile(latencies, 50),
+                "LatencyP95": _percentile(latencies, 95),
+                "LatencyMax": latencies[-1] if latencies else None,
+            }
+
+
+class StubGeneratorServer(ThreadingHTTPServer):
+    """HTTP server that generates token files for uploaded packages using a pool of worker processes.
+    Worker processes are kept running between requests so interpreter and parser start up is not repeated
+    for each package.
+    :param tuple: address
+    :param int: workers
+    :param list: generator_args
+        Command line arguments of api stub generator applied to each package
+    :param str: temp_path
+        Directory to keep uploaded packages and token files while request is processed
+    """
+
+    daemon_threads = True
+
+    def __init__(self, address, workers, generator_args, temp_path):
+        super().__init__(address, _RequestHandler)
+        self.generator_args = generator_args
+        self.temp_path = temp_path
+        self.metrics = ServerMetrics(workers)
+        self.workers = workers
+        self.executor = self._create_executor()
+        self._executor_lock = threading.Lock()
+        # Start workers before first request is received
+        for future in [self.executor.submit(os.getpid) for _ in range(workers)]:
+            future.result()
+
+    def _create_executor(self):
+        return ProcessPoolExecutor(
+            max_workers=self.workers,
+            initializer=init_worker,
+            initargs=(logging.getLogger().level, multiprocessing.Lock()),
+        )
+
+    def _replace_broken_executor(self, executor):
+        # Executor cannot run any task after a worker process exits unexpectedly. It is replaced once even if
+        # concurrent requests failed on same executor
+        with self._executor_lock:
+            if self.executor is executor:
+                logging.error("Worker process pool is broken. Starting new worker processes")
+                self.executor = self._create_executor()
+                executor.shutdown(wait=False)
+
+    def generate(self, file_name, stream, size):
+        """Generate token file for a package read from stream and return summary of the request.
+        Caller must remove directory of token file in summary after reading it. ValueError is raised if stream
+        ends before size bytes are read
+        """
+        request_path = tempfile.mkdtemp(dir=self.temp_path)
+        pkg_path = os.path.join(request_path, file_name)
+        with open(pkg_path, "wb") as pkg_file:
+            remaining = size
+            while remaining > 0:
+                chunk = stream.read(min(COPY_CHUNK_SIZE, remaining))
+                if not chunk:
+                    break
+                pkg_file.write(chunk)
+                remaining -= len(chunk)
+        if remaining > 0:
+            shutil.rmtree(request_path, ignore_errors=True)
+            raise ValueError(
+                "Uploaded package is truncated. Received {0} of {1} bytes".format(size - remaining, size)
+            )
+
+        # Token file and any files extracted from package are kept in request directory so concurrent requests
+        # for same package don't conflict
+        args = self.generator_args + [
+            "--pkg-path", pkg_path, "--temp-path", request_path, "--out-path", request_path, "--hide-report"
+        ]
+        self.metrics.start_request()
+        start_time = time.time()
+        executor = self.executor
+        try:
+            result = executor.submit(generate_package, args).result()
+        except Exception as e:
+            logging.error("Failed to generate token file for {0}: {1}".format(pkg_path, e))
+            if isinstance(e, BrokenProcessPool):
+                self._replace_broken_executor(executor)
+            shutil.rmtree(request_path, ignore_errors=True)
+            result = {
+                "Package": pkg_path,
+                "TokenFile": None,
+                "Seconds": round(time.time() - start_time, 3),
+                "Diagnostics": None,
+                "Error": str(e) or type(e).__name__,
+            }
+        self.metrics.end_request(round(time.time() - start_time, 3), result["Error"] is not None)
+        return dict(result, RequestPath=request_path)
+
+    def server_close(self):
+        super().server_close()
+        self.executor.shutdown()
+
+
+class _RequestHandler(BaseHTTPRequestHandler):
+
+    def do_GET(self):
+        path = urlparse(self.path).path
+        if path == "/health":
+            self._send_json(200, {"Status": "ok"})
+        elif path == "/metrics":
+            self._send_json(200, self.server.metrics.to_dict())
+        else:
+            self._send_json(404, {"Error": "Unknown path {}".format(path)})
+
+    def do_POST(self):
+        url = urlparse(self.path)
+        if url.path != "/generate":
+            self._send_json(404, {"Error": "Unknown path {}".format(url.path)})
+            return
+        # Name of uploaded file is required to find package name and version
+        file_name = os.path.basename(parse_qs(url.query).get("filename", [""])[0])
+        if not file_name.endswith(PACKAGE_FILE_EXTENSIONS):
+            self._send_json(400, {"Error": "filename query parameter must be name of a wheel or sdist package"})
+            return
+
+        try:
+            result = self.server.generate(file_name, self.rfile, int(self.headers.get("Content-Length", 0)))
+        except ValueError as e:
+            self._send_json(400, {"Error": str(e)})
+            return
+        try:
+            if result["Error"]:
+                self._send_json(500, {"Error": result["Error"]})
+                return
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(os.path.getsize(result["TokenFile"])))
+            self.send_header("X-Apistub-Seconds", str(result["Seconds"]))
+            if result["Diagnostics"] is not None:
+                self.send_header("X-Apistub-Diagnostics", str(result["Diagnostics"]))
+            self.end_headers()
+            with open(result["TokenFile"], "rb") as token_file:
+                shutil.copyfileobj(token_file, self.wfile, COPY_CHUNK_SIZE)
+        finally:
+            shutil.rmtree(result["RequestPath"], ignore_errors=True)
+
+    def _send_json(self, status, body):
+        data = json.dumps(body).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, format, *args):
+        logging.info("%s - %s", self.address_string(), format % args)
+
+
+def _percentile(values, percent):
+    # Returns percentile of sorted values using nearest rank
+    if not values:
+        return None
+    index = max(int(round(percent / 100.0 * len(values))) - 1, 0)
+    return values[index]
+
+
+def main(args=None):
+    parser = argparse.ArgumentParser(
+        description="Run a local server that generates json token files for packages uploaded to it. "
+        "Other arguments are passed to api stub generator for each package, for e.g. --static"
+    )
+    parser.add_argument("--host", default=DEFAULT_HOST, help=("Host name or IP address to listen on"))
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT, help=("Port to listen on"))
+    parser.add_argument(
+        "--workers", type=int, default=DEFAULT_WORKERS, help=("Number of worker processes to generate token files")
+    )
+    parser.add_argument(
+        "--temp-path",
+        default=tempfile.gettempdir(),
+        help=("Temp path to keep uploaded packages while they are parsed"),
+    )
+    parser.add_argument("--verbose", help=("Enable verbose logging"), default=False, action="store_true")
+    args, generator_args = parser.parse_known_args(args)
+    if args.verbose:
+        logging.getLogger().setLevel(logging.DEBUG)
+        generator_args.append("--verbose")
+
+    server = StubGeneratorServer((args.host, args.port), max(args.workers, 1), generator_args, args.temp_path)
+    logging.warning("Listening on http://{0}:{1}".format(*server.server_address[:2]))
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
@@ -0,0 +1,375 @@
+# --------------------------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for license information.
+# --------------------------------------------------------------------------------------------
+
+import ast
+import fnmatch
+import hashlib
+import io
+import json
+import logging
+import os
+import re
+import subprocess
+import sys
+import threading
+
+SETUP_PY_FILE = "setup.py"
+# Keyword arguments of setup call that are required to generate tokens
+SETUP_KWARGS = ("name", "version", "packages")
+STR_METHODS = ("format", "join", "lower", "lstrip", "replace", "rsplit", "rstrip", "split", "strip", "upper")
+
+# Runs setup.py in a separate process with a mock setup function so setup.py can't change state of current
+# process, for e.g. current directory. Files read by setup.py are returned so cached result can be validated
+SETUP_SCRIPT = """
+import builtins, json, os, sys
+import setuptools
+calls = []
+def setup(*args, **kwargs):
+    calls.append(kwargs)
+setuptools.setup = setup
+try:
+    import distutils.core
+    distutils.core.setup = setup
+except ImportError:
+    pass
+setup_dir = os.getcwd()
+files = set()
+def audit(event, args):
+    if event == "open" and isinstance(args[0], str):
+        path = os.path.abspath(args[0])
+        if path.startswith(setup_dir + os.sep) and not path.endswith(".pyc") and os.path.isfile(path):
+            files.add(path)
+sys.addaudithook(audit)
+sys.argv = [sys.argv[1]]
+with open(sys.argv[0], "rb") as setup_file:
+    code = compile(setup_file.read(), sys.argv[0], "exec")
+exec(code, {"__name__": "__main__", "__file__": sys.argv[0], "__builtins__": builtins})
+kwargs = calls[0]
+packages = kwargs.get("packages")
+print(json.dumps({
+    "Name": kwargs.get("name"),
+    "Version": kwargs.get("version"),
+    "Packages": list(packages) if packages else [],
+    "Files": sorted(files),
+}))
+"""
+
+# Metadata of setup.py files parsed in this process keyed by path of setup.py
+_metadata_cache = {}
+_cache_lock = threading.Lock()
+
+
+class SetupMetadata:
+    """Package metadata found in setup.py
+    :param str: name
+    :param str: version
+    :param list: packages
+    :param dict: file_hashes
+        Hash of setup.py and files read by it. Metadata is valid as long as these files are not changed
+    """
+
+    def __init__(self, name, version, packages, file_hashes):
+        self.name = name
+        self.version = version
+        self.packages = packages
+        self.file_hashes = file_hashes
+
+    def is_valid(self):
+        return all(_hash_file(path) == file_hash for path, file_hash in self.file_hashes.items())
+
+
+class _NotStatic(Exception):
+    # Raised when a value in setup.py can't be evaluated without running it
+    pass
+
+
+def read_setup_metadata(setup_path):
+    """Returns name, version and packages in setup.py of a package root path. Metadata is evaluated from syntax
+    tree of setup.py if possible or else setup.py is run in a separate process. Result is cached until setup.py
+    or files read by it are changed. Current directory of the process is not changed so it is safe to call from
+    multiple threads.
+    :param str: setup_path
+        Directory of setup.py
+    :rtype: SetupMetadata
+    """
+    setup_filename = os.path.abspath(os.path.join(setup_path, SETUP_PY_FILE))
+    with _cache_lock:
+        metadata = _metadata_cache.get(setup_filename)
+    if metadata and metadata.is_valid():
+        logging.debug("Using cached metadata of {}".format(setup_filename))
+        return metadata
+
+    with io.open(setup_filename, "rb") as setup_file:
+        source = setup_file.read()
+    try:
+        metadata = _StaticEvaluator(setup_filename, source).evaluate()
+    except _NotStatic as e:
+        logging.debug("Running {0} to find metadata. {1}".format(setup_filename, e))
+        metadata = _run_setup_py(setup_filename, source)
+
+    with _cache_lock:
+        _metadata_cache[setup_filename] = metadata
+    return metadata
+
+
+def clear_setup_metadata_cache():
+    with _cache_lock:
+        _metadata_cache.clear()
+
+
+def _run_setup_py(setup_filename, source):
+    # Run setup.py with mock setup function in a separate process
+    process = subprocess.run(
+        [sys.executable, "-c", SETUP_SCRIPT, setup_filename],
+        cwd=os.path.dirname(setup_filename),
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE,
+        universal_newlines=True,
+    )
+    if process.returncode != 0:
+        raise ValueError("Failed to run {0}: {1}".format(setup_filename, process.stderr.strip()))
+    result = json.loads(process.stdout.strip().splitlines()[-1])
+    file_hashes = dict((x, _hash_file(x)) for x in result["Files"])
+    file_hashes[setup_filename] = hashlib.sha256(source).hexdigest()
+    return SetupMetadata(result["Name"], result["Version"], result["Packages"], file_hashes)
+
+
+def _hash_file(path):
+    if not os.path.isfile(path):
+        return None
+    with io.open(path, "rb") as source_file:
+        return hashlib.sha256(source_file.read()).hexdigest()
+
+
+class _StaticFile:
+    # File opened by setup.py for reading. Content is read relative to directory of setup.py
+    def __init__(self, path, mode, kwargs):
+        if any(x in mode for x in "wax+"):
+            raise _NotStatic("File {} is opened for writing".format(path))
+        self.path = path
+        self.mode = mode
+        self.kwargs = kwargs
+
+    def read(self):
+        with io.open(self.path, self.mode, **self.kwargs) as opened_file:
+            return opened_file.read()
+
+
+class _StaticEvaluator:
+    """Evaluates name, version and packages passed to setup call from syntax tree of setup.py.
+    Only constants, names assigned unconditionally at module level or within with statements, string operations,
+    reading files, regular expressions, os.path functions and find_packages are supported.
+    :param str: setup_filename
+    :param bytes: source
+    """
+
+    def __init__(self, setup_filename, source):
+        self.setup_filename = setup_filename
+        self.setup_dir = os.path.dirname(setup_filename)
+        self.file_hashes = {setup_filename: hashlib.sha256(source).hexdigest()}
+        self.functions = {
+            "open": self._open,
+            "io.open": self._open,
+            "codecs.open": self._open,
+            "os.path.join": os.path.join,
+            "os.path.basename": os.path.basename,
+            "os.path.dirname": os.path.dirname,
+            "os.path.abspath": lambda path: os.path.normpath(self._get_path(path)),
+            "os.path.exists": lambda path: os.path.exists(self._get_path(path)),
+            "os.path.isfile": lambda path: os.path.isfile(self._get_path(path)),
+            "os.path.isdir": lambda path: os.path.isdir(self._get_path(path)),
+            "re.search": re.search,
+            "re.match": re.match,
+            "setuptools.find_packages": self._find_packages,
+            "setuptools.find_namespace_packages": lambda *args, **kwargs: self._find_packages(
+                *args, namespace=True, **kwargs
+            ),
+        }
+        try:
+            self.tree = ast.parse(source, setup_filename)
+        except SyntaxError as e:
+            raise _NotStatic(str(e))
+        # Fully qualified name of imported names
+        self.imports = {}
+        self.setup_call = None
+        self.setup_scope = None
+        self._scan(self.tree.body, {})
+
+    def evaluate(self):
+        if self.setup_call is None:
+            raise _NotStatic("setup call is not found at module level")
+        if any(isinstance(x, ast.Starred) for x in self.setup_call.args) or any(
+            x.arg is None for x in self.setup_call.keywords
+        ):
+            raise _NotStatic("setup is called with unpacked arguments")
+        kwargs = dict((x.arg, x.value) for x in self.setup_call.keywords)
+        if "name" not in kwargs or "version" not in kwargs:
+            raise _NotStatic("name or version is not passed as keyword argument")
+        values = dict(
+            (x, self._eval(kwargs[x], self.setup_scope)) for x in SETUP_KWARGS if x in kwargs
+        )
+        for key in ("name", "version"):
+            if not isinstance(values[key], str):
+                raise _NotStatic("{} is not a string".format(key))
+        packages = list(values.get("packages") or [])
+        return SetupMetadata(values["name"], values["version"], packages, self.file_hashes)
+
+    def _scan(self, statements, scope):
+        # Record unconditional assignments in order. Names bound conditionally can't be evaluated statically
+        for node in statements:
+            if isinstance(node, ast.Import):
+                for alias in node.names:
+                    # import os.path binds os and import os.path as osp binds osp to os.path
+                    name = alias.asname or alias.name.split(".")[0]
+                    self.imports[name] = alias.name if alias.asname else name
+                    scope.pop(name, None)
+            elif isinstance(node, ast.ImportFrom) and node.module and not node.level:
+                for alias in node.names:
+                    self.imports[alias.asname or alias.name] = "{0}.{1}".format(node.module, alias.name)
+                    scope.pop(alias.asname or alias.name, None)
+            elif isinstance(node, ast.Assign) and len(node.targets) == 1 and isinstance(node.targets[0], ast.Name):
+                scope[node.targets[0].id] = (node.value, dict(scope))
+            elif isinstance(node, ast.With):
+                for item in node.items:
+                    if isinstance(item.optional_vars, ast.Name):
+                        scope[item.optional_vars.id] = (item.context_expr, dict(scope))
+                self._scan(node.body, scope)
+            elif isinstance(node, ast.Expr) and self._is_setup_call(node.value):
+                if self.setup_call is None:
+                    self.setup_call = node.value
+                    self.setup_scope = dict(scope)
+            else:
+                for name in _get_bound_names(node):
+                    scope[name] = None
+
+    def _is_setup_call(self, node):
+        return isinstance(node, ast.Call) and self._get_qualified_name(node.func) in (
+            "setuptools.setup", "distutils.core.setup"
+        )
+
+    def _get_qualified_name(self, node):
+        # Returns fully qualified name of an imported function or attribute, for e.g. os.path.join
+        if isinstance(node, ast.Name):
+            if node.id in self.imports:
+                return self.imports[node.id]
+            return node.id if node.id == "open" else None
+        if isinstance(node, ast.Attribute):
+            parent = self._get_qualified_name(node.value)
+            return "{0}.{1}".format(parent, node.attr) if parent else None
+        return None
+
+    def _eval(self, node, scope):
+        if isinstance(node, ast.Constant):
+            return node.value
+        if isinstance(node, ast.Name):
+            return self._eval_name(node.id, scope)
+        if isinstance(node, ast.List):
+            return [self._eval(x, scope) for x in node.elts]
+        if isinstance(node, ast.Tuple):
+            return tuple(self._eval(x, scope) for x in node.elts)
+        if isinstance(node, ast.BinOp) and isinstance(node.op, (ast.Add, ast.Mod)):
+            left = self._eval(node.left, scope)
+            right = self._eval(node.right, scope)
+            if not isinstance(left, (str, list, tuple)):
+                raise _NotStatic("Unsupported operand type at line {}".format(node.lineno))
+            return left + right if isinstance(node.op, ast.Add) else left % right
+        if isinstance(node, ast.JoinedStr):
+            return "".join(self._eval_formatted_value(x, scope) for x in node.values)
+        if isinstance(node, ast.IfExp):
+            return self._eval(node.body if self._eval(node.test, scope) else node.orelse, scope)
+        if isinstance(node, ast.UnaryOp) and isinstance(node.op, ast.Not):
+            return not self._eval(node.operand, scope)
+        if isinstance(node, ast.Attribute):
+            qualified_name = self._get_qualified_name(node)
+            if qualified_name and qualified_name.startswith("re.") and node.attr.isupper():
+                return getattr(re, node.attr)
+        if isinstance(node, ast.Call):
+            return self._eval_call(node, scope)
+        raise _NotStatic("Unsupported expression at line {}".format(getattr(node, "lineno", "?")))
+
+    def _eval_name(self, name, scope):
+        if name == "__file__":
+            return self.setup_filename
+        if name not in scope or scope[name] is None:
+            raise _NotStatic("Value of {} is not known".format(name))
+        value_node, value_scope = scope[name]
+        return self._eval(value_node, value_scope)
+
+    def _eval_formatted_value(self, node, scope):
+        if isinstance(node, ast.FormattedValue) and node.conversion == -1 and node.format_spec is None:
+            return str(self._eval(node.value, scope))
+        return self._eval(node, scope)
+
+    def _eval_call(self, node, scope):
+        args = [self._eval(x, scope) for x in node.args]
+        if any(x.arg is None for x in node.keywords):
+            raise _NotStatic("Unpacked keyword arguments at line {}".format(node.lineno))
+        kwargs = dict((x.arg, self._eval(x.value, scope)) for x in node.keywords)
+
+        qualified_name = self._get_qualified_name(node.func)
+        if qualified_name in self.functions:
+            try:
+                return self.functions[qualified_name](*args, **kwargs)
+            except (TypeError, ValueError, OSError) as e:
+                raise _NotStatic("Failed to evaluate {0} at line {1}: {2}".format(qualified_name, node.lineno, e))
+
+        if isinstance(node.func, ast.Attribute):
+            # Methods of values evaluated from setup.py
+            obj = self._eval(node.func.value, scope)
+            method = node.func.attr
+            try:
+                if isinstance(obj, str) and method in STR_METHODS:
+                    return getattr(obj, method)(*args, **kwargs)
+                if isinstance(obj, _StaticFile) and method == "read" and not args:
+                    return obj.read()
+                if isinstance(obj, re.Match) and method in ("group", "groups"):
+                    return getattr(obj, method)(*args)
+            except (TypeError, ValueError, IndexError, KeyError, OSError) as e:
+                raise _NotStatic("Failed to evaluate {0} at line {1}: {2}".format(method, node.lineno, e))
+        raise _NotStatic("Unsupported call at line {}".format(node.lineno))
+
+    def _get_path(self, path):
+        # setup.py is run from its directory so relative paths are relative to directory of setup.py
+        return os.path.join(self.setup_dir, path)
+
+    def _open(self, file, mode="r", **kwargs):
+        path = os.path.abspath(self._get_path(file))
+        self.file_hashes[path] = _hash_file(path)
+        return _StaticFile(path, mode, kwargs)
+
+    def _find_packages(self, where=".", exclude=(), include=("*",), namespace=False):
+        # Same as setuptools.find_packages but without importing setuptools
+        where_path = os.path.join(self.setup_dir, *where.split("/"))
+        exclude = ("ez_setup", "*__pycache__") + tuple(exclude)
+        packages = []
+        for root, dirs, files in os.walk(where_path, followlinks=True):
+            all_dirs = dirs[:]
+            dirs[:] = []
+            for name in all_dirs:
+                full_path = os.path.join(root, name)
+                package = os.path.relpath(full_path, where_path).replace(os.path.sep, ".")
+                if "." in name or not (namespace or os.path.isfile(os.path.join(full_path, "__init__.py"))):
+                    continue
+                if _matches(package, include) and not _matches(package, exclude):
+                    packages.append(package)
+                dirs.append(name)
+        return packages
+
+
+def _matches(name, patterns):
+    return any(fnmatch.fnmatchcase(name, x) for x in patterns)
+
+
+def _get_bound_names(node):
+    # Returns names assigned anywhere within a statement
+    names = set()
+    for child in ast.walk(node):
+        if isinstance(child, ast.Name) and isinstance(child.ctx, ast.Store):
+            names.add(child.id)
+        elif isinstance(child, (ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef)):
+            names.add(child.name)
+        elif isinstance(child, (ast.Import, ast.ImportFrom)):
+            names.update((x.asname or x.name).split(".")[0] for x in child.names)
+    return names
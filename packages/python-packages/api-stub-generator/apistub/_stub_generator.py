@@ -5,37 +5,33 @@
 # Licensed under the MIT License. See License.txt in the project root for license information.
 # --------------------------------------------------------------------------------------------
 
-import glob
 import sys
 import os
 import argparse
 
-import inspect
 import io
 import importlib
-import json
 import logging
-import pkgutil
 import shutil
-import ast
-import textwrap
-import re
-import typing
 import tempfile
-from subprocess import check_call
-import zipfile
 
-
-from apistub._apiview import ApiView, APIViewEncoder, Navigation, Kind, NavigationTag
-
-INIT_PY_FILE = "__init__.py"
-TOP_LEVEL_WHEEL_FILE = "top_level.txt"
+# Modules that are required only for some of the options such as zipfile, subprocess, multiprocessing and astroid
+# (through node modules) are imported when they are used so start up is fast for --help, cache hits and small
+# packages
+from apistub._apiview import ApiView, Navigation, Kind, NavigationTag, clear_module_members
+from apistub._profiler import profile, enable_profiler, disable_profiler
+from apistub._module_discovery import find_modules
+from apistub._token_cache import TokenCache, DEFAULT_CACHE_SIZE_MB
+from apistub._venv_pool import VirtualEnvPool, DEFAULT_POOL_SIZE
 
 logging.getLogger().setLevel(logging.ERROR)
 
 
 class StubGenerator:
-    def __init__(self):
+    # Lock to install and inspect one package at a time when multiple packages are parsed in parallel in batch mode
+    install_lock = None
+
+    def __init__(self, args=None):
         parser = argparse.ArgumentParser(
             description="Parse a python package and generate json token file to be supplied to API review tool"
         )
@@ -70,9 +66,98 @@ class StubGenerator:
             "--filter-namespace",
             help=("Generate Api view only for a specific namespace"),
         )
+
+        parser.add_argument(
+            "--jobs",
+            type=int,
+            default=1,
+            help=("Number of worker processes used to inspect modules in parallel"),
+        )
+
+        parser.add_argument(
+            "--static",
+            help=("Parse source code of the package without installing and importing it"),
+            default=False,
+            action="store_true",
+        )
+
+        parser.add_argument(
+            "--skip-install",
+            help=("Skip installing the package. Package must be installed already to parse it"),
+            default=False,
+            action="store_true",
+        )
+
+        parser.add_argument(
+            "--venv-pool",
+            help=("Directory of reusable virtual environments to install and parse package in isolation"),
+        )
+
+        parser.add_argument(
+            "--venv-pool-size",
+            type=int,
+            default=DEFAULT_POOL_SIZE,
+            help=("Number of virtual environments in pool"),
+        )
+
+        parser.add_argument(
+            "--use-orjson",
+            help=("Serialize tokens using orjson if it is installed"),
+            default=False,
+            action="store_true",
+        )
+
+        parser.add_argument(
+            "--cache-dir",
+            help=("Directory to cache generated token files. Token file is reused if same wheel or sdist is parsed again"),
+        )
+
+        parser.add_argument(
+            "--incremental",
+            help=("Generate tokens only for modules changed since token file in out path was generated"),
+            default=False,
+            action="store_true",
+        )
+
+        parser.add_argument(
+            "--cache-size",
+            type=int,
+            default=DEFAULT_CACHE_SIZE_MB,
+            help=("Max size of token file cache in MB"),
+        )
         
 
-        args = parser.parse_args()
+        parser.add_argument(
+            "--batch",
+            help=("Generate token files for all wheel and sdist packages in directory or manifest file given as pkg-path"),
+            default=False,
+            action="store_true",
+        )
+
+        parser.add_argument(
+            "--batch-jobs",
+            type=int,
+            default=os.cpu_count(),
+            help=("Max number of packages to parse in parallel in batch mode"),
+        )
+
+        parser.add_argument(
+            "--profile",
+            help=("Write time spent in each phase, module and class into a json report and a folded stack file "
+                  "for flame graph next to token file"),
+            default=False,
+            action="store_true",
+        )
+
+        parser.add_argument(
+            "--stub-file",
+            help=("Write API view as plain text stub file with .pyi extension next to token file while tokens are "
+                  "generated"),
+            default=False,
+            action="store_true",
+        )
+
+        args = parser.parse_args(args)
         if not os.path.exists(args.pkg_path):
             logging.error("Package path [{}] is invalid".format(args.pkg_path))
             exit(1)
@@ -85,6 +170,27 @@ class StubGenerator:
         self.temp_path = args.temp_path
         self.out_path = args.out_path
         self.hide_report = args.hide_report
+        self.verbose = args.verbose
+        self.jobs = max(args.jobs, 1)
+        self.static = args.static
+        self.use_orjson = args.use_orjson
+        self.skip_install = args.skip_install
+        self.cache_dir = args.cache_dir
+        self.cache_size = args.cache_size
+        self.incremental = args.incremental
+        self.batch = args.batch
+        self.batch_jobs = max(args.batch_jobs or 1, 1)
+        self.profile = args.profile
+        self.stub_file = args.stub_file
+        self.incremental_state = None
+        self.archive = None
+        self.modules = []
+        self.token_cache = None
+        if args.cache_dir:
+            self.token_cache = TokenCache(args.cache_dir, args.cache_size * 1024 * 1024)
+        self.venv_pool = None
+        if args.venv_pool:
+            self.venv_pool = VirtualEnvPool(args.venv_pool, args.venv_pool_size)
         if args.verbose:
             logging.getLogger().setLevel(logging.DEBUG)
 
@@ -93,29 +199,78 @@ class StubGenerator:
             self.filter_namespace = args.filter_namespace
             
 
-    def generate_tokens(self):
-        # Extract package to temp directory if it is wheel or sdist
-        if self.pkg_path.endswith(".whl") or self.pkg_path.endswith(".zip"):
-            logging.info("Extracting package to temp path")
-            pkg_root_path = self._extract_wheel()
-            pkg_name, version = self._parse_pkg_name()
-            namespace = self.get_module_root_name(pkg_root_path)
+    def generate_tokens(self, sinks=None):
+        """Generate API view of the package. Tokens are also passed to sinks, if given, and sinks are closed once API
+        view is generated
+        :param list: sinks
+        """
+        try:
+            return self._generate_package_tokens(sinks)
+        finally:
+            # Package file is closed even if parsing the package or closing a sink fails
+            if self.archive:
+                self.archive.close()
+                self.archive = None
+
+
+    def _generate_package_tokens(self, sinks):
+        # Modules and metadata of wheel or sdist are read from the package file without extracting it
+        if self._is_package_file():
+            from apistub._package_archive import PackageArchive
+
+            with profile("read package"):
+                self.archive = PackageArchive(self.pkg_path)
+                pkg_name, version = self._parse_pkg_name(self.archive)
+                namespace = self.archive.get_root_module_name()
+                pkg_root_path = self.pkg_path
+                if self.static and self._is_installed(pkg_name):
+                    # Installed modules are found in sys.path before the modules in archive so package is
+                    # extracted and added to sys.path to parse same version of modules as in package file
+                    logging.info("Package is installed. Extracting package to temp path")
+                    pkg_root_path = self._extract_wheel()
+                    self.archive.close()
+                    self.archive = None
         else:
             # package root is passed as arg to parse
             pkg_root_path = self.pkg_path
-            pkg_name, version, namespace = parse_setup_py(pkg_root_path)
+            with profile("setup.py"):
+                pkg_name, version, namespace = parse_setup_py(pkg_root_path)
 
         logging.debug("package name: {0}, version:{1}, namespace:{2}".format(pkg_name, version, namespace))
 
-        logging.debug("Installing package from {}".format(self.pkg_path))
-        self._install_package(pkg_name)
-        
-        if self.filter_namespace:
-            logging.info("Namespace filter is passed. Filtering modules within namespace :{}".format(self.filter_namespace))
-            namespace = self.filter_namespace
-
-        logging.debug("Generating tokens")
-        apiview = self._generate_tokens(pkg_root_path, pkg_name, version, namespace)
+        # Packages installed by other batch workers into same environment can replace modules of this package or
+        # its dependencies while it is imported so install lock is held until all modules are inspected
+        install_lock = None
+        if not self.static and not self.skip_install:
+            install_lock = StubGenerator.install_lock
+        if install_lock:
+            install_lock.acquire()
+        try:
+            if self.static:
+                logging.debug("Parsing package source without installing it")
+            elif self.skip_install:
+                logging.debug("Skipping installation of package {}".format(pkg_name))
+            else:
+                logging.debug("Installing package from {}".format(self.pkg_path))
+                with profile("install"):
+                    self._install_package(pkg_name)
+
+            if self.filter_namespace:
+                logging.info("Namespace filter is passed. Filtering modules within namespace :{}".format(self.filter_namespace))
+                namespace = self.filter_namespace
+
+            logging.debug("Generating tokens")
+            sinks = self._create_sinks(pkg_name) + list(sinks or [])
+            try:
+                apiview = self._generate_tokens(pkg_root_path, pkg_name, version, namespace, sinks)
+            except:
+                for sink in sinks:
+                    sink.discard()
+                raise
+        finally:
+            if install_lock:
+                install_lock.release()
+        _close_sinks(sinks, apiview)
         if apiview.Diagnostics:
             # Show error report in console
             if not self.hide_report:
@@ -128,68 +283,248 @@ class StubGenerator:
         return apiview
 
 
-    def serialize(self, apiview, encoder=APIViewEncoder):
+    def serialize(self, apiview, encoder=None):
         # Serialize tokens into JSON
         logging.debug("Serializing tokens into json")
-        json_apiview = encoder().encode(apiview)
+        json_apiview = self._create_encoder(encoder).encode(apiview)
         return json_apiview
 
 
-    def _find_modules(self, pkg_root_path):
-        """Find modules within the package to import and parse
+    def serialize_to_file(self, apiview, file_path, encoder=None):
+        # Serialize tokens into JSON file without creating complete JSON string in memory
+        logging.debug("Writing tokens into json file {}".format(file_path))
+        from apistub._apiview import write_apiview
+
+        with io.open(file_path, "w") as json_file:
+            write_apiview(apiview, json_file, self._create_encoder(encoder))
+
+
+    def _create_encoder(self, encoder):
+        # Serializer with precomputed fields plan is used unless a different encoder class is passed
+        if encoder:
+            return encoder()
+        from apistub._apiview import APIViewSerializer
+
+        return APIViewSerializer(self.use_orjson)
+
+
+    def generate_in_virtualenv(self):
+        """Install package into a virtual environment leased from pool and generate token file
+        using api stub generator running in the virtual environment
+        """
+        if self._is_package_file():
+            pkg_name, _ = self._parse_pkg_name()
+        else:
+            pkg_name, _, _ = parse_setup_py(self.pkg_path)
+
+        apistub_path = self.venv_pool.get_apistub_path()
+        with self.venv_pool.lease() as venv:
+            logging.debug("Installing package {0} into virtual environment {1}".format(pkg_name, venv.path))
+            venv.install(pkg_name, self.pkg_path)
+            venv.run_apistub(apistub_path, self._get_worker_args())
+        return self.get_out_file_path(pkg_name)
+
+
+    def _get_worker_args(self):
+        # Command line arguments to run api stub generator for same package in a worker process
+        return self._get_args(self.pkg_path) + ["--skip-install"]
+
+
+    def _get_args(self, pkg_path):
+        # Command line arguments to generate token file for a package using same options
+        args = [
+            "--pkg-path", os.path.abspath(pkg_path),
+            "--temp-path", os.path.abspath(self.temp_path),
+            "--out-path", os.path.abspath(self.out_path),
+            "--jobs", str(self.jobs),
+        ]
+        if self.verbose:
+            args.append("--verbose")
+        if self.hide_report:
+            args.append("--hide-report")
+        if self.filter_namespace:
+            args.extend(["--filter-namespace", self.filter_namespace])
+        if self.static:
+            args.append("--static")
+        if self.use_orjson:
+            args.append("--use-orjson")
+        if self.profile:
+            args.append("--profile")
+        if self.incremental:
+            args.append("--incremental")
+        if self.stub_file:
+            args.append("--stub-file")
+        if self.cache_dir:
+            args.extend(["--cache-dir", os.path.abspath(self.cache_dir), "--cache-size", str(self.cache_size)])
+        return args
+
+
+    def _get_batch_args(self, pkg_path):
+        # Command line arguments to generate token file for a package in batch
+        args = self._get_args(pkg_path)
+        if self.skip_install:
+            args.append("--skip-install")
+        if self.venv_pool:
+            args.extend(["--venv-pool", self.venv_pool.pool_path, "--venv-pool-size", str(self.venv_pool.size)])
+        return args
+
+
+    def generate_token_file(self):
+        """Generate token file for the package and return path to token file and number of diagnostics.
+        Number of diagnostics is None if token file is reused from cache or generated in a virtual environment.
+        """
+        # Reuse token file from cache if same package was parsed earlier
+        cached_file_path = self.find_cached_tokens()
+        if cached_file_path:
+            pkg_name, _ = self._parse_pkg_name()
+            out_file_path = self.get_out_file_path(pkg_name)
+            shutil.copyfile(cached_file_path, out_file_path)
+            return out_file_path, None
+
+        # Package is installed and parsed in an isolated virtual environment if virtual environment pool is used
+        if self.venv_pool:
+            return self.generate_in_virtualenv(), None
+
+        profiler = enable_profiler(os.path.basename(self.pkg_path)) if self.profile else None
+        try:
+            apiview = self.generate_tokens()
+            # Write to JSON file
+            out_file_path = self.get_out_file_path(apiview.Name)
+            with profile("serialize"):
+                self.serialize_to_file(apiview, out_file_path)
+        finally:
+            disable_profiler()
+        self.save_fingerprints()
+        self.cache_tokens(out_file_path)
+        if profiler:
+            report_path = profiler.write_report(out_file_path)
+            if not self.hide_report:
+                profiler.print_summary()
+            logging.info("Profile report: {}".format(report_path))
+        return out_file_path, len(apiview.Diagnostics)
+
+
+    def generate_batch(self):
+        """Generate token files for all packages in directory or manifest file given as package path
+        """
+        from apistub._batch import BatchGenerator, find_batch_packages, write_summary
+
+        packages = find_batch_packages(self.pkg_path)
+        generator = BatchGenerator(packages, self._get_batch_args, self.batch_jobs)
+        summary = generator.generate()
+        write_summary(summary, self.out_path)
+        return summary
+
+
+    def get_out_file_path(self, pkg_name):
+        # Generate JSON file name if outpath doesn't have json file name
+        if self.out_path.endswith(".json"):
+            return self.out_path
+        return os.path.join(self.out_path, "{0}_python.json".format(pkg_name))
+
+
+    def get_stub_file_path(self, pkg_name):
+        # Stub file is generated next to token file
+        return "{}.pyi".format(os.path.splitext(self.get_out_file_path(pkg_name))[0])
+
+
+    def _create_sinks(self, pkg_name):
+        # Sinks that write other outputs using tokens while they are generated
+        sinks = []
+        if self.stub_file:
+            from apistub._token_sink import StubFileSink
+
+            sinks.append(StubFileSink(self.get_stub_file_path(pkg_name)))
+        return sinks
+
+
+    def _is_package_file(self):
+        return self.pkg_path.endswith(".whl") or self.pkg_path.endswith(".zip")
+
+
+    def find_cached_tokens(self):
+        """Returns path to token file in cache if same package was parsed earlier using same version of parser.
+        Only wheel and sdist packages are cached.
+        """
+        # Stub file is written only while tokens are generated so token file is not reused if stub file is required
+        if not self.token_cache or not self._is_package_file() or self.stub_file:
+            return None
+        return self.token_cache.get(self._get_cache_key())
+
+
+    def cache_tokens(self, token_file_path):
+        """Add generated token file into cache
+        :param str: token_file_path
+        """
+        if not self.token_cache or not self._is_package_file():
+            return
+        self.token_cache.add(self._get_cache_key(), token_file_path)
+
+
+    def _get_cache_key(self):
+        # Options that change generated tokens or format of token file are part of the cache key
+        options = {
+            "FilterNamespace": self.filter_namespace,
+            "Static": self.static,
+            "SkipInstall": self.skip_install,
+            "UseOrjson": self.use_orjson,
+        }
+        return self.token_cache.get_key(self.pkg_path, options)
+
+
+    def _find_modules(self, pkg_root_path, namespace):
+        """Find modules within namespace in the package to import and parse. Modules with name starting with "_"
+        are skipped, for e.g. _generated, _shared etc
         :param str: pkg_root_path
             Package root path
-        :rtype: list
+        :param str: namespace
+        :rtype: list of ModuleInfo
         """
-        modules = []
-        for root, subdirs, files in os.walk(pkg_root_path):
-            # Ignore any modules with name starts with "_"
-            # For e.g. _generated, _shared etc
-            dirs_to_skip = [x for x in subdirs if x.startswith("_") or x.startswith(".")]
-            for d in dirs_to_skip:
-                subdirs.remove(d)
-
-            # Add current path as module name if _init.py is present
-            if INIT_PY_FILE in files:
-                module_name = os.path.relpath(root, pkg_root_path).replace(
-                    os.path.sep, "."
-                )
-                modules.append(module_name)
-                # Add any public py file names as modules
-                sub_modules = [
-                    os.path.splitext(os.path.basename(f))[0]
-                    for f in files
-                    if f.endswith(".py") and not os.path.basename(f).startswith("_")
-                ]
-                modules.extend(["{0}.{1}".format(module_name, x) for x in sub_modules])
-
-        logging.debug("Modules in package: {}".format(modules))
+        if self.archive:
+            modules = self.archive.find_modules(namespace)
+        else:
+            modules = find_modules(pkg_root_path, namespace)
+        logging.debug("Modules in package: {}".format([m.name for m in modules]))
         return modules
 
 
-    def _generate_tokens(self, pkg_root_path, package_name, version, namespace):
+    def _generate_tokens(self, pkg_root_path, package_name, version, namespace, sinks=None):
         """This method returns a dictionary of namespace and all public classes in each namespace
         """
-        # Import ModuleNode.
-        # Importing it globally can cause circular dependency since it needs NodeIndex that is defined in this file
-        from apistub.nodes._module_node import ModuleNode
-
-        self.module_dict = {}
         nodeindex = NodeIndex()
         # todo (Update the version number correctly)
-        apiview = ApiView(nodeindex, package_name, version, namespace)
-        modules = self._find_modules(pkg_root_path)
-        logging.debug("Modules to generate tokens: {}".format(modules))
+        apiview = ApiView(nodeindex, package_name, version, namespace, sinks)
+        # Modules outside of namespace are not searched
+        with profile("find modules"):
+            self.modules = self._find_modules(pkg_root_path, namespace)
+        filtered_modules = [m.name for m in self.modules]
+
+        # Package might have been parsed earlier in same process if it is running in batch or service mode
+        _clear_cached_modules(filtered_modules, self.static)
+
+        # Modules that are not changed since previous token file was generated are not inspected in incremental mode
+        unchanged_modules = []
+        self.incremental_state = None
+        if self.incremental:
+            from apistub._incremental import IncrementalState
+
+            self.incremental_state = IncrementalState(
+                self.get_out_file_path(package_name),
+                pkg_root_path,
+                {"Namespace": namespace, "Static": self.static},
+                self.archive,
+            )
+            self.incremental_state.load()
+            unchanged_modules = self.incremental_state.find_unchanged_modules(filtered_modules)
 
         # load all modules and parse them recursively
-        for m in modules:
-            if not m.startswith(namespace):
-                logging.debug("Skipping module {0}. Module should start with {1}".format(m, namespace))
-                continue
-
-            logging.debug("Importing module {}".format(m))
-            module_obj = importlib.import_module(m)
-            self.module_dict[m] = ModuleNode(m, module_obj, nodeindex)
+        # Modules are parsed from package root path without importing them in static mode
+        static_root_path = pkg_root_path if self.static else None
+        self.module_dict = self._inspect_all_modules(
+            [m for m in filtered_modules if m not in unchanged_modules], nodeindex, static_root_path
+        )
+        if unchanged_modules:
+            self._add_unchanged_modules(unchanged_modules, nodeindex, static_root_path)
 
         # Create navigation info to navigate within APIreview tool
         navigation = Navigation(package_name, None)
@@ -197,17 +532,107 @@ class StubGenerator:
         apiview.add_navigation(navigation)
 
         # Generate tokens
-        modules = self.module_dict.keys()
-        for m in modules:
-            # Generate and add token to APIView
-            logging.debug("Generating tokens for module {}".format(m))
-            self.module_dict[m].generate_tokens(apiview)
-            # Add navigation info for this modules. navigation info is used to build tree panel in API tool
-            module_nav = self.module_dict[m].get_navigation()
-            if module_nav:
-                navigation.add_child(module_nav)
+        with profile("generate tokens"):
+            for m in filtered_modules:
+                if m not in self.module_dict:
+                    logging.debug("Copying tokens of unchanged module {}".format(m))
+                    self.incremental_state.copy_module(m, apiview, navigation)
+                    continue
+                with profile(m):
+                    self._generate_module_tokens(self.module_dict[m], apiview, navigation)
         return apiview
 
+    def _generate_module_tokens(self, module_node, apiview, navigation):
+        # Generate and add token to APIView
+        logging.debug("Generating tokens for module {}".format(module_node.namespace))
+        token_start = len(apiview.Tokens)
+        diagnostic_start = len(apiview.Diagnostics)
+        if self.incremental_state:
+            module_node.nodeindex.lookups = {}
+        # Navigation info for this module is added while generating tokens. It is not added if module is empty
+        module_nav_index = len(navigation.ChildItems)
+        module_node.generate_tokens(apiview, navigation)
+        if module_nav_index == len(navigation.ChildItems):
+            module_nav_index = None
+
+        if self.incremental_state:
+            self.incremental_state.add_module(
+                module_node,
+                module_node.nodeindex.lookups,
+                [token_start, len(apiview.Tokens)],
+                [diagnostic_start, len(apiview.Diagnostics)],
+                module_nav_index,
+            )
+            module_node.nodeindex.lookups = None
+
+    def _add_unchanged_modules(self, unchanged_modules, nodeindex, static_root_path):
+        """Add node index entries of unchanged modules. A module is inspected again if any name referred in the module
+        is resolved to a different navigation ID because of changes in other modules.
+        """
+        for m in unchanged_modules:
+            self.incremental_state.add_index_entries(m, nodeindex)
+        while True:
+            changed_modules = [m for m in unchanged_modules if not self.incremental_state.is_lookup_valid(m, nodeindex)]
+            if not changed_modules:
+                break
+            logging.debug("Inspecting modules again to update references: {}".format(changed_modules))
+            for m in changed_modules:
+                self.incremental_state.remove_index_entries(m, nodeindex)
+                unchanged_modules.remove(m)
+            self.module_dict.update(self._inspect_all_modules(changed_modules, nodeindex, static_root_path))
+
+    def save_fingerprints(self):
+        """Save fingerprints of modules to generate tokens incrementally next time. This must be called after
+        writing token file
+        """
+        if self.incremental_state:
+            self.incremental_state.save()
+
+    def _inspect_all_modules(self, modules, nodeindex, static_root_path=None):
+        with profile("inspect") as frame:
+            if self.jobs > 1 and len(modules) > 1:
+                return self._inspect_modules_parallel(modules, nodeindex, static_root_path, frame)
+            return self._inspect_modules(modules, nodeindex, static_root_path)
+
+    def _inspect_modules(self, modules, nodeindex, static_root_path=None):
+        """Import and inspect modules one after another in current process
+        """
+        module_dict = {}
+        for m in modules:
+            module_dict[m] = _create_module_node(m, nodeindex, static_root_path, self.incremental)
+        return module_dict
+
+    def _inspect_modules_parallel(self, modules, nodeindex, static_root_path=None, profile_frame=None):
+        """Import and inspect modules in a pool of worker processes.
+        Each worker builds node tree for a module using it's own node index. Node trees and index entries
+        are merged in module order so generated tokens are same as inspecting modules serially.
+        Time recorded by workers is added to profile frame if profiler is enabled.
+        """
+        logging.debug("Inspecting {0} modules using {1} worker processes".format(len(modules), self.jobs))
+        from concurrent.futures import ProcessPoolExecutor
+
+        module_dict = {}
+        with ProcessPoolExecutor(
+            max_workers=self.jobs,
+            initializer=_init_worker,
+            initargs=(logging.getLogger().level,),
+        ) as executor:
+            results = executor.map(
+                _inspect_module,
+                modules,
+                [static_root_path] * len(modules),
+                [self.incremental] * len(modules),
+                [profile_frame is not None] * len(modules),
+            )
+            for m, (module_node, index, frames) in zip(modules, results):
+                for key, node in index.items():
+                    nodeindex.add(key, node)
+                for frame in frames:
+                    profile_frame.merge(frame)
+                module_node.nodeindex = nodeindex
+                module_dict[m] = module_node
+        return module_dict
+
     def _extract_wheel(self):
         """Extract the wheel into out dir and return root path to azure root directory in package
         """
@@ -223,27 +648,19 @@ class StubGenerator:
         logging.debug(
             "Extracting {0} to directory {1}".format(self.pkg_path, temp_pkg_dir)
         )
+        import zipfile
+
         zip_file = zipfile.ZipFile(self.pkg_path)
         zip_file.extractall(temp_pkg_dir)
         logging.debug("Extracted package files into temp path")
         return temp_pkg_dir
 
 
-    def get_module_root_name(self, wheel_extract_path):
-        # APiStubgen finds namespace from setup.py when running against code repo
-        # But we don't have setup.py to parse when wheel is uploaded into APIView tool
-        # Parse top_level.txt file in dist-info to find root module name
-        files = glob.glob(os.path.join(wheel_extract_path, "*", TOP_LEVEL_WHEEL_FILE))
-        if not files:
-            logging.warning("File {0} is not found in {1} to identify root module name. All mdoules in package will be parsed".format(TOP_LEVEL_WHEEL_FILE, wheel_extract_path))
-            return ""
-        with io.open(files[0], "r") as top_lvl_file:
-            root_module_name = top_lvl_file.readline().strip()
-            logging.info("Root module found in {0}: '{1}'".format(TOP_LEVEL_WHEEL_FILE, root_module_name))
-            return root_module_name
-
-
-    def _parse_pkg_name(self):
+    def _parse_pkg_name(self, archive=None):
+        """Returns package name and version from name of wheel or sdist file. Version is read from package metadata
+        if file name doesn't have it and archive is passed
+        :param PackageArchive: archive
+        """
         file_name = os.path.basename(self.pkg_path)
         whl_name, extn = os.path.splitext(file_name)
         if extn[1:] not in ["whl", "zip"]:
@@ -253,12 +670,28 @@ class StubGenerator:
 
         filename_parts = whl_name.split("-")
         pkg_name = filename_parts[0].replace("_", "-")
-        version = filename_parts[1]
-        return pkg_name, version
+        if len(filename_parts) > 1:
+            return pkg_name, filename_parts[1]
+        metadata = archive.read_metadata() if archive else None
+        if not metadata or not metadata["Version"]:
+            raise ValueError("Version of package is not found in file name or metadata of {}".format(file_name))
+        return metadata["Name"] or pkg_name, metadata["Version"]
+
+    def _is_installed(self, pkg_name):
+        # Returns True if a version of the package is installed in current python environment
+        from importlib.metadata import PackageNotFoundError, distribution
+
+        try:
+            distribution(pkg_name)
+            return True
+        except PackageNotFoundError:
+            return False
 
     def _install_package(self, pkg_name):
         # Uninstall the package and reinstall it to parse so inspect can get members in package
         # We don't want to force reinstall to avoid reinstalling other dependent packages
+        from subprocess import check_call
+
         commands = [sys.executable, "-m", "pip", "uninstall", pkg_name, "--yes", "-q"]
         check_call(commands)
         commands = [sys.executable, "-m", "pip", "install", self.pkg_path , "-q"]
@@ -269,6 +702,8 @@ class NodeIndex:
     """Maintains name to navigation ID"""
     def __init__(self):
         self.index = {}
+        # Names looked up in index and navigation ID found for each name. Lookups are recorded only if this is set
+        self.lookups = None
 
     def add(self, name, node):
         if name in self.index:
@@ -280,50 +715,118 @@ class NodeIndex:
 
     def get_id(self, name):
         node = self.get(name)
+        navigation_id = None
         if node and hasattr(node, "namespace_id"):
-            return node.namespace_id
-        return None
+            navigation_id = node.namespace_id
+        if self.lookups is not None:
+            self.lookups[name] = navigation_id
+        return navigation_id
+
+
+def _init_worker(log_level):
+    logging.getLogger().setLevel(log_level)
+
+
+def _close_sinks(sinks, apiview):
+    # If a sink fails to close, it and the sinks that are not closed yet are discarded so their files are removed
+    for index, sink in enumerate(sinks):
+        try:
+            sink.close(apiview)
+        except:
+            for failed_sink in sinks[index:]:
+                failed_sink.discard()
+            raise
+
+
+def _create_module_node(module_name, nodeindex, static_root_path=None, find_source_files=False):
+    """Import or parse module and create module node
+    :param str: module_name
+    :param NodeIndex: nodeindex
+    :param str: static_root_path
+        Package root path to parse module source from. Module is imported if this is not set
+    :param bool: find_source_files
+        Find source files that node tree is created from to generate tokens incrementally
+    """
+    # Import ModuleNode.
+    # Importing it globally can cause circular dependency since it needs NodeIndex that is defined in this file
+    if static_root_path:
+        from apistub.nodes._static_nodes import StaticModuleNode, load_static_module, static_search_path
+
+        # Names are resolved by astroid while node tree is created so package root is searched until it's complete
+        with static_search_path(static_root_path):
+            with profile("parse"):
+                module_ast = load_static_module(module_name, static_root_path)
+            module_node = StaticModuleNode(module_name, module_ast, nodeindex)
+            if find_source_files:
+                module_node.source_files = module_node.get_source_files()
+        return module_node
+
+    from apistub.nodes._module_node import ModuleNode
+
+    logging.debug("Importing module {}".format(module_name))
+    with profile("import"):
+        module_obj = importlib.import_module(module_name)
+    module_node = ModuleNode(module_name, module_obj, nodeindex)
+    if find_source_files:
+        module_node.source_files = module_node.get_source_files()
+    return module_node
+
+
+def _clear_cached_modules(module_names, static):
+    """Remove modules and their submodules imported or parsed earlier in current process.
+    Modules are imported or parsed again to find APIs in current version of the package.
+    :param list: module_names
+    :param bool: static
+    """
+    from apistub.nodes._member_cache import clear_member_cache
+    from apistub.nodes._source_cache import clear_source_cache
+
+    prefixes = tuple("{}.".format(x) for x in module_names)
+    for name in list(sys.modules):
+        if name in module_names or name.startswith(prefixes):
+            del sys.modules[name]
+    importlib.invalidate_caches()
+    clear_source_cache()
+    clear_member_cache()
+    clear_module_members()
+    if static:
+        from apistub.nodes._static_nodes import clear_static_modules
+
+        clear_static_modules(module_names)
+
+
+def _inspect_module(module_name, static_root_path=None, find_source_files=False, profile_module=False):
+    """Import and inspect a module in worker process and return node tree, node index entries for this module and
+    profile frames recorded while inspecting it. Python objects referred by nodes are not required to generate tokens
+    and they are removed so node tree can be sent back to parent process.
+    """
+    nodeindex = NodeIndex()
+    profiler = enable_profiler(module_name) if profile_module else None
+    try:
+        module_node = _create_module_node(module_name, nodeindex, static_root_path, find_source_files)
+    finally:
+        disable_profiler()
+    _detach_objects(module_node)
+    module_node.nodeindex = None
+    frames = [x.to_dict() for x in profiler.root.children.values()] if profiler else []
+    return module_node, nodeindex.index, frames
+
+
+def _detach_objects(node):
+    node.obj = None
+    for child in node.child_nodes:
+        _detach_objects(child)
 
 
 def parse_setup_py(setup_path):
-    """Parses setup.py and finds package name and version"""
-    setup_filename = os.path.join(setup_path, "setup.py")
-    mock_setup = textwrap.dedent(
-        """\
-    def setup(*args, **kwargs):
-        __setup_calls__.append((args, kwargs))
-    """
-    )
-    parsed_mock_setup = ast.parse(mock_setup, filename=setup_filename)
-    with io.open(setup_filename, "r", encoding="utf-8-sig") as setup_file:
-        parsed = ast.parse(setup_file.read())
-        for index, node in enumerate(parsed.body[:]):
-            if (
-                not isinstance(node, ast.Expr)
-                or not isinstance(node.value, ast.Call)
-                or not hasattr(node.value.func, "id")
-                or node.value.func.id != "setup"
-            ):
-                continue
-            parsed.body[index:index] = parsed_mock_setup.body
-            break
-
-    fixed = ast.fix_missing_locations(parsed)
-    codeobj = compile(fixed, setup_filename, "exec")
-    local_vars = {}
-    global_vars = {"__setup_calls__": []}
-    current_dir = os.getcwd()
-    working_dir = os.path.dirname(setup_filename)
-    os.chdir(working_dir)
-    exec(codeobj, global_vars, local_vars)
-    os.chdir(current_dir)
-    _, kwargs = global_vars["__setup_calls__"][0]
-    package_name = kwargs["name"]
+    """Parses setup.py and finds package name, version and namespace"""
+    from apistub._setup_py import read_setup_metadata
+
+    metadata = read_setup_metadata(setup_path)
+    package_name = metadata.name
     name_space = package_name.replace('-', '.')
-    if "packages" in kwargs.keys():
-        packages = kwargs["packages"]
-        if packages:
-            name_space = packages[0]
-            logging.info("Namespaces found for package {0}: {1}".format(package_name, packages))
+    if metadata.packages:
+        name_space = metadata.packages[0]
+        logging.info("Namespaces found for package {0}: {1}".format(package_name, metadata.packages))
 
-    return package_name, kwargs["version"], name_space
+    return package_name, metadata.version, name_space
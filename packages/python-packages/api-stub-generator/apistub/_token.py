@@ -1,15 +1,21 @@
+import sys
+
 from ._token_kind import TokenKind
 
 
 class Token:
     """Entity class to hold individual token information
+    Tokens are created for every keyword, punctuation and whitespace in API view. Slots are used instead of
+    instance dictionary to reduce memory used by tokens and values are interned since same values are repeated.
     """
 
+    __slots__ = ("Kind", "DefinitionId", "NavigateToId", "Value")
+
     def __init__(self, value="", kind=TokenKind.Text):
         self.Kind = kind
         self.DefinitionId = None
         self.NavigateToId = None
-        self.Value = value
+        self.set_value(value)
 
     def set_definition_id(self, id):
         self.DefinitionId = id
@@ -18,4 +24,4 @@ class Token:
         self.NavigateToId = id
 
     def set_value(self, value):
-        self.Value = value
+        self.Value = sys.intern(value) if type(value) is str else value
@@ -0,0 +1,111 @@
+# --------------------------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for license information.
+# --------------------------------------------------------------------------------------------
+
+import hashlib
+import json
+import logging
+import os
+import shutil
+import tempfile
+
+from ._version import VERSION
+
+CACHE_FILE_EXTENSION = ".json"
+DEFAULT_CACHE_SIZE_MB = 1024
+READ_CHUNK_SIZE = 1024 * 1024
+
+
+class TokenCache:
+    """Persistent cache of generated token files.
+    Cache entries are keyed by SHA-256 of package file, version of api stub generator and options that change the
+    token file so a cached token file is reused only if exact same package is parsed using same version of parser
+    and same options.
+    Least recently used entries are removed when total size of cache exceeds max size.
+    :param str: cache_dir
+        Directory to store cached token files
+    :param int: max_size
+        Max size of cache in bytes
+    """
+
+    def __init__(self, cache_dir, max_size=DEFAULT_CACHE_SIZE_MB * 1024 * 1024):
+        self.cache_dir = cache_dir
+        self.max_size = max_size
+        if not os.path.exists(cache_dir):
+            os.makedirs(cache_dir)
+
+    def get_key(self, pkg_path, options=None):
+        """Returns cache key for a package file
+        :param str: pkg_path
+            Path to wheel or sdist package
+        :param dict: options
+            Options used to generate token file that change generated tokens
+        """
+        sha = hashlib.sha256()
+        with open(pkg_path, "rb") as pkg_file:
+            for chunk in iter(lambda: pkg_file.read(READ_CHUNK_SIZE), b""):
+                sha.update(chunk)
+        sha.update(VERSION.encode("utf-8"))
+        if options:
+            sha.update(json.dumps(options, sort_keys=True).encode("utf-8"))
+        return sha.hexdigest()
+
+    def get(self, key):
+        """Returns path to cached token file or None if token file is not available in cache
+        :param str: key
+        """
+        cache_path = self._get_path(key)
+        if not os.path.exists(cache_path):
+            logging.debug("Token cache miss for key {}".format(key))
+            return None
+
+        logging.info("Token cache hit for key {}".format(key))
+        # Update modified time to mark this entry as recently used
+        os.utime(cache_path, None)
+        return cache_path
+
+    def add(self, key, token_file_path):
+        """Add a generated token file into cache
+        :param str: key
+        :param str: token_file_path
+        """
+        cache_path = self._get_path(key)
+        # Copy to a temp file and rename it so other processes never read a partially written entry
+        fd, temp_path = tempfile.mkstemp(dir=self.cache_dir, suffix=".tmp")
+        os.close(fd)
+        try:
+            shutil.copyfile(token_file_path, temp_path)
+            os.replace(temp_path, cache_path)
+        except:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+            raise
+        logging.debug("Added token file {0} into cache as {1}".format(token_file_path, cache_path))
+        self._evict()
+
+    def _get_path(self, key):
+        return os.path.join(self.cache_dir, key + CACHE_FILE_EXTENSION)
+
+    def _evict(self):
+        # Remove least recently used entries until total size of cache is within max size
+        entries = []
+        total_size = 0
+        for entry in os.scandir(self.cache_dir):
+            if not entry.name.endswith(CACHE_FILE_EXTENSION) or not entry.is_file():
+                continue
+            stat = entry.stat()
+            entries.append((stat.st_mtime, stat.st_size, entry.path))
+            total_size += stat.st_size
+
+        entries.sort()
+        for _, size, path in entries:
+            if total_size <= self.max_size:
+                break
+            logging.debug("Removing token file {} from cache".format(path))
+            try:
+                os.remove(path)
+            except OSError:
+                # Entry might be removed already by another process
+                continue
+            total_size -= size
@@ -0,0 +1,135 @@
+import abc
+import io
+import logging
+import os
+import tempfile
+
+from ._apiview import APIViewSerializer, TOKEN_CHUNK_SIZE, write_apiview
+from ._token_kind import TokenKind
+
+# Sinks receive each token when it is added to API view so more than one output can be generated while node tree is
+# walked once. API view keeps all tokens in memory since tokens of types and unchanged modules are copied from them.
+
+
+class TokenSink(abc.ABC):
+    """Base class of sinks that receive tokens while API view is generated. Sink is closed with completed API view
+    after all tokens are added or discarded if token generation fails
+    """
+
+    @abc.abstractmethod
+    def add_token(self, token):
+        """Called for each token in the order it is added to API view
+        :param Token: token
+        """
+
+    def close(self, apiview):
+        """Called after all tokens are added. Navigation and diagnostics are available in API view only at this point
+        :param ApiView: apiview
+        """
+        pass
+
+    def discard(self):
+        """Called if token generation failed. Sink must release any file opened by it
+        """
+        pass
+
+
+class TokenCountSink(TokenSink):
+    """Counts tokens without keeping them. This is useful to measure token generation in benchmarks
+    """
+
+    def __init__(self):
+        self.token_count = 0
+        self.diagnostic_count = 0
+
+    def add_token(self, token):
+        self.token_count += 1
+
+    def close(self, apiview):
+        self.diagnostic_count = len(apiview.Diagnostics)
+
+
+class JsonFileSink(TokenSink):
+    """Writes API view into a JSON file same as token file. Tokens are encoded in chunks while they are generated and
+    kept in a temporary file until navigation and diagnostics are available
+    :param str: file_path
+    :param json_encoder: json_encoder
+        Encoder to encode tokens and fields of API view. APIViewSerializer is used if encoder is not passed
+    :param int: chunk_size
+        Number of tokens to encode at a time
+    """
+
+    def __init__(self, file_path, json_encoder=None, chunk_size=TOKEN_CHUNK_SIZE):
+        self.file_path = file_path
+        self.json_encoder = json_encoder or APIViewSerializer()
+        self.chunk_size = chunk_size
+        self._tokens = []
+        self._encoded_tokens = tempfile.TemporaryFile("w+")
+        self._is_empty = True
+        self._is_file_created = False
+
+    def add_token(self, token):
+        self._tokens.append(token)
+        if len(self._tokens) >= self.chunk_size:
+            self._write_tokens()
+
+    def _write_tokens(self):
+        # Write encoded tokens as comma separated values without enclosing brackets
+        if not self._tokens:
+            return
+        if not self._is_empty:
+            self._encoded_tokens.write(", ")
+        self._encoded_tokens.write(self.json_encoder.encode(self._tokens)[1:-1])
+        self._tokens = []
+        self._is_empty = False
+
+    def close(self, apiview):
+        logging.debug("Writing tokens into json file {}".format(self.file_path))
+        self._write_tokens()
+        self._encoded_tokens.seek(0)
+        try:
+            self._is_file_created = True
+            with io.open(self.file_path, "w") as json_file:
+                write_apiview(apiview, json_file, self.json_encoder, encoded_tokens=self._encoded_tokens)
+        finally:
+            self._encoded_tokens.close()
+
+    def discard(self):
+        self._encoded_tokens.close()
+        # JSON file is removed if it's partially written when closing the sink failed
+        if self._is_file_created and os.path.exists(self.file_path):
+            os.remove(self.file_path)
+
+
+class StubFileSink(TokenSink):
+    """Writes text of tokens into a plain text stub file similar to API view shown in review tool. Tokens are written
+    into the file while they are generated
+    :param str: file_path
+    """
+
+    def __init__(self, file_path):
+        self.file_path = file_path
+        self._line = []
+        self._file = io.open(file_path, "w", encoding="utf-8")
+
+    def add_token(self, token):
+        if token.Kind is TokenKind.Newline:
+            # Whitespace added to indent empty lines is removed
+            self._file.write("".join(self._line).rstrip())
+            self._file.write("\n")
+            self._line = []
+        else:
+            self._line.append(token.Value)
+
+    def close(self, apiview):
+        logging.debug("Writing stub file {}".format(self.file_path))
+        try:
+            if self._line:
+                self._file.write("".join(self._line).rstrip())
+                self._file.write("\n")
+        finally:
+            self._file.close()
+
+    def discard(self):
+        self._file.close()
+        os.remove(self.file_path)
@@ -0,0 +1,223 @@
+# --------------------------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for license information.
+# --------------------------------------------------------------------------------------------
+
+import contextlib
+import hashlib
+import logging
+import os
+import shutil
+import sys
+import time
+
+from ._version import VERSION
+
+DEFAULT_POOL_SIZE = 2
+# Packages installed into every virtual environment when it is created
+# astroid is required to run api stub generator within the virtual environment
+COMMON_PACKAGES = ["astroid", "azure-core", "msrest"]
+LEASE_FILE_EXTENSION = ".lease"
+READY_FILE = ".apistub-ready"
+WHEEL_CACHE_DIR = "wheels"
+APISTUB_SOURCE_DIR = "apistub-src"
+APISTUB_SOURCE_HASH_LENGTH = 12
+LEASE_RETRY_INTERVAL = 1
+DEFAULT_LEASE_TIMEOUT = 3600
+
+
+class VirtualEnv:
+    """Virtual environment in pool
+    :param str: path
+        Root path of the virtual environment
+    :param str: wheel_cache_path
+        Directory of wheels shared by all virtual environments in pool
+    """
+
+    def __init__(self, path, wheel_cache_path):
+        self.path = path
+        self.wheel_cache_path = wheel_cache_path
+        if os.name == "nt":
+            self.python = os.path.join(path, "Scripts", "python.exe")
+        else:
+            self.python = os.path.join(path, "bin", "python")
+
+    def is_ready(self):
+        return os.path.exists(os.path.join(self.path, READY_FILE))
+
+    def create(self, common_packages):
+        """Create virtual environment and install common packages from shared wheel cache
+        """
+        from subprocess import check_call
+
+        logging.info("Creating virtual environment {}".format(self.path))
+        if os.path.exists(self.path):
+            shutil.rmtree(self.path)
+        check_call([sys.executable, "-m", "venv", self.path])
+        if common_packages:
+            # Build wheels once for all virtual environments in pool. pip reuses wheels that are already in cache
+            check_call(
+                [self.python, "-m", "pip", "wheel", "-q", "--find-links", self.wheel_cache_path,
+                 "-w", self.wheel_cache_path] + common_packages
+            )
+            self._pip_install(common_packages)
+        with open(os.path.join(self.path, READY_FILE), "w") as ready_file:
+            ready_file.write(VERSION)
+
+    def install(self, pkg_name, pkg_path):
+        """Install package into virtual environment. Any version of the package installed earlier is removed.
+        :param str: pkg_name
+        :param str: pkg_path
+        """
+        from subprocess import call
+
+        call([self.python, "-m", "pip", "uninstall", pkg_name, "--yes", "-q"])
+        self._pip_install([pkg_path])
+
+    def run_apistub(self, apistub_path, args):
+        """Run api stub generator using python in this virtual environment
+        :param str: apistub_path
+            Directory that has apistub package
+        :param list: args
+            Command line arguments for api stub generator
+        """
+        from subprocess import check_call
+
+        env = dict(os.environ)
+        env["PYTHONPATH"] = apistub_path
+        commands = [self.python, "-c", "from apistub import console_entry_point; console_entry_point()"]
+        check_call(commands + args, env=env)
+
+    def _pip_install(self, packages):
+        from subprocess import check_call
+
+        check_call(
+            [self.python, "-m", "pip", "install", "-q", "--find-links", self.wheel_cache_path] + packages
+        )
+
+
+class VirtualEnvPool:
+    """Pool of reusable virtual environments to install and parse packages in isolation.
+    A virtual environment is leased by holding an exclusive lock on a lease file next to it so multiple processes in
+    same host can share the pool. Lock is released by the OS if the process exits without returning the virtual
+    environment so stale leases never block the pool. Virtual environments are created on first use and reused for
+    all packages later.
+    :param str: pool_path
+    :param int: size
+    :param list: common_packages
+        Packages to pre install in each virtual environment
+    """
+
+    def __init__(self, pool_path, size=DEFAULT_POOL_SIZE, common_packages=COMMON_PACKAGES):
+        self.pool_path = os.path.abspath(pool_path)
+        self.size = size
+        self.common_packages = common_packages
+        self.wheel_cache_path = os.path.join(self.pool_path, WHEEL_CACHE_DIR)
+        for path in [self.pool_path, self.wheel_cache_path]:
+            if not os.path.exists(path):
+                os.makedirs(path)
+
+    @contextlib.contextmanager
+    def lease(self, timeout=DEFAULT_LEASE_TIMEOUT):
+        """Lease a virtual environment from pool. Virtual environment is returned to pool when context exits
+        :param int: timeout
+            Max time in seconds to wait for a free virtual environment
+        """
+        end_time = time.time() + timeout
+        while True:
+            venv_path, lease_fd = self._try_lease()
+            if venv_path:
+                break
+            if time.time() > end_time:
+                raise RuntimeError("No virtual environment available in pool {}".format(self.pool_path))
+            time.sleep(LEASE_RETRY_INTERVAL)
+
+        venv = VirtualEnv(venv_path, self.wheel_cache_path)
+        try:
+            if not venv.is_ready():
+                venv.create(self.common_packages)
+            yield venv
+        finally:
+            # Lease file is kept so other processes never lock a file that is removed
+            _unlock_file(lease_fd)
+            os.close(lease_fd)
+            logging.debug("Released virtual environment {}".format(venv.path))
+
+    def get_apistub_path(self):
+        """Copy api stub generator package into pool and return the path to be added in PYTHONPATH.
+        Copying only apistub package avoids exposing packages in current environment to virtual environments.
+        """
+        source_path = os.path.dirname(os.path.abspath(__file__))
+        # Copy is keyed by hash of source so a changed apistub is copied again without bumping version
+        apistub_path = os.path.join(
+            self.pool_path, APISTUB_SOURCE_DIR, "{0}-{1}".format(VERSION, _get_source_hash(source_path))
+        )
+        if not os.path.exists(apistub_path):
+            temp_path = "{0}.{1}".format(apistub_path, os.getpid())
+            shutil.copytree(
+                source_path, os.path.join(temp_path, "apistub"), ignore=shutil.ignore_patterns("__pycache__")
+            )
+            try:
+                os.rename(temp_path, apistub_path)
+            except OSError:
+                # Another process copied the package already
+                shutil.rmtree(temp_path)
+        return apistub_path
+
+    def _try_lease(self):
+        # Returns path to a free virtual environment and file descriptor of the locked lease file after acquiring
+        # lease or (None, None) if all are in use
+        for index in range(self.size):
+            venv_path = os.path.join(self.pool_path, "venv{}".format(index))
+            lease_fd = os.open(venv_path + LEASE_FILE_EXTENSION, os.O_CREAT | os.O_RDWR)
+            if not _lock_file(lease_fd):
+                os.close(lease_fd)
+                continue
+            # Process ID is written only to find the process that is using virtual environment
+            os.ftruncate(lease_fd, 0)
+            os.write(lease_fd, str(os.getpid()).encode("utf-8"))
+            logging.debug("Leased virtual environment {}".format(venv_path))
+            return venv_path, lease_fd
+        return None, None
+
+
+def _lock_file(fd):
+    # Returns True if exclusive lock is acquired on the file without waiting
+    try:
+        if os.name == "nt":
+            import msvcrt
+
+            os.lseek(fd, 0, os.SEEK_SET)
+            msvcrt.locking(fd, msvcrt.LK_NBLCK, 1)
+        else:
+            import fcntl
+
+            fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        return True
+    except OSError:
+        return False
+
+
+def _unlock_file(fd):
+    if os.name == "nt":
+        import msvcrt
+
+        os.lseek(fd, 0, os.SEEK_SET)
+        msvcrt.locking(fd, msvcrt.LK_UNLCK, 1)
+    else:
+        import fcntl
+
+        fcntl.flock(fd, fcntl.LOCK_UN)
+
+
+def _get_source_hash(source_path):
+    # Returns short hash of path and content of each file in apistub package
+    sha = hashlib.sha256()
+    for dir_path, dir_names, file_names in os.walk(source_path):
+        dir_names[:] = sorted(x for x in dir_names if x != "__pycache__")
+        for file_name in sorted(file_names):
+            file_path = os.path.join(dir_path, file_name)
+            sha.update(os.path.relpath(file_path, source_path).replace(os.sep, "/").encode("utf-8"))
+            with open(file_path, "rb") as source_file:
+                sha.update(source_file.read())
+    return sha.hexdigest()[:APISTUB_SOURCE_HASH_LENGTH]
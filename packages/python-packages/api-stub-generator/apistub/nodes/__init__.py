@@ -9,6 +9,7 @@ from ._function_node import FunctionNode
 from ._module_node import ModuleNode
 from ._property_node import PropertyNode
 from ._variable_node import VariableNode
+from ._static_nodes import StaticModuleNode, StaticClassNode, StaticFunctionNode, StaticPropertyNode
 
 
 __all__ = [
@@ -22,4 +23,8 @@ __all__ = [
     "ModuleNode",
     "PropertyNode",
     "VariableNode",
+    "StaticModuleNode",
+    "StaticClassNode",
+    "StaticFunctionNode",
+    "StaticPropertyNode",
 ]
@@ -22,6 +22,13 @@ class ArgType:
         self.function_node = func_node
 
 
+    def copy(self, func_node):
+        """Returns a copy of this argument for a copy of the function node
+        :param FunctionNode func_node: Function node that the argument is copied to
+        """
+        return ArgType(self.argname, self.argtype, self.default, func_node)
+
+
     def set_function_node(self, func_node):
         # Function node which is parent node can set it's refernce once docstring parser creates Argtype objects
         # This function node will be used to report any error found in arg while generating token.
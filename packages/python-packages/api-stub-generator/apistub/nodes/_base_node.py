@@ -14,13 +14,18 @@ class NodeEntityBase:
         self.namespace = namespace
         self.parent_node = parent_node
         self.obj = obj
-        self.name = ""
-        if hasattr(obj, "__name__"):
-            self.name = obj.__name__
+        self.name = self._get_obj_name(obj)
         self.display_name = self.name
         self.child_nodes = []
         self.errors = []
 
+    def _get_obj_name(self, obj):
+        """Returns name of the object represented by this node
+        """
+        if hasattr(obj, "__name__"):
+            return obj.__name__
+        return ""
+
     def generate_id(self):
         """Generates ID for current object using parent object's ID and name
         """
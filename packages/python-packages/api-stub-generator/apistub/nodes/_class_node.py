@@ -3,6 +3,8 @@ import inspect
 import enum
 from enum import Enum
 import types
+import functools
+import itertools
 import operator
 
 from ._base_node import NodeEntityBase
@@ -11,18 +13,37 @@ from ._enum_node import EnumNode
 from ._property_node import PropertyNode
 from ._docstring_parser import DocstringParser
 from ._variable_node import VariableNode
+from ._member_cache import get_member_node
+from apistub._profiler import profile
 
 
-find_props = lambda x: isinstance(x, PropertyNode)
-find_instancefunc = (
-    lambda x: isinstance(x, FunctionNode)
-    and not x.is_class_method
-    and not x.name.startswith("__")
-)
-find_enum = lambda x: isinstance(x, EnumNode)
-find_var = lambda x: isinstance(x, VariableNode)
-find_classfunc = lambda x: isinstance(x, FunctionNode) and x.is_class_method
-find_dunder_func = lambda x: isinstance(x, FunctionNode) and x.name.startswith("__")
+# Child nodes of a class are listed in following order of groups and they are sorted by name within each group
+PROPERTY_GROUP = 0
+VARIABLE_GROUP = 1
+ENUM_GROUP = 2
+DUNDER_METHOD_GROUP = 3
+CLASS_METHOD_GROUP = 4
+INSTANCE_METHOD_GROUP = 5
+
+
+def get_child_group(node):
+    """Returns group of a child node in class or None if node is not listed in class
+    :param NodeEntityBase: node
+    """
+    if isinstance(node, PropertyNode):
+        return PROPERTY_GROUP
+    if isinstance(node, VariableNode):
+        return VARIABLE_GROUP
+    if isinstance(node, EnumNode):
+        return ENUM_GROUP
+    if isinstance(node, FunctionNode):
+        if node.name.startswith("__"):
+            return DUNDER_METHOD_GROUP
+        if node.is_class_method:
+            return CLASS_METHOD_GROUP
+        return INSTANCE_METHOD_GROUP
+    return None
+
 
 # This static dict will be used to identify if a class implements a specific ABC class
 # and tag class as implementing corresponding ABC class instead of showing these dunder methods
@@ -49,6 +70,17 @@ ABSTRACT_CLASS_METHODS = {
     "Awaitable": ["__await__"],
 }
 
+# Each method name in ABSTRACT_CLASS_METHODS is assigned a bit so methods of a class are collected in a bitmask
+# while members are added and ABC classes are matched using their precomputed masks
+ABSTRACT_METHOD_BITS = dict(
+    (name, 1 << index)
+    for index, name in enumerate(sorted(set(x for methods in ABSTRACT_CLASS_METHODS.values() for x in methods)))
+)
+ABSTRACT_CLASS_MASKS = dict(
+    (c, functools.reduce(operator.or_, [ABSTRACT_METHOD_BITS[x] for x in methods]))
+    for c, methods in ABSTRACT_CLASS_METHODS.items()
+)
+
 
 class ClassNode(NodeEntityBase):
     """Class node to represent parsed class node and children
@@ -61,35 +93,44 @@ class ClassNode(NodeEntityBase):
         self.namespace_id = self.generate_id()
         self.full_name = self.namespace_id
         self.implements = []
-        self._inspect()
-        self._set_abc_implements()
-        self._sort_elements()
+        # Child nodes by name to find existing members without scanning all children
+        self.functions = {}
+        self.variables = {}
+        self.properties = {}
+        # Bitmask of ABC methods defined in class
+        self._abstract_method_mask = 0
+        # Number of properties, variables and enum values that are listed before methods in child nodes
+        self._member_count = 0
+        with profile(self.name):
+            self._inspect()
+            self._set_abc_implements()
+            self._sort_elements()
 
     def _set_abc_implements(self):
         # Check if class adher to any abstract class implementation.
         # If class has implementation for all required abstract methods then tag this class
         # as implementing that abstract class. For e.g. if class has both __iter__ and __next__
         # then this class implements Iterator
-        instance_functions = [
-            x for x in self.child_nodes if isinstance(x, FunctionNode)
-        ]
-        instance_function_names = [x.name for x in instance_functions]
-
-        is_implemented = lambda func: func in instance_function_names
-        for c in ABSTRACT_CLASS_METHODS:
-            logging.debug("Checking if class implements {}".format(c))
-            if all(map(is_implemented, ABSTRACT_CLASS_METHODS[c])):
+        for c, mask in ABSTRACT_CLASS_MASKS.items():
+            if self._abstract_method_mask & mask == mask:
                 logging.debug("Class {0} implements {1}".format(self.name, c))
                 self.implements.append(c)
 
-        # Hide all methods for implemented ABC classes/ implements
-        methods_to_hide = []
-        for abc_class in self.implements:
-            methods_to_hide.extend(ABSTRACT_CLASS_METHODS[abc_class])
         # Hide abc methods for ABC implementations
-        for method in instance_functions:
-            if method.name in methods_to_hide:
-                method.hidden = True
+        for abc_class in self.implements:
+            for method in ABSTRACT_CLASS_METHODS[abc_class]:
+                self.functions[method].hidden = True
+
+    def _add_child_node(self, node):
+        # Add member node as child and index it by name
+        self.child_nodes.append(node)
+        if isinstance(node, FunctionNode):
+            self.functions.setdefault(node.name, node)
+            self._abstract_method_mask |= ABSTRACT_METHOD_BITS.get(node.name, 0)
+        elif isinstance(node, VariableNode):
+            self.variables.setdefault(node.name, node)
+        elif isinstance(node, PropertyNode):
+            self.properties.setdefault(node.name, node)
 
     def _should_include_function(self, func_obj):
         # Method or Function member should only be included if it is defined in same package.
@@ -105,15 +146,18 @@ class ClassNode(NodeEntityBase):
 
         return False
 
+    def _get_mro(self):
+        return self.obj.__mro__
+
     def _inspect(self):
         # Inspect current class and it's members recursively
         logging.debug("Inspecting class {}".format(self.full_name))
         # get base classes
         self.base_class_names = self._get_base_classes()
         # Check if Enum is in Base class hierarchy
-        self.is_enum = Enum in self.obj.__mro__
+        self.is_enum = Enum in self._get_mro()
         # Find any ivar from docstring
-        self._parse_ivars()
+        self._parse_ivars(getattr(self.obj, "__doc__", None))
 
         # find members in node
         for name, child_obj in inspect.getmembers(self.obj):
@@ -122,62 +166,77 @@ class ClassNode(NodeEntityBase):
             elif self._should_include_function(child_obj):
                 # Include dunder and public methods
                 if not name.startswith("_") or name.startswith("__"):
-                    self.child_nodes.append(
-                        FunctionNode(self.namespace, self, child_obj)
-                    )
+                    self._add_child_node(get_member_node(
+                        self._get_function_key(child_obj), self, child_obj,
+                        lambda: FunctionNode(self.namespace, self, child_obj)
+                    ))
             elif self.is_enum and isinstance(child_obj, self.obj):
                 # Enum values will be of parent instance type
                 child_obj.__name__ = name
-                self.child_nodes.append(EnumNode(self.namespace, self, child_obj))
+                self._add_child_node(EnumNode(self.namespace, self, child_obj))
             elif isinstance(child_obj, property):
                 if not name.startswith("_"):
                     # Add instance properties
-                    self.child_nodes.append(
-                        PropertyNode(self.namespace, self, name, child_obj)
-                    )
+                    self._add_child_node(get_member_node(
+                        (self.namespace, name, child_obj), self, child_obj,
+                        lambda: PropertyNode(self.namespace, self, name, child_obj)
+                    ))
             elif not name.startswith("_") and (
                 isinstance(child_obj, str) or isinstance(child_obj, int)
             ):
                 # Add any public class level variables
-                # if variable is already present  in parsed list then just update the value
-                var_nodes = [v for v in self.child_nodes if isinstance(v, VariableNode) and v.name == name]
-                if var_nodes:
-                    var_nodes[0].value = str(child_obj)
-                else:
-                    # Assumption here is that class level variables are either str or int constants
-                    self.child_nodes.append(
-                        (
-                            VariableNode(
-                                self.namespace, self, name, None, str(child_obj), False
-                            )
-                        )
+                self._add_class_variable(name, str(child_obj))
+
+    def _get_function_key(self, func_obj):
+        # Class methods are bound to each class and they are identified using the underlying function
+        key = (self.namespace, getattr(func_obj, "__func__", func_obj))
+        if func_obj.__name__ == "__init__" and not getattr(func_obj, "__doc__", None):
+            # Constructor without docstring refers docstring of the class
+            key += (getattr(self.obj, "__doc__", None),)
+        return key
+
+    def _add_class_variable(self, name, value):
+        # if variable is already present  in parsed list then just update the value
+        if name in self.variables:
+            self.variables[name].value = value
+        else:
+            # Assumption here is that class level variables are either str or int constants
+            self._add_child_node(
+                (
+                    VariableNode(
+                        self.namespace, self, name, None, value, False
                     )
+                )
+            )
 
-    def _parse_ivars(self):
+    def _parse_ivars(self, docstring):
         # This method will add instance variables by parsing docstring
-        if not hasattr(self.obj, "__doc__"):
-            return
-        docstring = getattr(self.obj, "__doc__")
         if docstring:
-            docstring_parser = DocstringParser(docstring)
-            for var in docstring_parser.find_args("ivar"):
+            with profile("docstring"):
+                docstring_parser = DocstringParser(docstring)
+                ivars = docstring_parser.find_args("ivar")
+            for var in ivars:
                 ivar_node = VariableNode(
                     self.namespace, self, var.argname, var.argtype, None, True
                 )
-                self.child_nodes.append(ivar_node)
+                self._add_child_node(ivar_node)
 
     def _sort_elements(self):
         # Sort elements in following order
         # properties, variables, Enums, dunder methods, class functions and instance methods
-        # sort all elements based on name firstand then group them
-        self.child_nodes.sort(key=operator.attrgetter("name"))
-        sorted_children = list(filter(find_props, self.child_nodes))
-        sorted_children.extend(filter(find_var, self.child_nodes))
-        sorted_children.extend(filter(find_enum, self.child_nodes))
-        sorted_children.extend(filter(find_dunder_func, self.child_nodes))
-        sorted_children.extend(filter(find_classfunc, self.child_nodes))
-        sorted_children.extend(filter(find_instancefunc, self.child_nodes))
-        self.child_nodes = sorted_children
+        # Group of each element is found in a single pass and elements are sorted by group and then by name
+        grouped_children = []
+        member_count = 0
+        for child in self.child_nodes:
+            group = get_child_group(child)
+            if group is None:
+                continue
+            if group < DUNDER_METHOD_GROUP:
+                member_count += 1
+            grouped_children.append(((group, child.name), child))
+        grouped_children.sort(key=operator.itemgetter(0))
+        self.child_nodes = [child for _, child in grouped_children]
+        self._member_count = member_count
 
     def _get_base_classes(self):
         # Find base classes
@@ -223,16 +282,15 @@ class ClassNode(NodeEntityBase):
         # Add members and methods
         apiview.add_new_line()
         apiview.begin_group()
-        for e in [p for p in self.child_nodes if not isinstance(p, FunctionNode)]:
+        # Members are sorted before methods in child nodes
+        for e in itertools.islice(self.child_nodes, self._member_count):
             apiview.add_whitespace()
             e.generate_tokens(apiview)
             apiview.add_new_line()
         apiview.add_new_line(1)
-        for func in [
-            x
-            for x in self.child_nodes
-            if isinstance(x, FunctionNode) and x.hidden == False
-        ]:
+        for func in itertools.islice(self.child_nodes, self._member_count, None):
+            if func.hidden:
+                continue
             func.generate_tokens(apiview)
             apiview.add_new_line(1)
         apiview.end_group()
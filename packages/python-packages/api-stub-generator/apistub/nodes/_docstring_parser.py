@@ -1,7 +1,8 @@
+import functools
 import re
-import inspect
 import logging
 from ._argtype import ArgType
+from ._source_cache import get_source
 
 
 # REGEX to parse docstring
@@ -21,6 +22,25 @@ find_type_hint_ret_type = "(?<!#)#\s+type:[^\n]*->\s+([^\n]*)"
 
 docstring_types = ["param", "type", "paramtype", "keyword", "rtype"]
 
+# Field names indexed when docstring is scanned. A name that is prefix of another name is listed after that name
+# so each field is indexed using longest matching name
+docstring_fields = ["keywordtype", "keyword", "paramtype", "param", "vartype", "ivar", "rtype", "type"]
+find_field_regex = re.compile("(?<!:):({})".format("|".join(docstring_fields)))
+
+# Max number of regex compiled for argument and type names that are kept for reuse. Argument names are different
+# in each package so cache is bounded to keep memory flat when many packages are parsed in same process
+REGEX_CACHE_SIZE = 1024
+
+
+@functools.lru_cache(maxsize=REGEX_CACHE_SIZE)
+def _get_regex(pattern, *args):
+    return re.compile(pattern.format(*args))
+
+
+def _get_field_names(type_name):
+    # Type name is a single field name or a group of field names for e.g. (type|vartype)
+    return type_name.strip("()").split("|")
+
 
 class DocstringParser:
     """This represents a parsed doc string which has list of positional and keyword arguements and return type
@@ -31,31 +51,31 @@ class DocstringParser:
         self.kw_args = []
         self.ret_type = None
         self.docstring = docstring
+        self._field_index = None
 
     def find_type(self, type_name="type", var_name=""):
         # This method will find argument type or return type from docstring
         # some params takes two types of params and some takes only one type
         # search for type strings with multiple type like below e.g.
         # :type <var_name>: <type1> or <type2>
-        multi_type_regex = re.compile(find_multi_type_regex.format(type_name, var_name))
-        type_groups = multi_type_regex.search(self.docstring)
+        field_names = _get_field_names(type_name)
+        multi_type_regex = _get_regex(find_multi_type_regex, type_name, var_name)
+        type_groups = self._search(multi_type_regex, field_names)
         if type_groups:
             type_string = type_groups.groups()[2].replace("\n", "").strip()
             logging.debug("variable name: {0}, type from docstring: {1}".format(var_name, type_string))
             return type_string
 
         # Check for Union type
-        union_type_regex = re.compile(find_union_type_regex.format(type_name, var_name))
-        type_groups = union_type_regex.search(self.docstring)
+        union_type_regex = _get_regex(find_union_type_regex, type_name, var_name)
+        type_groups = self._search(union_type_regex, field_names)
         if type_groups:
             return type_groups.groups()[1]
 
         # Check for single type param
         # type e.g. :type <var_name>: <type1>
-        single_type_regex = re.compile(
-            find_single_type_regex.format(type_name, var_name)
-        )
-        type_groups = single_type_regex.search(self.docstring)
+        single_type_regex = _get_regex(find_single_type_regex, type_name, var_name)
+        type_groups = self._search(single_type_regex, field_names)
         if type_groups:
             return type_groups.groups()[-1]
 
@@ -63,7 +83,7 @@ class DocstringParser:
 
     def find_return_type(self):
         # Find return type from docstring
-        ret_type = re.search(find_docstring_return_type, self.docstring)
+        ret_type = self._search(_get_regex(find_docstring_return_type), ["rtype"])
         if ret_type:
             return ret_type.groups()[-1]
         return None
@@ -71,8 +91,8 @@ class DocstringParser:
     def find_args(self, arg_type="param"):
         # This method will find positional or kw arguement
         # find docstring that has both type and arg name in same docstring
-        arg_type_regex = re.compile(find_arg_and_type_regex.format(arg_type))
-        args = arg_type_regex.findall(self.docstring)
+        arg_type_regex = _get_regex(find_arg_and_type_regex, arg_type)
+        args = [x.groups() for x in self._find_all(arg_type_regex, [arg_type])]
         params = [
             ArgType(x[1].strip(), x[0].strip())
             if x[1].strip()
@@ -81,8 +101,8 @@ class DocstringParser:
         ]
 
         # fin param or keyword args that ddoesn't type in same docstring
-        arg_regex = re.compile(find_arg_regex.format(arg_type))
-        args = arg_regex.findall(self.docstring)
+        arg_regex = _get_regex(find_arg_regex, arg_type)
+        args = [x.group(1) for x in self._find_all(arg_regex, [arg_type])]
         params.extend([ArgType(x.strip()) for x in args])
 
         # Get type if it is missing
@@ -95,6 +115,42 @@ class DocstringParser:
                 p.argtype = self.find_type("(type|keywordtype|paramtype|vartype)", p.argname)
         return params
 
+    def _get_field_positions(self, field_names):
+        # Returns start position of all fields with given names in docstring.
+        # Docstring is scanned only once to find position of all fields
+        if self._field_index is None:
+            self._field_index = {}
+            for field in find_field_regex.finditer(self.docstring):
+                self._field_index.setdefault(field.group(1), []).append(field.start())
+
+        positions = []
+        for name in field_names:
+            positions.extend(self._field_index.get(name, []))
+        if len(field_names) > 1:
+            positions.sort()
+        return positions
+
+    def _search(self, regex, field_names):
+        # Returns first match of regex in docstring. Regex is matched only at the start of fields with given names
+        for position in self._get_field_positions(field_names):
+            match = regex.match(self.docstring, position)
+            if match:
+                return match
+        return None
+
+    def _find_all(self, regex, field_names):
+        # Returns all non overlapping matches of regex in docstring same as re.findall
+        matches = []
+        end = 0
+        for position in self._get_field_positions(field_names):
+            if position < end:
+                continue
+            match = regex.match(self.docstring, position)
+            if match:
+                matches.append(match)
+                end = match.end()
+        return matches
+
     def parse(self):
         """Returns a parsed docstring object
         """
@@ -110,15 +166,18 @@ class DocstringParser:
 class TypeHintParser:
     """TypeHintParser helps to find return type from type hint is type hint is available
     :param object: obj
+    :param str: code
+        Source code of the object. Source is retrieved from source cache if code is not passed
     """
 
-    def __init__(self, obj):
+    def __init__(self, obj, code=None):
         self.obj = obj
-        try:
-            self.code = inspect.getsource(obj)
-        except:
-            self.code = None
-            logging.error("Failed to get source of object {}".format(obj))
+        self.code = code
+        if code is None:
+            try:
+                self.code = get_source(obj)
+            except:
+                logging.error("Failed to get source of object {}".format(obj))
 
     def find_return_type(self):
         """Returns return type is type hint is available
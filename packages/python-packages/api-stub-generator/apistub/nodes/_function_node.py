@@ -1,3 +1,4 @@
+import copy
 import logging
 import inspect
 import astroid
@@ -7,6 +8,8 @@ from inspect import Parameter
 from ._docstring_parser import DocstringParser, TypeHintParser
 from ._base_node import NodeEntityBase, get_qualified_name
 from ._argtype import ArgType
+from ._source_cache import get_decorators, get_function_def, get_source
+from apistub._profiler import profile
 
 
 KW_ARG_NAME = "**kwargs"
@@ -59,12 +62,14 @@ class FunctionNode(NodeEntityBase):
         # Some of the methods wont be listed in API review
         # For e.g. ABC methods if class implements all ABC methods
         self.hidden = False
-        self._inspect()
+        with profile(self.name):
+            self._inspect()
 
 
     def _inspect(self):
         logging.debug("Processing function {0}".format(self.name))
-        code = inspect.getsource(self.obj).strip()
+        source = self._get_source()
+        code = source.strip()
         # We cannot do "startswith" check here due to annotations or decorators present for functions
         self.is_async = "async def" in code
         self.def_key = "async def" if self.is_async else "def"
@@ -74,13 +79,7 @@ class FunctionNode(NodeEntityBase):
 
         # Find decorators and any annotations
         try:
-            node = astroid.extract_node(inspect.getsource(self.obj))
-            if node.decorators:
-                self.annotations = [
-                    "@{}".format(x.name)
-                    for x in node.decorators.nodes
-                    if hasattr(x, "name")
-                ]
+            self.annotations = self._get_decorators(source)
         except:
             # todo Update exception details in error
             error_message = "Error in parsing decorators for function {}".format(
@@ -93,6 +92,64 @@ class FunctionNode(NodeEntityBase):
         self._parse_function()
 
 
+    def copy(self, parent_node, obj):
+        """Returns a copy of this node for same function found in another class. Function is not parsed again and
+           only parent node and ID are updated in copied node
+        :param NodeEntityBase: parent_node
+        :param function: obj
+        """
+        node = copy.copy(self)
+        node.parent_node = parent_node
+        node.obj = obj
+        node.namespace_id = node.generate_id()
+        if node.is_async:
+            node.namespace_id += ":async"
+        node.full_name = node.namespace_id
+        node.hidden = False
+        node.annotations = list(self.annotations)
+        node.errors = list(self.errors)
+        # Args refer function node to report errors found while generating tokens
+        copied_args = dict((id(x), x.copy(node)) for x in self.args + self.kw_args)
+        node.args = [copied_args[id(x)] for x in self.args]
+        node.kw_args = [copied_args[id(x)] for x in self.kw_args]
+        return node
+
+
+    def _get_source(self):
+        """Returns source code of the function including decorators
+        """
+        return get_source(self.obj)
+
+
+    def _get_decorators(self, source):
+        """Returns decorators referred using simple name. Function definition is taken from parsed source file
+           and source of the function is parsed only if definition is not available
+        """
+        func_def = get_function_def(self.obj)
+        if func_def:
+            return get_decorators(func_def)
+        node = astroid.extract_node(source)
+        if not node.decorators:
+            return []
+        return ["@{}".format(x.name) for x in node.decorators.nodes if hasattr(x, "name")]
+
+
+    def _get_docstring(self):
+        """Returns docstring of the function. Docstring of class is returned for constructor if it doesn't have one
+        """
+        docstring = ""
+        if hasattr(self.obj, "__doc__"):
+            docstring = getattr(self.obj, "__doc__")
+        # Refer docstring at class if this is constructor and docstring is missing for __init__
+        if (
+            not docstring
+            and self.name == "__init__"
+            and hasattr(self.parent_node.obj, "__doc__")
+        ):
+            docstring = getattr(self.parent_node.obj, "__doc__")
+        return docstring
+
+
     def _parse_function(self):
         """
         Find positional and keyword arguements, type and default value and return type of method
@@ -106,12 +163,27 @@ class FunctionNode(NodeEntityBase):
         if "@classmethod" in self.annotations:
             self.args.append(ArgType("cls"))
 
-        # Find signature to find positional args and return type
-        sig = inspect.signature(self.obj)
-        params = sig.parameters
         # Add all keyword only args here temporarily until docstring is parsed
         # This is to handle the scenario is keyword arg typehint (py3 style is present in signature itself)
         self.kw_args = []
+        self._parse_signature()
+
+        # parse docstring
+        self._parse_docstring()
+        # parse type hints
+        self._parse_typehint()
+        self._copy_kw_args()
+
+        if not self.return_type and is_typehint_mandatory(self.name):
+            self.add_error("Return type is missing in both typehint and docstring")
+        # Validate return type
+        self._validate_pageable_api()
+
+
+    def _parse_signature(self):
+        # Find signature to find positional args and return type
+        sig = inspect.signature(self.obj)
+        params = sig.parameters
         for argname in params:
             arg = ArgType(argname, get_qualified_name(params[argname].annotation, self.namespace), "", self)
             # set default value if available
@@ -129,17 +201,6 @@ class FunctionNode(NodeEntityBase):
         if sig.return_annotation:
             self.return_type = get_qualified_name(sig.return_annotation, self.namespace)
 
-        # parse docstring
-        self._parse_docstring()
-        # parse type hints
-        self._parse_typehint()
-        self._copy_kw_args()
-
-        if not self.return_type and is_typehint_mandatory(self.name):
-            self.add_error("Return type is missing in both typehint and docstring")
-        # Validate return type
-        self._validate_pageable_api()
-
 
     def _copy_kw_args(self):
         # Copy kw only args from signature and docstring
@@ -168,21 +229,12 @@ class FunctionNode(NodeEntityBase):
     def _parse_docstring(self):
         # Parse docstring to get list of keyword args, type and default value for both positional and
         # kw args and return type( if not already found in signature)
-        docstring = ""
-        if hasattr(self.obj, "__doc__"):
-            docstring = getattr(self.obj, "__doc__")
-        # Refer docstring at class if this is constructor and docstring is missing for __init__
-        if (
-            not docstring
-            and self.name == "__init__"
-            and hasattr(self.parent_node.obj, "__doc__")
-        ):
-            docstring = getattr(self.parent_node.obj, "__doc__")
-
+        docstring = self._get_docstring()
         if docstring:
             #  Parse doc string to find missing types, kwargs and return type
-            parsed_docstring = DocstringParser(docstring)
-            parsed_docstring.parse()
+            with profile("docstring"):
+                parsed_docstring = DocstringParser(docstring)
+                parsed_docstring.parse()
             # Set return type if not already set
             if not self.return_type and parsed_docstring.ret_type:
                 logging.debug(
@@ -210,9 +262,10 @@ class FunctionNode(NodeEntityBase):
             return
 
         # Parse type hint to get return type and types for positional args
-        typehint_parser = TypeHintParser(self.obj)
-        # Find return type from type hint if return type is not already set
-        type_hint_ret_type = typehint_parser.find_return_type()
+        with profile("typehint"):
+            typehint_parser = TypeHintParser(self.obj, self._get_source())
+            # Find return type from type hint if return type is not already set
+            type_hint_ret_type = typehint_parser.find_return_type()
         # Type hint must be present for all APIs. Flag it as an error if typehint is missing
         if  not type_hint_ret_type:
             self.add_error("Typehint is missing for method {}".format(self.name))
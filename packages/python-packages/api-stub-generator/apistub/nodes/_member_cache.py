@@ -0,0 +1,33 @@
+# Methods and properties defined in a class are inherited by all its subclasses and a class is inspected again for
+# each module that exposes it. Member nodes are parsed only once in each run and copies of the parsed node are added
+# to other classes.
+
+# Parsed member nodes keyed by namespace and object that defines the member
+_member_nodes = {}
+
+
+def get_member_node(key, parent_node, obj, create_node):
+    """Returns node for a class member. Member is parsed only when it is found for the first time and a copy of
+       parsed node is returned with given parent node when same member is found in another class
+    :param tuple: key
+        Namespace and object that defines the member
+    :param ClassNode: parent_node
+    :param: obj
+        Member object as found in the class. For e.g. class methods are bound to each class
+    :param function: create_node
+        Creates and returns member node when member is not parsed yet
+    """
+    cached_node = _member_nodes.get(key)
+    if cached_node is not None:
+        return cached_node.copy(parent_node, obj)
+
+    node = create_node()
+    # Node added to the class is updated while generating tokens. So a separate copy is kept in cache
+    _member_nodes[key] = node.copy(parent_node, obj)
+    return node
+
+
+def clear_member_cache():
+    """Remove all parsed member nodes. Members need to be parsed again if package is changed
+    """
+    _member_nodes.clear()
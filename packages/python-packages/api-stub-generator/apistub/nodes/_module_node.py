@@ -9,6 +9,7 @@ from ._base_node import NodeEntityBase
 from ._class_node import ClassNode
 from ._function_node import FunctionNode
 from apistub import Navigation, Kind, NavigationTag
+from apistub._profiler import profile
 
 filter_function = lambda x: isinstance(x, FunctionNode)
 filter_class = lambda x: isinstance(x, ClassNode)
@@ -25,7 +26,10 @@ class ModuleNode(NodeEntityBase):
         super().__init__(namespace, None, module)
         self.namespace_id = self.generate_id()
         self.nodeindex = nodeindex
-        self._inspect()
+        # Source files that node tree is created from. This is set only when generating tokens incrementally
+        self.source_files = None
+        with profile(namespace):
+            self._inspect()
 
     def _inspect(self):
         """Imports module, identify public entities in module and inspect them recursively
@@ -41,18 +45,18 @@ class ModuleNode(NodeEntityBase):
                 continue
 
             if inspect.isclass(member_obj):
-                class_node = ClassNode(self.namespace, self, member_obj)
-                key = "{0}.{1}".format(self.namespace, class_node.name)
-                self.nodeindex.add(key, class_node)
-                self.child_nodes.append(class_node)
+                self._add_child_node(ClassNode(self.namespace, self, member_obj))
             elif inspect.isroutine(member_obj):
-                func_node = FunctionNode(self.namespace, self, member_obj, True)
-                key = "{0}.{1}".format(self.namespace, func_node.name)
-                self.nodeindex.add(key, func_node)
-                self.child_nodes.append(func_node)
+                self._add_child_node(FunctionNode(self.namespace, self, member_obj, True))
             else:
                 logging.debug("Skipping unknown type member in module: {}".format(name))
 
+    def _add_child_node(self, node):
+        # Add class or function node as child and add it to node index to find navigation ID using name
+        key = "{0}.{1}".format(self.namespace, node.name)
+        self.nodeindex.add(key, node)
+        self.child_nodes.append(node)
+
     def _should_skip_parsing(self, name, member_obj, public_entities):
         # If module has list of published entities ( __all__) then include only those members
         if public_entities and name not in public_entities:
@@ -67,46 +71,79 @@ class ModuleNode(NodeEntityBase):
             return True
 
         # Skip any member in module level that is defined in external or built in package
-        if hasattr(member_obj, "__module__"):
-            return not getattr(member_obj, "__module__").startswith(self.namespace)
+        member_module = self._get_member_module(member_obj)
+        if member_module is not None:
+            return not member_module.startswith(self.namespace)
         # Don't skip member if module name is not available. This is just to be on safer side
         return False
 
-    def generate_tokens(self, apiview):
-        """Generates token for the node and it's children recursively and add it to apiview
+    def _get_member_module(self, member_obj):
+        """Returns name of the module where member is defined or None if module name is not available
+        """
+        if hasattr(member_obj, "__module__"):
+            return getattr(member_obj, "__module__")
+        return None
+
+    def get_source_files(self):
+        """Returns source files of this module and modules where it's members and base classes of member classes
+           are defined. Node tree of this module is same as long as these source files are not changed
+        """
+        member_objects = self._get_member_objects()
+        for c in filter(filter_class, self.child_nodes):
+            member_objects.extend(c._get_mro())
+
+        source_files = set([self._get_source_file(self.obj)])
+        for member_obj in member_objects:
+            source_files.add(self._get_source_file(member_obj))
+        source_files.discard(None)
+        return source_files
+
+    def _get_member_objects(self):
+        return [x[1] for x in inspect.getmembers(self.obj) if inspect.isclass(x[1]) or inspect.isroutine(x[1])]
+
+    def _get_source_file(self, obj):
+        try:
+            return inspect.getsourcefile(inspect.unwrap(obj))
+        except (TypeError, ValueError):
+            # Source file is not available for builtin objects
+            return None
+
+    def generate_tokens(self, apiview, navigation=None):
+        """Generates token for the node and it's children recursively and add it to apiview.
+           Navigation of the module is built while generating tokens and it is added to navigation if given
         :param ApiView: apiview
+        :param Navigation: navigation
+            Navigation of the package. Navigation info is used to build tree panel in API tool
         """
-        if self.child_nodes:
-            # Add name space level functions first
-            for c in filter(filter_function, self.child_nodes):
+        if not self.child_nodes:
+            return
+
+        module_nav = Navigation(self.namespace_id, self.namespace_id)
+        module_nav.set_tag(NavigationTag(Kind.type_module))
+        # Add name space level functions first
+        classes = []
+        for c in self.child_nodes:
+            if isinstance(c, FunctionNode):
                 c.generate_tokens(apiview)
                 apiview.add_new_line(2)
+                self._add_child_navigation(module_nav, c, Kind.type_method)
+            elif isinstance(c, ClassNode):
+                classes.append(c)
 
-            # Add classes
-            for c in filter(filter_class, self.child_nodes):
+        # Add classes
+        for c in classes:
+            with profile(c.name):
                 c.generate_tokens(apiview)
-                apiview.add_new_line(1)
+            apiview.add_new_line(1)
+            self._add_child_navigation(module_nav, c, Kind.type_enum if c.is_enum else Kind.type_class)
 
-    def get_navigation(self):
-        """Generate navigation tree recursively by generating Navigation obejct for classes and functions in name space
-        """
-        if self.child_nodes:
-            navigation = Navigation(self.namespace_id, self.namespace_id)
-            navigation.set_tag(NavigationTag(Kind.type_module))
-            # Generate child navigation for each child nodes
-            for c in filter(filter_function, self.child_nodes):
-                child_nav = Navigation(c.name, c.namespace_id)
-                child_nav.set_tag(NavigationTag(Kind.type_method))
-                navigation.add_child(child_nav)
-
-            for c in filter(filter_class, self.child_nodes):
-                child_nav = Navigation(c.name, c.namespace_id)
-                child_nav.set_tag(
-                    NavigationTag(Kind.type_enum if c.is_enum else Kind.type_class)
-                )
-                navigation.add_child(child_nav)
-            return navigation
+        if navigation is not None:
+            navigation.add_child(module_nav)
 
+    def _add_child_navigation(self, module_nav, node, kind):
+        child_nav = Navigation(node.name, node.namespace_id)
+        child_nav.set_tag(NavigationTag(kind))
+        module_nav.add_child(child_nav)
 
     def print_errors(self):
         for c in self.child_nodes:
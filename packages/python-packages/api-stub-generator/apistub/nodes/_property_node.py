@@ -1,3 +1,5 @@
+import copy
+
 from ._base_node import NodeEntityBase
 from ._docstring_parser import DocstringParser, TypeHintParser
 
@@ -17,6 +19,19 @@ class PropertyNode(NodeEntityBase):
         # Generate ID using name found by inspect
         self.namespace_id = self.generate_id()
 
+    def copy(self, parent_node, obj):
+        """Returns a copy of this node for same property found in another class. Property is not parsed again and
+           only parent node and ID are updated in copied node
+        :param NodeEntityBase: parent_node
+        :param property: obj
+        """
+        node = copy.copy(self)
+        node.parent_node = parent_node
+        node.obj = obj
+        node.namespace_id = node.generate_id()
+        node.errors = list(self.errors)
+        return node
+
     def _inspect(self):
         """Identify property name, type and readonly property
         """
@@ -28,19 +43,22 @@ class PropertyNode(NodeEntityBase):
             typehint_parser = TypeHintParser(getattr(self.obj, "fget"))
             self.type = typehint_parser.find_return_type()
 
+        self._parse_docstring(getattr(self.obj, "__doc__", None))
+
+    def _parse_docstring(self, docstring):
+        """Find property type from docstring if type is not available in type hint and set display name
+        """
         # get type from docstring
-        if hasattr(self.obj, "__doc__") and not self.type:
-            docstring = getattr(self.obj, "__doc__")
-            if docstring:
-                docstring_parser = DocstringParser(getattr(self.obj, "__doc__"))
-                try:
-                    self.type = docstring_parser.find_type()
-                    # Check for rtype docstring
-                    if not self.type:
-                        self.type = docstring_parser.find_return_type()
-                except:
-                    self.errors.append("Failed to find type of property {}".format(self.name))
-                    
+        if docstring and not self.type:
+            docstring_parser = DocstringParser(docstring)
+            try:
+                self.type = docstring_parser.find_type()
+                # Check for rtype docstring
+                if not self.type:
+                    self.type = docstring_parser.find_return_type()
+            except:
+                self.errors.append("Failed to find type of property {}".format(self.name))
+
         self.display_name = "{0}: {1}".format(self.name, self.type)
         if self.read_only:
             self.display_name += "   # Read-only"
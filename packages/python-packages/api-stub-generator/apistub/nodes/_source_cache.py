@@ -0,0 +1,124 @@
+import ast
+import io
+import inspect
+import logging
+import tokenize
+
+# Source files are read and parsed only once and source of functions defined in the file is sliced from it.
+# This avoids scanning the file using inspect and parsing source of each function again to find decorators.
+
+# Source lines of each file
+_source_lines = {}
+# Function definitions in each file keyed by line number of first decorator or def statement
+_function_defs = {}
+
+
+def get_source_lines(file_path):
+    """Returns lines in source file. File is read only once
+    :param str: file_path
+    """
+    if file_path not in _source_lines:
+        with tokenize.open(file_path) as source_file:
+            lines = source_file.readlines()
+        # Last line is terminated with new line same as linecache
+        if lines and not lines[-1].endswith("\n"):
+            lines[-1] += "\n"
+        _source_lines[file_path] = lines
+    return _source_lines[file_path]
+
+
+def add_source_lines(file_path, source):
+    """Add source of a file that is not read from disk, for e.g. a module read from wheel without extracting it
+    :param str: file_path
+    :param str: source
+    """
+    lines = io.StringIO(source).readlines()
+    if lines and not lines[-1].endswith("\n"):
+        lines[-1] += "\n"
+    _source_lines[file_path] = lines
+
+
+def clear_source_cache():
+    """Remove all cached source files. Source files need to be read again if package is changed
+    """
+    _source_lines.clear()
+    _function_defs.clear()
+
+
+def get_function_def(obj):
+    """Returns parsed function definition of a function or None if definition is not found in source file
+    :param function: obj
+    """
+    return _find_function_def(obj)[1]
+
+
+def get_source(obj):
+    """Returns source code of a function including decorators. Source is retrieved using inspect if function
+       definition is not found in source file
+    :param function: obj
+    """
+    file_path, func_def = _find_function_def(obj)
+    if func_def is None:
+        return inspect.getsource(obj)
+    lines = get_source_lines(file_path)
+    return "".join(lines[_get_start_line(func_def) - 1:_get_end_line(func_def, lines)])
+
+
+def get_decorators(func_def):
+    """Returns names of decorators that are referred using simple name for e.g. @classmethod
+    :param ast.FunctionDef: func_def
+    """
+    return ["@{}".format(x.id) for x in func_def.decorator_list if isinstance(x, ast.Name)]
+
+
+def _find_function_def(obj):
+    # Returns source file path and function definition
+    obj = inspect.unwrap(obj)
+    if inspect.ismethod(obj):
+        obj = obj.__func__
+    if not inspect.isfunction(obj):
+        return None, None
+    try:
+        file_path = inspect.getsourcefile(obj)
+    except TypeError:
+        return None, None
+    if not file_path:
+        return None, None
+
+    if file_path not in _function_defs:
+        _function_defs[file_path] = _parse_function_defs(file_path)
+    return file_path, _function_defs[file_path].get(obj.__code__.co_firstlineno)
+
+
+def _get_start_line(func_def):
+    return min([func_def.lineno] + [x.lineno for x in func_def.decorator_list])
+
+
+def _get_end_line(func_def, lines):
+    # Comments after last statement are part of function source same as inspect.getsource
+    # if comment is indented at least same as function body
+    end_line = func_def.end_lineno
+    body_offset = func_def.body[0].col_offset
+    for index in range(end_line, len(lines)):
+        line = lines[index]
+        stripped_line = line.lstrip()
+        if not stripped_line:
+            continue
+        if not stripped_line.startswith("#") or len(line) - len(stripped_line) < body_offset:
+            break
+        end_line = index + 1
+    return end_line
+
+
+def _parse_function_defs(file_path):
+    try:
+        tree = ast.parse("".join(get_source_lines(file_path)), file_path)
+    except (OSError, SyntaxError, ValueError):
+        logging.debug("Failed to parse source file {}".format(file_path))
+        return {}
+
+    func_defs = {}
+    for node in ast.walk(tree):
+        if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)):
+            func_defs[_get_start_line(node)] = node
+    return func_defs
@@ -0,0 +1,495 @@
+import contextlib
+import logging
+import os
+import sys
+import types
+
+import astroid
+from astroid import nodes
+
+from ._argtype import ArgType
+from ._class_node import ClassNode
+from ._docstring_parser import TypeHintParser
+from ._enum_node import EnumNode
+from ._function_node import FunctionNode, KW_ARG_NAME
+from ._member_cache import get_member_node
+from ._module_node import ModuleNode
+from ._property_node import PropertyNode
+from ._source_cache import add_source_lines, get_source_lines
+
+# Static nodes parse source code of the package using astroid instead of importing it.
+# These nodes build same node tree as import based nodes so tokens can be generated without installing the package.
+
+BUILTINS_MODULE = "builtins"
+OBJECT_CLASS = "builtins.object"
+ENUM_CLASS = "enum.Enum"
+PROPERTY_DECORATOR = "builtins.property"
+SETTER_DECORATOR = "setter"
+
+# Wheel or sdist that modules are parsed from in static mode when package is not extracted
+_archive = None
+_archive_hook_registered = False
+
+
+@contextlib.contextmanager
+def static_search_path(pkg_root_path):
+    """Add package root directory to sys.path while modules are parsed and restore sys.path on exit.
+    astroid finds modules referred by parsed module using sys.path. Modules are not imported in static mode
+    and package root is added only to resolve names imported from other modules in the package.
+    :param str: pkg_root_path
+    """
+    if os.path.isfile(pkg_root_path) or pkg_root_path in sys.path:
+        yield
+        return
+    sys.path.insert(0, pkg_root_path)
+    try:
+        yield
+    finally:
+        sys.path.remove(pkg_root_path)
+
+
+def load_static_module(module_name, pkg_root_path):
+    """Parse module from package root path without importing it. Package root path is either the directory that
+    contains the package or path of wheel or sdist file. Names imported from other modules in a package directory
+    are resolved only within `static_search_path`
+    :param str: module_name
+    :param str: pkg_root_path
+    """
+    if os.path.isfile(pkg_root_path):
+        return _load_archive_module(module_name, _get_archive(pkg_root_path))
+
+    module_path = os.path.join(pkg_root_path, *module_name.split("."))
+    if os.path.isdir(module_path):
+        module_path = os.path.join(module_path, "__init__.py")
+    else:
+        module_path += ".py"
+    logging.debug("Parsing module {0} from {1}".format(module_name, module_path))
+    return astroid.MANAGER.ast_from_file(module_path, module_name, source=True)
+
+
+def _get_archive(pkg_path):
+    # Archive is opened once in each process and astroid falls back to it for modules that are not in sys.path
+    global _archive, _archive_hook_registered
+    if _archive is None or _archive.pkg_path != os.path.abspath(pkg_path):
+        from apistub._package_archive import PackageArchive
+
+        _archive = PackageArchive(pkg_path)
+    if not _archive_hook_registered:
+        astroid.MANAGER.register_failed_import_hook(_import_archive_module)
+        _archive_hook_registered = True
+    return _archive
+
+
+def _import_archive_module(module_name):
+    # Called by astroid when a module imported by parsed module is not found in sys.path
+    if _archive is None:
+        raise astroid.AstroidBuildingError("Module {} is not found".format(module_name))
+    return _load_archive_module(module_name, _archive)
+
+
+def _load_archive_module(module_name, archive):
+    # Build module from source in archive. Module is added to astroid cache so it's parsed only once
+    manager = astroid.MANAGER
+    if module_name in manager.astroid_cache:
+        return manager.astroid_cache[module_name]
+
+    member = archive.get_module_member(module_name)
+    if member is None:
+        if not archive.is_directory(module_name):
+            raise astroid.AstroidBuildingError(
+                "Module {0} is not found in {1}".format(module_name, archive.pkg_path)
+            )
+        # Directory without __init__.py is a namespace package
+        from astroid.builder import build_namespace_package_module
+
+        module = build_namespace_package_module(module_name, [archive.get_path(module_name.replace(".", "/"))])
+        manager.cache_module(module)
+        return module
+
+    module_path = archive.get_path(member)
+    logging.debug("Parsing module {0} from {1}".format(module_name, module_path))
+    source = archive.read_source(member)
+    add_source_lines(module_path, source)
+    from astroid.builder import AstroidBuilder
+
+    return AstroidBuilder(manager).string_build(source, module_name, module_path)
+
+
+def clear_static_modules(module_names):
+    """Remove modules and their submodules parsed earlier from astroid cache.
+    astroid caches parsed modules and their location so modules must be parsed again when a different version
+    of package is parsed in same process. Other cached modules such as standard library are kept since parsing
+    them again is expensive.
+    :param list: module_names
+    """
+    global _archive
+    manager = astroid.MANAGER
+    prefixes = tuple("{}.".format(x) for x in module_names)
+    # Modules read from previous archive are removed even if they are not within the package namespace
+    archive_path = _archive.pkg_path + os.sep if _archive else None
+    is_package_module = lambda name: name in module_names or name.startswith(prefixes) or (
+        archive_path is not None and _is_archive_module(manager.astroid_cache.get(name), archive_path)
+    )
+    for name in [x for x in manager.astroid_cache if is_package_module(x)]:
+        logging.debug("Removing module {} from astroid cache".format(name))
+        del manager.astroid_cache[name]
+    # Location of modules is cached using module name and file that imports it
+    for key in [x for x in manager._mod_file_cache if is_package_module(x[0])]:
+        del manager._mod_file_cache[key]
+    _clear_module_spec_cache()
+    if _archive:
+        _archive.close()
+        _archive = None
+
+
+def _clear_module_spec_cache():
+    # astroid caches location of modules found in sys.path without sys.path in the key so a module of package parsed
+    # from different root path in earlier run is found again. Finding location of modules again is cheap
+    try:
+        from astroid.interpreter._import import spec
+    except ImportError:
+        return
+    finders = [getattr(spec, "_find_spec", None)] + [x.find_module for x in getattr(spec, "_SPEC_FINDERS", ())]
+    for finder in finders:
+        if hasattr(finder, "cache_clear"):
+            finder.cache_clear()
+
+
+def _is_archive_module(module, archive_path):
+    if module is None:
+        return False
+    paths = module.path or [module.file or ""]
+    return any(x.startswith(archive_path) for x in paths)
+
+
+def get_static_source(node):
+    """Returns source code of the function or class node including decorators
+    """
+    source_lines = get_source_lines(node.root().file)
+    start_line = node.lineno
+    if getattr(node, "decorators", None):
+        start_line = min([start_line] + [d.lineno for d in node.decorators.nodes])
+    return "".join(source_lines[start_line - 1:node.tolineno])
+
+
+def get_static_docstring(node):
+    if node.doc_node:
+        return node.doc_node.value
+    return None
+
+
+def get_static_qualified_name(node, namespace):
+    """Generate and return fully qualified name of type annotation with module name for internal types.
+       This is same as get_qualified_name for annotations found in source code.
+    """
+    if node is None:
+        return None
+    if isinstance(node, nodes.Const):
+        return str(node.value)
+    # Generic types are represented using name of the generic type. For e.g. Optional[str] is represented as Optional
+    if isinstance(node, nodes.Subscript):
+        node = node.value
+
+    inferred = _infer(node)
+    if isinstance(inferred, (nodes.ClassDef, nodes.FunctionDef)):
+        module_name = inferred.root().name
+        if module_name and module_name.startswith(namespace):
+            return "{0}.{1}".format(module_name, inferred.name)
+        return inferred.name
+    if isinstance(node, nodes.Attribute):
+        return node.attrname
+    if isinstance(node, nodes.Name):
+        return node.name
+    return node.as_string()
+
+
+def get_static_value(node):
+    """Returns string representation of value of a constant expression
+    """
+    inferred = _infer(node)
+    if isinstance(inferred, nodes.Const):
+        return str(inferred.value)
+    return node.as_string()
+
+
+def _infer(node):
+    try:
+        return next(node.infer())
+    except (astroid.InferenceError, StopIteration):
+        return None
+
+
+class StaticModuleNode(ModuleNode):
+    """Module node that is created from astroid module instead of imported module
+    :param str: namespace
+    :param astroid.nodes.Module: module
+    :param dict: nodeindex
+    """
+
+    def _get_obj_name(self, obj):
+        return obj.name
+
+    def _inspect(self):
+        public_entities = self._get_public_entities()
+        # find class and function nodes in module
+        for name in sorted(self.obj.locals):
+            member_obj = self._get_member(name)
+            if member_obj is None or self._should_skip_parsing(name, member_obj, public_entities):
+                continue
+
+            if isinstance(member_obj, nodes.ClassDef):
+                self._add_child_node(StaticClassNode(self.namespace, self, member_obj))
+            elif isinstance(member_obj, nodes.FunctionDef):
+                self._add_child_node(StaticFunctionNode(self.namespace, self, member_obj, True))
+            else:
+                logging.debug("Skipping unknown type member in module: {}".format(name))
+
+    def _get_public_entities(self):
+        # Find names listed in __all__
+        if "__all__" not in self.obj.locals:
+            return []
+        try:
+            value = next(self.obj.igetattr("__all__"))
+        except (astroid.InferenceError, StopIteration):
+            return []
+        if isinstance(value, (nodes.List, nodes.Tuple)):
+            return [x.value for x in value.elts if isinstance(x, nodes.Const)]
+        return []
+
+    def _get_member(self, name):
+        # Resolve imported names to class or function definition
+        try:
+            return next(self.obj.igetattr(name))
+        except (astroid.InferenceError, StopIteration):
+            logging.debug("Failed to resolve member {0} in module {1}".format(name, self.namespace))
+            return None
+
+    def _get_member_module(self, member_obj):
+        if isinstance(member_obj, (nodes.ClassDef, nodes.FunctionDef)):
+            return member_obj.root().name
+        return None
+
+    def _get_member_objects(self):
+        member_objects = [self._get_member(name) for name in self.obj.locals]
+        return [x for x in member_objects if isinstance(x, (nodes.ClassDef, nodes.FunctionDef))]
+
+    def _get_source_file(self, obj):
+        module = obj.root()
+        if module.name == BUILTINS_MODULE:
+            return None
+        return module.file
+
+
+class StaticClassNode(ClassNode):
+    """Class node that is created from astroid class definition
+    """
+
+    def _get_obj_name(self, obj):
+        return obj.name
+
+    def _inspect(self):
+        # Inspect current class and it's members recursively
+        logging.debug("Inspecting class {}".format(self.full_name))
+        self.base_class_names = self._get_base_classes()
+        self.is_enum = self.obj.is_subtype_of(ENUM_CLASS)
+        self._parse_ivars(get_static_docstring(self.obj))
+
+        # find members in class and base classes in same order as inspect.getmembers
+        members = self._get_members()
+        for name in sorted(members):
+            owner, member_nodes = members[name]
+            member = member_nodes[-1]
+            if isinstance(member, nodes.FunctionDef):
+                getter = self._find_property_getter(member_nodes)
+                if getter:
+                    if not name.startswith("_"):
+                        # Add instance properties
+                        self._add_child_node(get_member_node(
+                            (self.namespace, name, getter), self, getter,
+                            lambda: StaticPropertyNode(self.namespace, self, name, getter)
+                        ))
+                elif self._should_include_function(member):
+                    # Include dunder and public methods
+                    if not name.startswith("_") or name.startswith("__"):
+                        self._add_child_node(get_member_node(
+                            self._get_function_key(member), self, member,
+                            lambda: StaticFunctionNode(self.namespace, self, member)
+                        ))
+            elif name.startswith("_"):
+                continue
+            elif self.is_enum and owner is self.obj:
+                # Enum values are assigned in enum class
+                value = _infer(member)
+                enum_value = types.SimpleNamespace(
+                    name=name,
+                    value=value.value if isinstance(value, nodes.Const) else member.as_string()
+                )
+                self._add_child_node(EnumNode(self.namespace, self, enum_value))
+            else:
+                value = _infer(member)
+                if isinstance(value, nodes.Const) and isinstance(value.value, (str, int)):
+                    # Add any public class level variables
+                    self._add_class_variable(name, str(value.value))
+
+    def _get_mro(self):
+        try:
+            return self.obj.mro()
+        except Exception:
+            logging.debug("Failed to find MRO of class {}. Using ancestors instead".format(self.full_name))
+            return [self.obj] + list(self.obj.ancestors())
+
+    def _get_members(self):
+        # Returns a dictionary of member name to class where member is defined and nodes defining the member
+        # Members defined in a class overrides members in base classes
+        members = {}
+        for cl in self._get_mro():
+            # Members of builtin types are never included in API view
+            if cl.root().name == BUILTINS_MODULE:
+                continue
+            for name, member_nodes in _get_class_body_members(cl).items():
+                if name not in members:
+                    members[name] = (cl, member_nodes)
+        return members
+
+    def _find_property_getter(self, member_nodes):
+        for member in member_nodes:
+            if member.decorators and PROPERTY_DECORATOR in member.decoratornames():
+                return member
+        return None
+
+    def _get_function_key(self, func_obj):
+        key = (self.namespace, func_obj)
+        if func_obj.name == "__init__" and not get_static_docstring(func_obj):
+            # Constructor without docstring refers docstring of the class
+            key += (get_static_docstring(self.obj),)
+        return key
+
+    def _should_include_function(self, func_obj):
+        # Method should only be included if it is defined in same package.
+        return func_obj.root().name.startswith(self.namespace)
+
+    def _get_base_classes(self):
+        # Find base classes
+        base_classes = []
+        for base in self.obj.bases:
+            base_class = _infer(base)
+            if not isinstance(base_class, nodes.ClassDef):
+                base_classes.append(base.as_string())
+                continue
+            if base_class.qname() == OBJECT_CLASS:
+                continue
+            module_name = base_class.root().name
+            # Show module level name for internal types to show any generated internal types
+            if module_name.startswith("azure"):
+                base_classes.append("{0}.{1}".format(module_name, base_class.name))
+            else:
+                base_classes.append(base_class.name)
+        return base_classes
+
+
+def _get_class_body_members(cl):
+    # Find functions and class variables defined in class body. Property getter and setter are defined using
+    # same name and all function definitions are kept for a name unless name is reassigned.
+    members = {}
+    for stmt in cl.body:
+        if isinstance(stmt, nodes.FunctionDef):
+            existing = members.get(stmt.name)
+            if existing and isinstance(existing[-1], nodes.FunctionDef):
+                existing.append(stmt)
+            else:
+                members[stmt.name] = [stmt]
+        elif isinstance(stmt, nodes.Assign):
+            for target in stmt.targets:
+                if isinstance(target, nodes.AssignName):
+                    members[target.name] = [stmt.value]
+        elif isinstance(stmt, nodes.AnnAssign) and stmt.value:
+            if isinstance(stmt.target, nodes.AssignName):
+                members[stmt.target.name] = [stmt.value]
+    return members
+
+
+class StaticFunctionNode(FunctionNode):
+    """Function node that is created from astroid function definition
+    """
+
+    def _get_obj_name(self, obj):
+        return obj.name
+
+    def _get_source(self):
+        return get_static_source(self.obj)
+
+    def _get_decorators(self, source):
+        if not self.obj.decorators:
+            return []
+        return ["@{}".format(x.name) for x in self.obj.decorators.nodes if hasattr(x, "name")]
+
+    def _get_docstring(self):
+        docstring = get_static_docstring(self.obj)
+        # Refer docstring at class if this is constructor and docstring is missing for __init__
+        if not docstring and self.name == "__init__":
+            docstring = get_static_docstring(self.parent_node.obj)
+        return docstring
+
+    def _parse_signature(self):
+        args = self.obj.args
+        positional_args = args.posonlyargs + args.args
+        annotations = args.posonlyargs_annotations + args.annotations
+        defaults = [None] * (len(positional_args) - len(args.defaults)) + list(args.defaults)
+        # First argument is bound to class in class methods
+        skip_first_arg = self.obj.type == "classmethod"
+        for index, arg in enumerate(positional_args):
+            if skip_first_arg and index == 0:
+                continue
+            self.args.append(self._create_arg(arg.name, annotations[index], defaults[index]))
+
+        if args.vararg:
+            self.args.append(self._create_arg(args.vararg, args.varargannotation, None))
+
+        for index, arg in enumerate(args.kwonlyargs):
+            self.kw_args.append(
+                self._create_arg(arg.name, args.kwonlyargs_annotations[index], args.kw_defaults[index])
+            )
+
+        if args.kwarg:
+            self.args.append(self._create_arg(KW_ARG_NAME, args.kwargannotation, None))
+
+        returns = self.obj.returns
+        if returns is not None and not (isinstance(returns, nodes.Const) and returns.value is None):
+            self.return_type = get_static_qualified_name(returns, self.namespace)
+
+    def _create_arg(self, argname, annotation, default):
+        arg = ArgType(argname, get_static_qualified_name(annotation, self.namespace), "", self)
+        # set default value if available
+        if default is not None:
+            arg.default = get_static_value(default)
+        return arg
+
+
+class StaticPropertyNode(PropertyNode):
+    """Property node that is created from astroid function definition of property getter
+    """
+
+    def _inspect(self):
+        """Identify property name, type and readonly property
+        """
+        self.read_only = not any(
+            _is_setter(x, self.name) for x in self.obj.parent.locals.get(self.name, [])
+        )
+        # Get property type if type hint
+        typehint_parser = TypeHintParser(self.obj, get_static_source(self.obj))
+        self.type = typehint_parser.find_return_type()
+        self._parse_docstring(get_static_docstring(self.obj))
+
+
+def _is_setter(func_obj, name):
+    if not isinstance(func_obj, nodes.FunctionDef) or not func_obj.decorators:
+        return False
+    for decorator in func_obj.decorators.nodes:
+        if (
+            isinstance(decorator, nodes.Attribute)
+            and decorator.attrname == SETTER_DECORATOR
+            and isinstance(decorator.expr, nodes.Name)
+            and decorator.expr.name == name
+        ):
+            return True
+    return False
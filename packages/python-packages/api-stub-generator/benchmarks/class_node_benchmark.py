@@ -0,0 +1,112 @@
+# -------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for
+# license information.
+# --------------------------------------------------------------------------
+
+"""Measure time to sort child nodes and generate tokens of classes with large number of members.
+
+Usage: python benchmarks/class_node_benchmark.py [--members 2000] [--repeat 5]
+"""
+
+import argparse
+import importlib.util
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from apistub import ApiView
+from apistub._stub_generator import NodeIndex
+from apistub.nodes import ClassNode
+
+MODULE_NAME = "azure_benchmark_members"
+
+
+class _ParentNode:
+    namespace_id = MODULE_NAME
+
+
+def create_class_source(member_count):
+    # Class with same number of properties, variables, dunder methods, class methods and instance methods
+    count = max(member_count // 5, 1)
+    lines = ["class WideModel(object):"]
+    for index in range(count):
+        lines.append("    LABEL{0} = 'label{0}'".format(index))
+        lines.append("    @property")
+        lines.append("    def value{}(self) -> str:".format(index))
+        lines.append("        return ''")
+        lines.append("    def __op{}__(self, other):".format(index))
+        lines.append("        return self")
+        lines.append("    @classmethod")
+        lines.append("    def from_item{}(cls, item: str, **kwargs) -> 'WideModel':".format(index))
+        lines.append("        return cls()")
+        lines.append("    def get_item{}(self, name: str, **kwargs) -> str:".format(index))
+        lines.append("        return name")
+    return "\n".join(lines) + "\n"
+
+
+def load_class(root_path, member_count):
+    module_path = os.path.join(root_path, "{}.py".format(MODULE_NAME))
+    with open(module_path, "w") as module_file:
+        module_file.write(create_class_source(member_count))
+    spec = importlib.util.spec_from_file_location(MODULE_NAME, module_path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module.WideModel
+
+
+def measure(func, repeat):
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def run_benchmark(member_count, repeat=5):
+    """Inspect a class with given number of members and return best time of sorting child nodes and generating
+       tokens for the class
+    :param int: member_count
+    :param int: repeat
+    """
+    root_path = tempfile.mkdtemp()
+    try:
+        class_obj = load_class(root_path, member_count)
+        start = time.perf_counter()
+        class_node = ClassNode(MODULE_NAME, _ParentNode(), class_obj)
+        inspect_time = time.perf_counter() - start
+    finally:
+        shutil.rmtree(root_path, ignore_errors=True)
+
+    def generate_tokens():
+        apiview = ApiView(NodeIndex(), "azure-benchmark", "1.0.0", MODULE_NAME)
+        class_node.generate_tokens(apiview)
+
+    return {
+        "Members": len(class_node.child_nodes),
+        "InspectSeconds": inspect_time,
+        "SortSeconds": measure(class_node._sort_elements, repeat),
+        "GenerateSeconds": measure(generate_tokens, repeat),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark sorting and token generation of class members")
+    parser.add_argument("--members", type=int, default=2000, help="Number of members in generated class")
+    parser.add_argument("--repeat", type=int, default=5, help="Number of runs for sorting and token generation")
+    args = parser.parse_args()
+
+    result = run_benchmark(args.members, args.repeat)
+    print("Members: {}".format(result["Members"]))
+    for name in ["InspectSeconds", "SortSeconds", "GenerateSeconds"]:
+        print("{0:<16} {1:>8.4f}s".format(name, result[name]))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,188 @@
+# -------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for
+# license information.
+# --------------------------------------------------------------------------
+
+"""Measure end to end token generation and serialization of synthetic packages and compare with stored baselines.
+
+Usage: python benchmarks/generate_tokens_benchmark.py [--size medium] [--static] [--repeat 3] [--update-baseline]
+
+Throughput, peak memory and token count of each package size and mode are compared with baselines.json. Run with
+--update-baseline on your machine before making changes so later runs are compared with same hardware.
+Exit code is 1 if throughput or peak memory regressed beyond tolerance or token count is changed.
+"""
+
+import argparse
+import io
+import json
+import logging
+import os
+import shutil
+import sys
+import tempfile
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from apistub import Diagnostic, StubGenerator
+from apistub._token_sink import TokenCountSink
+from synthetic_package import PackageSize, create_package
+
+BASELINE_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baselines.json")
+# Allowed change in throughput and peak memory compared to baseline
+DEFAULT_TOLERANCE = 0.2
+SIZES = {
+    "small": PackageSize(modules=5, classes=10, methods=6, docstring_lines=3, async_variants=True),
+    "medium": PackageSize(modules=20, classes=20, methods=9, docstring_lines=5, async_variants=True),
+    "large": PackageSize(modules=40, classes=40, methods=15, docstring_lines=10, async_variants=True),
+}
+
+
+def _run_once(pkg_root_path, out_path, static):
+    # Returns time to generate tokens and serialize them, and sink that counted generated tokens
+    args = ["--pkg-path", pkg_root_path, "--out-path", out_path, "--skip-install", "--hide-report"]
+    if static:
+        args.append("--static")
+    Diagnostic.id_counter = 1
+    stub_generator = StubGenerator(args)
+    token_counter = TokenCountSink()
+    start_time = time.perf_counter()
+    apiview = stub_generator.generate_tokens([token_counter])
+    generate_time = time.perf_counter() - start_time
+    start_time = time.perf_counter()
+    stub_generator.serialize_to_file(apiview, stub_generator.get_out_file_path(apiview.Name))
+    serialize_time = time.perf_counter() - start_time
+    return generate_time, serialize_time, token_counter
+
+
+def run_benchmark(size, static=False, repeat=3):
+    """Generate synthetic package and return best time of repeated runs, peak memory and token count
+    :param PackageSize: size
+    :param bool: static
+    :param int: repeat
+    """
+    temp_path = tempfile.mkdtemp()
+    try:
+        pkg_root_path = create_package(os.path.join(temp_path, "package"), size)
+        out_path = os.path.join(temp_path, "out")
+        os.mkdir(out_path)
+        if not static:
+            # Package is imported from source without installing it
+            sys.path.insert(0, pkg_root_path)
+        try:
+            runs = [_run_once(pkg_root_path, out_path, static) for _ in range(max(repeat, 1))]
+            # Peak memory is measured in a separate run since tracing allocations slows down token generation
+            tracemalloc.start()
+            try:
+                _, _, token_counter = _run_once(pkg_root_path, out_path, static)
+                peak_memory = tracemalloc.get_traced_memory()[1]
+            finally:
+                tracemalloc.stop()
+        finally:
+            if not static:
+                sys.path.remove(pkg_root_path)
+                # Remove modules imported from temp path including azure namespace package so other packages
+                # generated later in same process are imported from their own path
+                for name, module in list(sys.modules.items()):
+                    if (getattr(module, "__file__", None) or "").startswith(pkg_root_path):
+                        del sys.modules[name]
+    finally:
+        shutil.rmtree(temp_path, ignore_errors=True)
+
+    generate_time = min(x[0] for x in runs)
+    serialize_time = min(x[1] for x in runs)
+    token_count = token_counter.token_count
+    return {
+        "Size": size.to_dict(),
+        "Static": static,
+        "Tokens": token_count,
+        "Diagnostics": token_counter.diagnostic_count,
+        "GenerateSeconds": round(generate_time, 4),
+        "SerializeSeconds": round(serialize_time, 4),
+        "TokensPerSecond": round(token_count / (generate_time + serialize_time)),
+        "PeakMemoryMB": round(peak_memory / (1024 * 1024), 2),
+    }
+
+
+def compare_with_baseline(result, baseline, tolerance):
+    """Returns list of regressions in result compared to baseline
+    :param dict: result
+    :param dict: baseline
+    :param float: tolerance
+    """
+    regressions = []
+    if result["Tokens"] != baseline["Tokens"]:
+        regressions.append("Token count changed from {0} to {1}".format(baseline["Tokens"], result["Tokens"]))
+    if result["TokensPerSecond"] < baseline["TokensPerSecond"] * (1 - tolerance):
+        regressions.append("Throughput dropped from {0} to {1} tokens/s".format(
+            baseline["TokensPerSecond"], result["TokensPerSecond"]
+        ))
+    if result["PeakMemoryMB"] > baseline["PeakMemoryMB"] * (1 + tolerance):
+        regressions.append("Peak memory increased from {0} MB to {1} MB".format(
+            baseline["PeakMemoryMB"], result["PeakMemoryMB"]
+        ))
+    return regressions
+
+
+def _load_baselines(path):
+    if not os.path.exists(path):
+        return {}
+    with io.open(path, "r", encoding="utf-8") as baseline_file:
+        return json.load(baseline_file)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark token generation of synthetic packages")
+    parser.add_argument("--size", choices=sorted(SIZES), default="medium", help="Preset size of package")
+    parser.add_argument("--modules", type=int, help="Number of modules. Overrides preset size")
+    parser.add_argument("--classes", type=int, help="Number of classes in each module. Overrides preset size")
+    parser.add_argument("--methods", type=int, help="Number of methods in each class. Overrides preset size")
+    parser.add_argument("--docstring-lines", type=int, help="Lines in each docstring. Overrides preset size")
+    parser.add_argument("--no-async", action="store_true", help="Don't generate async clients")
+    parser.add_argument("--static", action="store_true", help="Parse package source without importing it")
+    parser.add_argument("--repeat", type=int, default=3, help="Number of timed runs. Best run is reported")
+    parser.add_argument("--baseline", default=BASELINE_FILE, help="Path of baseline file")
+    parser.add_argument("--tolerance", type=float, default=DEFAULT_TOLERANCE, help="Allowed regression ratio")
+    parser.add_argument("--update-baseline", action="store_true", help="Store result as baseline")
+    args = parser.parse_args()
+    logging.getLogger().setLevel(logging.CRITICAL)
+
+    preset = SIZES[args.size]
+    size = PackageSize(
+        args.modules if args.modules is not None else preset.modules,
+        args.classes if args.classes is not None else preset.classes,
+        args.methods if args.methods is not None else preset.methods,
+        args.docstring_lines if args.docstring_lines is not None else preset.docstring_lines,
+        preset.async_variants and not args.no_async,
+    )
+    custom = size.to_dict() != preset.to_dict()
+    key = "{0}-{1}".format("custom" if custom else args.size, "static" if args.static else "import")
+
+    result = run_benchmark(size, args.static, args.repeat)
+    print(json.dumps(result, indent=2))
+
+    baselines = _load_baselines(args.baseline)
+    if args.update_baseline:
+        baselines[key] = result
+        with io.open(args.baseline, "w", encoding="utf-8") as baseline_file:
+            json.dump(baselines, baseline_file, indent=2, sort_keys=True)
+            baseline_file.write("\n")
+        print("Updated baseline {0} in {1}".format(key, args.baseline))
+        return
+
+    baseline = baselines.get(key)
+    if not baseline or baseline["Size"] != result["Size"]:
+        print("Baseline is not available for {}. Run with --update-baseline to store it".format(key))
+        return
+    regressions = compare_with_baseline(result, baseline, args.tolerance)
+    for regression in regressions:
+        print("REGRESSION: {}".format(regression))
+    if regressions:
+        sys.exit(1)
+    print("No regression compared to baseline {}".format(key))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+# -------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for
+# license information.
+# --------------------------------------------------------------------------
+
+"""Measure cold start time to import apistub and fail if it exceeds a budget.
+
+Usage: python benchmarks/import_time_benchmark.py [--budget 200] [--repeat 3]
+"""
+
+import argparse
+import os
+import subprocess
+import sys
+
+APISTUB_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+# Budget is higher than actual import time (around 80 ms) so it's not exceeded on slow machines but a heavy module
+# imported at start up again is found
+DEFAULT_BUDGET_MS = 200
+
+
+def get_import_time_ms():
+    # -X importtime writes "import time: self [us] | cumulative | imported package" for each module into stderr
+    env = dict(os.environ)
+    env["PYTHONPATH"] = APISTUB_PATH
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import apistub"],
+        env=env,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE,
+        universal_newlines=True,
+        check=True,
+    )
+    for line in result.stderr.splitlines():
+        parts = [x.strip() for x in line.split("|")]
+        if len(parts) == 3 and parts[2] == "apistub":
+            return int(parts[1]) / 1000.0
+    raise RuntimeError("Import time of apistub is not found in output: {}".format(result.stderr))
+
+
+def run_benchmark(repeat=3):
+    """Import apistub in new processes and return best cold start time in milliseconds.
+    Minimum of a few runs is used to avoid noise from other processes
+    :param int: repeat
+    """
+    return min(get_import_time_ms() for _ in range(repeat))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark cold start time to import apistub")
+    parser.add_argument("--budget", type=float, default=DEFAULT_BUDGET_MS, help="Max import time in milliseconds")
+    parser.add_argument("--repeat", type=int, default=3, help="Number of processes to import apistub")
+    args = parser.parse_args()
+
+    import_time = run_benchmark(args.repeat)
+    print("Import time: {0:.1f} ms. Budget: {1:.1f} ms".format(import_time, args.budget))
+    if import_time > args.budget:
+        print("Import time exceeds budget")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
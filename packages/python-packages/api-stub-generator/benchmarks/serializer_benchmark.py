@@ -0,0 +1,95 @@
+# -------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for
+# license information.
+# --------------------------------------------------------------------------
+
+"""Measure throughput of API view serializers in tokens per second.
+
+Usage: python benchmarks/serializer_benchmark.py [--methods 20000] [--repeat 5]
+"""
+
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from apistub import ApiView, Navigation, NavigationTag, Kind
+from apistub._apiview import APIViewEncoder, APIViewSerializer
+from apistub._stub_generator import NodeIndex
+
+
+def create_apiview(method_count):
+    # Generate tokens similar to tokens generated for methods in a class
+    apiview = ApiView(NodeIndex(), "azure-benchmark", "1.0.0", "azure.benchmark")
+    navigation = Navigation("azure-benchmark", None)
+    navigation.set_tag(NavigationTag(Kind.type_package))
+    apiview.add_navigation(navigation)
+    apiview.begin_group()
+    for index in range(method_count):
+        method_id = "azure.benchmark.Client.method{}".format(index)
+        apiview.add_whitespace()
+        apiview.add_line_marker(method_id)
+        apiview.add_keyword("def", False, True)
+        apiview.add_text(method_id, "method{}".format(index))
+        apiview.add_punctuation("(")
+        apiview.add_text(method_id, "self")
+        apiview.add_punctuation(",", False, True)
+        apiview.add_text(method_id, "name")
+        apiview.add_punctuation(":", False, True)
+        apiview.add_type("~azure.benchmark.Model or str", method_id)
+        apiview.add_punctuation(")")
+        apiview.add_punctuation("->", True, True)
+        apiview.add_type("~azure.core.paging.ItemPaged[~azure.benchmark.Model]")
+        apiview.add_new_line(1)
+        if index % 50 == 0:
+            apiview.add_diagnostic("Dummy diagnostic", method_id)
+    apiview.end_group()
+    return apiview
+
+
+def measure(encoder, apiview, repeat):
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        encoder.encode(apiview)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark API view serializers")
+    parser.add_argument("--methods", type=int, default=20000, help="Number of methods in generated API view")
+    parser.add_argument("--repeat", type=int, default=5, help="Number of runs for each serializer")
+    args = parser.parse_args()
+
+    apiview = create_apiview(args.methods)
+    token_count = len(apiview.Tokens)
+    encoders = [
+        ("APIViewEncoder", APIViewEncoder()),
+        ("APIViewSerializer", APIViewSerializer()),
+    ]
+    try:
+        import orjson
+
+        encoders.append(("APIViewSerializer (orjson)", APIViewSerializer(use_orjson=True)))
+    except ImportError:
+        print("orjson is not installed. Skipping orjson serializer")
+
+    print("Tokens: {}".format(token_count))
+    baseline = None
+    for name, encoder in encoders:
+        elapsed = measure(encoder, apiview, args.repeat)
+        baseline = baseline or elapsed
+        print(
+            "{0:<30} {1:>12,.0f} tokens/s  {2:>8.3f}s  {3:>5.2f}x".format(
+                name, token_count / elapsed, elapsed, baseline / elapsed
+            )
+        )
+
+
+if __name__ == "__main__":
+    main()
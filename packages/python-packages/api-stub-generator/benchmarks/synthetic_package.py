@@ -0,0 +1,216 @@
+# -------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for
+# license information.
+# --------------------------------------------------------------------------
+
+"""Generate a synthetic azure package of configurable size to benchmark api stub generator.
+
+Each module is a sub package of azure.benchmark with an enum and model classes. Methods of models use type
+hints, type comments and docstring types so all parsers are exercised. An aio sub package with async clients is
+generated for each module if async variants are enabled.
+"""
+
+import io
+import os
+import textwrap
+
+PACKAGE_NAME = "azure-benchmark"
+NAMESPACE = "azure.benchmark"
+VERSION = "1.0.0"
+
+
+class PackageSize:
+    """Size of synthetic package
+    :param int: modules
+    :param int: classes
+        Number of classes in each module
+    :param int: methods
+        Number of methods in each class
+    :param int: docstring_lines
+        Number of description lines in each docstring
+    :param bool: async_variants
+        Generate async client for each module
+    """
+
+    def __init__(self, modules, classes, methods, docstring_lines, async_variants):
+        self.modules = modules
+        self.classes = classes
+        self.methods = methods
+        self.docstring_lines = docstring_lines
+        self.async_variants = async_variants
+
+    def to_dict(self):
+        return {
+            "Modules": self.modules,
+            "Classes": self.classes,
+            "Methods": self.methods,
+            "DocstringLines": self.docstring_lines,
+            "Async": self.async_variants,
+        }
+
+
+def _description(docstring_lines, indent):
+    lines = ["Synthetic description line {} of the API used to measure docstring parsing.".format(x)
+             for x in range(docstring_lines)]
+    return ("\n" + indent).join(lines)
+
+
+def _model_source(module_index, class_index, size):
+    name = "Model{0}x{1}".format(module_index, class_index)
+    # Each model refers previous model in same module to generate cross references
+    other = "Model{0}x{1}".format(module_index, class_index - 1) if class_index else "Color{}".format(module_index)
+    methods = []
+    for method_index in range(size.methods):
+        style = method_index % 3
+        if style == 0:
+            # Type hints
+            methods.append('''
+    def get_item{0}(self, name: str, count: int = 1, **kwargs) -> "{1}":
+        """{2}
+
+        :param name: Name of item.
+        :param count: Number of items.
+        :keyword str etag: Etag of item.
+        :keyword bool match: Whether to match etag.
+        :return: Item
+        """
+        return None
+'''.format(method_index, other, _description(size.docstring_lines, "        ")))
+        elif style == 1:
+            # Type comments
+            methods.append('''
+    def list_items{0}(self, prefix, **kwargs):
+        # type: (str, Any) -> ItemPaged[{1}]
+        """{2}
+
+        :param str prefix: Prefix of items.
+        :keyword int results_per_page: Max items in a page.
+        :return: An iterator of items
+        :rtype: ~azure.core.paging.ItemPaged[~{3}.module{4}.{1}]
+        """
+        return None
+'''.format(method_index, other, _description(size.docstring_lines, "        "), NAMESPACE, module_index))
+        else:
+            # Docstring types only
+            methods.append('''
+    def update_item{0}(self, item, *args, **kwargs):
+        """{1}
+
+        :param item: Item to update.
+        :type item: ~{2}.module{3}.{4} or dict
+        :keyword timeout: Timeout in seconds.
+        :paramtype timeout: int
+        :rtype: None
+        """
+        return None
+'''.format(method_index, _description(size.docstring_lines, "        "), NAMESPACE, module_index, other))
+
+    return '''
+
+class {0}(object):
+    """{1}
+
+    :ivar str name: Name of model.
+    :ivar int size: Size of model.
+    :param str name: Name of model.
+    """
+
+    KIND = "{0}"
+
+    def __init__(self, name: str, **kwargs) -> None:
+        self.name = name
+        self.size = kwargs.get("size", 0)
+
+    @property
+    def display_name(self):
+        # type: () -> str
+        """Display name of model.
+
+        :rtype: str
+        """
+        return self.name
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "{0}":
+        return cls(data["name"])
+{2}'''.format(name, _description(size.docstring_lines, "    "), "".join(methods))
+
+
+def _module_source(module_index, size):
+    source = textwrap.dedent('''\
+    from enum import Enum
+    from typing import Any, Optional, TYPE_CHECKING
+
+    if TYPE_CHECKING:
+        from azure.core.paging import ItemPaged
+
+
+    class Color{0}(str, Enum):
+        """Colors of module {0}"""
+
+        RED = "red"
+        GREEN = "green"
+        BLUE = "blue"
+    ''').format(module_index)
+    for class_index in range(size.classes):
+        source += _model_source(module_index, class_index, size)
+    return source
+
+
+def _async_module_source(module_index, size):
+    methods = []
+    for method_index in range(size.methods):
+        methods.append('''
+    async def get_item{0}(self, name: str, **kwargs) -> "Model{1}x0":
+        """{2}
+
+        :param str name: Name of item.
+        :keyword str etag: Etag of item.
+        :rtype: ~{3}.module{1}.Model{1}x0
+        """
+        return None
+'''.format(method_index, module_index, _description(size.docstring_lines, "        "), NAMESPACE))
+    return '''from .. import Model{0}x0
+
+
+class AsyncClient{0}(object):
+    """Async client of module {0}
+
+    :param str endpoint: Endpoint of service.
+    """
+
+    def __init__(self, endpoint: str, **kwargs) -> None:
+        self.endpoint = endpoint
+
+    async def close(self) -> None:
+        return None
+{1}'''.format(module_index, "".join(methods))
+
+
+def _write(path, content):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with io.open(path, "w", encoding="utf-8") as source_file:
+        source_file.write(content)
+
+
+def create_package(root_path, size):
+    """Write synthetic package into root path and return the root path
+    :param str: root_path
+    :param PackageSize: size
+    """
+    _write(
+        os.path.join(root_path, "setup.py"),
+        'from setuptools import setup\n\nsetup(name="{0}", version="{1}", packages=["{2}"])\n'.format(
+            PACKAGE_NAME, VERSION, NAMESPACE
+        ),
+    )
+    namespace_init = '__path__ = __import__("pkgutil").extend_path(__path__, __name__)\n'
+    _write(os.path.join(root_path, "azure", "__init__.py"), namespace_init)
+    _write(os.path.join(root_path, "azure", "benchmark", "__init__.py"), '__version__ = "{}"\n'.format(VERSION))
+    for module_index in range(size.modules):
+        module_path = os.path.join(root_path, "azure", "benchmark", "module{}".format(module_index))
+        _write(os.path.join(module_path, "__init__.py"), _module_source(module_index, size))
+        if size.async_variants:
+            _write(os.path.join(module_path, "aio", "__init__.py"), _async_module_source(module_index, size))
+    return root_path
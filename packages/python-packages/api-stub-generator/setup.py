@@ -30,15 +30,17 @@ setup(
     license="MIT License",
     packages=find_packages(),
     install_requires=["astroid"],
-    python_requires=">=3.4.0",
-    entry_points={"console_scripts": ["apistubgen=apistub:console_entry_point",]},
+    python_requires=">=3.8",
+    entry_points={"console_scripts": ["apistubgen=apistub:console_entry_point", "apistubserver=apistub:server_entry_point",]},
     classifiers=[
         "Development Status :: 3 - Alpha",
         "Programming Language :: Python",
-        "Programming Language :: Python :: 3.4",
-        "Programming Language :: Python :: 3.5",
-        "Programming Language :: Python :: 3.6",
-        "Programming Language :: Python :: 3.7",
+        "Programming Language :: Python :: 3",
+        "Programming Language :: Python :: 3.8",
+        "Programming Language :: Python :: 3.9",
+        "Programming Language :: Python :: 3.10",
+        "Programming Language :: Python :: 3.11",
+        "Programming Language :: Python :: 3.12",
         "License :: OSI Approved :: MIT License",
     ],
 )
@@ -0,0 +1,86 @@
+# -------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for
+# license information.
+# --------------------------------------------------------------------------
+
+import io
+import sys
+import types
+
+from apistub import ApiView, Diagnostic, Navigation, NavigationTag, Kind
+from apistub._apiview import APIViewEncoder, APIViewSerializer, write_apiview, is_valid_type_name, _module_members
+from apistub._stub_generator import NodeIndex, _clear_cached_modules
+
+
+def _create_apiview():
+    apiview = ApiView(NodeIndex(), "azure-dummy", "1.0.0", "azure.dummy")
+    navigation = Navigation("azure-dummy", None)
+    navigation.set_tag(NavigationTag(Kind.type_package))
+    apiview.add_navigation(navigation)
+    for index in range(25):
+        apiview.add_line_marker("azure.dummy.func{}".format(index))
+        apiview.add_keyword("def", False, True)
+        apiview.add_text("azure.dummy.func{}".format(index), "func{}".format(index))
+        apiview.add_punctuation("(")
+        apiview.add_type("~azure.dummy.Model or str", "azure.dummy.func{}".format(index))
+        apiview.add_punctuation(")")
+        apiview.add_new_line()
+    apiview.add_diagnostic("Dummy diagnostic", "azure.dummy.func0")
+    return apiview
+
+
+class TestApiView:
+
+    def test_write_apiview_in_chunks(self):
+        Diagnostic.id_counter = 1
+        expected = APIViewEncoder().encode(_create_apiview())
+        for chunk_size in [1, 7, 10000]:
+            Diagnostic.id_counter = 1
+            out = io.StringIO()
+            write_apiview(_create_apiview(), out, chunk_size=chunk_size)
+            assert out.getvalue() == expected
+
+    def test_serializer_output_same_as_encoder(self):
+        apiview = _create_apiview()
+        apiview.Diagnostics[0].set_helplink("https://aka.ms/dummy")
+        expected = APIViewEncoder().encode(apiview)
+        assert APIViewSerializer().encode(apiview) == expected
+        # Encoding must not modify the API view
+        assert APIViewEncoder().encode(apiview) == expected
+
+    def test_add_type_reuses_cached_tokens(self):
+        nodeindex = NodeIndex()
+        nodeindex.add("azure.dummy.Model", types.SimpleNamespace(namespace_id="azure.dummy.Model"))
+        apiview = ApiView(nodeindex, "azure-dummy", "1.0.0", "azure.dummy")
+        start = len(apiview.Tokens)
+        apiview.add_type("Optional[~azure.dummy.Model]")
+        first = apiview.Tokens[start:]
+        apiview.add_type("Optional[~azure.dummy.Model]")
+        second = apiview.Tokens[start + len(first):]
+        assert [(t.Value, t.Kind, t.NavigateToId) for t in first] == [(t.Value, t.Kind, t.NavigateToId) for t in second]
+        assert [t.Value for t in second] == ["Optional", "[", "Model", "]"]
+        assert second[2].NavigateToId == "azure.dummy.Model"
+        # Cached template must create new tokens
+        assert all(x is not y for x, y in zip(first, second))
+
+    def test_is_valid_type_name_caches_module_members(self):
+        assert is_valid_type_name("collections.OrderedDict")
+        assert not is_valid_type_name("collections.Missing")
+        assert "OrderedDict" in _module_members["collections"]
+        assert not is_valid_type_name("azure.dummy.missing.Model")
+        assert _module_members["azure.dummy.missing"] is None
+        assert not is_valid_type_name("azure.dummy.missing.Other")
+
+    def test_module_members_are_cleared_between_runs(self, tmp_path, monkeypatch):
+        module_path = tmp_path / "dummy_models.py"
+        module_path.write_text("class Model(object):\n    pass\n")
+        monkeypatch.syspath_prepend(str(tmp_path))
+        assert not is_valid_type_name("dummy_models.Pet")
+
+        # Type added in next version of the package is valid after modules are cleared for the next run
+        module_path.write_text("class Model(object):\n    pass\n\nclass Pet(Model):\n    pass\n")
+        _clear_cached_modules(["dummy_models"], False)
+        assert "dummy_models" not in _module_members
+        assert is_valid_type_name("dummy_models.Pet")
+        del sys.modules["dummy_models"]
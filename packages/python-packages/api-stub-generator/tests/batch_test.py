@@ -0,0 +1,72 @@
+# -------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for
+# license information.
+# --------------------------------------------------------------------------
+
+import os
+import threading
+
+import pytest
+
+from apistub import StubGenerator
+from apistub._batch import find_batch_packages
+
+
+class _RecordingLock:
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.events = []
+
+    def acquire(self):
+        self.lock.acquire()
+        self.events.append("acquire")
+
+    def release(self):
+        self.events.append("release")
+        self.lock.release()
+
+
+WHEEL_FILES = {"azure/locked/__init__.py": ""}
+
+
+class TestBatch:
+
+    def test_find_packages_in_directory(self, tmp_path):
+        for name in ["azure_b-1.0.0-py3-none-any.whl", "azure_a-1.0.0.zip", "README.md"]:
+            (tmp_path / name).write_text("")
+        assert find_batch_packages(str(tmp_path)) == [
+            os.path.join(str(tmp_path), "azure_a-1.0.0.zip"),
+            os.path.join(str(tmp_path), "azure_b-1.0.0-py3-none-any.whl"),
+        ]
+
+    def test_find_packages_in_manifest(self, tmp_path):
+        manifest = tmp_path / "packages.txt"
+        manifest.write_text("# nightly packages\nwheels/azure_a-1.0.0-py3-none-any.whl\n\n/pkgs/azure_b-1.0.0.zip\n")
+        assert find_batch_packages(str(manifest)) == [
+            os.path.join(str(tmp_path), "wheels", "azure_a-1.0.0-py3-none-any.whl"),
+            "/pkgs/azure_b-1.0.0.zip",
+        ]
+
+    @pytest.mark.parametrize("option, locked", [(None, True), ("--static", False), ("--skip-install", False)])
+    def test_install_lock_is_held_until_package_is_inspected(self, create_wheel, tmp_path, monkeypatch, option, locked):
+        wheel_path = create_wheel("azure-locked", WHEEL_FILES)
+        install_lock = _RecordingLock()
+        monkeypatch.setattr(StubGenerator, "install_lock", install_lock)
+        monkeypatch.setattr(StubGenerator, "_install_package", lambda self, name: install_lock.events.append("install"))
+
+        def generate_tokens(self, *args):
+            install_lock.events.append("inspect")
+            raise ValueError("Failed to inspect package")
+
+        monkeypatch.setattr(StubGenerator, "_generate_tokens", generate_tokens)
+        args = ["--pkg-path", str(wheel_path), "--out-path", str(tmp_path), "--hide-report"]
+        stub_generator = StubGenerator(args + ([option] if option else []))
+        with pytest.raises(ValueError):
+            stub_generator.generate_tokens()
+        if locked:
+            # Lock is released even if inspection fails
+            assert install_lock.events == ["acquire", "install", "inspect", "release"]
+        else:
+            assert "acquire" not in install_lock.events
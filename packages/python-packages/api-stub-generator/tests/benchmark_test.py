@@ -0,0 +1,37 @@
+# -------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for
+# license information.
+# --------------------------------------------------------------------------
+
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "benchmarks"))
+
+from class_node_benchmark import run_benchmark as run_class_node_benchmark
+from generate_tokens_benchmark import compare_with_baseline, run_benchmark
+from synthetic_package import PackageSize
+
+
+class TestBenchmark:
+
+    def test_run_benchmark(self):
+        size = PackageSize(modules=1, classes=2, methods=3, docstring_lines=2, async_variants=True)
+        result = run_benchmark(size, static=True, repeat=1)
+        assert result["Tokens"] > 0
+        assert result["TokensPerSecond"] > 0
+        assert result["PeakMemoryMB"] > 0
+        assert compare_with_baseline(result, result, 0.2) == []
+
+    def test_compare_with_baseline(self):
+        baseline = {"Tokens": 1000, "TokensPerSecond": 50000, "PeakMemoryMB": 10.0}
+        result = {"Tokens": 1000, "TokensPerSecond": 35000, "PeakMemoryMB": 11.0}
+        assert compare_with_baseline(result, baseline, 0.2) == ["Throughput dropped from 50000 to 35000 tokens/s"]
+        result = {"Tokens": 1200, "TokensPerSecond": 50000, "PeakMemoryMB": 13.0}
+        assert len(compare_with_baseline(result, baseline, 0.2)) == 2
+
+    def test_run_class_node_benchmark(self):
+        result = run_class_node_benchmark(50, repeat=1)
+        assert result["Members"] == 50
+        assert result["GenerateSeconds"] > 0
@@ -0,0 +1,153 @@
+# -------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for
+# license information.
+# --------------------------------------------------------------------------
+
+import importlib.util
+
+from apistub.nodes import ClassNode, FunctionNode, PropertyNode, VariableNode
+from apistub.nodes._member_cache import clear_member_cache
+
+MEMBER_COUNT = 300
+
+MODELS_SOURCE = '''
+class Model(object):
+    def __init__(self, **kwargs):
+        pass
+
+    def get(self, name, **kwargs):
+        """Get value
+
+        :param str name: Name
+        :rtype: str
+        """
+        return name
+
+    @property
+    def size(self):
+        """Size of model
+
+        :rtype: int
+        """
+        return 0
+
+
+class Pet(Model):
+    """Pet model
+
+    :keyword str owner: Owner of pet
+    """
+
+
+class Tree(Model):
+    """Tree model"""
+'''
+
+
+class _ParentNode:
+    namespace_id = "dummy"
+
+
+def _load_module(tmp_path, name, source):
+    module_path = tmp_path / "{}.py".format(name)
+    module_path.write_text(source)
+    spec = importlib.util.spec_from_file_location(name, str(module_path))
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def _create_wide_class(tmp_path):
+    lines = [
+        "class WideClass(object):",
+        "    \"\"\"Wide class",
+        "",
+        "    :ivar int size: Size of class",
+        "    \"\"\"",
+        "    size = 3",
+        "",
+        "    def __iter__(self):",
+        "        return self",
+        "",
+        "    def __next__(self):",
+        "        raise StopIteration",
+        "",
+        "    def __enter__(self):",
+        "        return self",
+    ]
+    for index in range(MEMBER_COUNT):
+        lines.append("    LABEL{0} = 'label{0}'".format(index))
+        lines.append("    def get_item{0}(self, name: str) -> str:".format(index))
+        lines.append("        return name")
+    return _load_module(tmp_path, "wide_module", "\n".join(lines) + "\n").WideClass
+
+
+class TestClassNode:
+
+    def test_wide_class(self, tmp_path):
+        class_node = ClassNode("wide_module", _ParentNode(), _create_wide_class(tmp_path))
+        functions = [x for x in class_node.child_nodes if isinstance(x, FunctionNode)]
+        variables = [x for x in class_node.child_nodes if isinstance(x, VariableNode)]
+        assert len(functions) == len(class_node.functions) == MEMBER_COUNT + 3
+        # Instance variable in docstring is updated with value of class variable
+        assert len(variables) == len(class_node.variables) == MEMBER_COUNT + 1
+        assert class_node.variables["size"].value == "3"
+
+    def test_abc_implements(self, tmp_path):
+        class_node = ClassNode("wide_module", _ParentNode(), _create_wide_class(tmp_path))
+        # __enter__ is shown since __exit__ is not implemented
+        assert class_node.implements == ["Iterator"]
+        assert class_node.functions["__iter__"].hidden
+        assert class_node.functions["__next__"].hidden
+        assert not class_node.functions["__enter__"].hidden
+
+    def test_inherited_members_are_parsed_once(self, tmp_path):
+        module = _load_module(tmp_path, "models_module", MODELS_SOURCE)
+        clear_member_cache()
+        pet_node = ClassNode("models_module", _ParentNode(), module.Pet)
+        tree_node = ClassNode("models_module", _ParentNode(), module.Tree)
+        pet_get, tree_get = pet_node.functions["get"], tree_node.functions["get"]
+        assert pet_get is not tree_get
+        assert (pet_get.namespace_id, tree_get.namespace_id) == ("dummy.Pet.get", "dummy.Tree.get")
+        assert [x.argname for x in tree_get.args] == [x.argname for x in pet_get.args]
+        # Args refer copied function node to report errors found while generating tokens
+        assert all(x.function_node is tree_get for x in tree_get.args)
+        assert tree_node.properties["size"].namespace_id == "dummy.Tree.size"
+        # Constructor without docstring is parsed using docstring of each class
+        pet_init_args = [x.argname for x in pet_node.functions["__init__"].args]
+        tree_init_args = [x.argname for x in tree_node.functions["__init__"].args]
+        assert "owner" in pet_init_args and "owner" not in tree_init_args
+
+    def test_child_node_order(self, tmp_path):
+        source = MODELS_SOURCE + '''
+
+class Order(Model):
+    """Order model
+
+    :ivar str status: Status of order
+    """
+    LIMIT = 10
+
+    def __len__(self):
+        return 0
+
+    @classmethod
+    def __class_getitem__(cls, item):
+        return cls
+
+    @classmethod
+    def from_dict(cls, data, **kwargs):
+        return cls()
+
+    def cancel(self, **kwargs):
+        pass
+'''
+        module = _load_module(tmp_path, "order_module", source)
+        class_node = ClassNode("order_module", _ParentNode(), module.Order)
+        assert [x.name for x in class_node.child_nodes] == [
+            "size", "LIMIT", "status", "__class_getitem__", "__init__", "__len__", "from_dict", "cancel", "get"
+        ]
+        # Properties and variables are listed before methods
+        assert class_node._member_count == 3
+        assert isinstance(class_node.child_nodes[0], PropertyNode)
@@ -0,0 +1,36 @@
+# -------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for
+# license information.
+# --------------------------------------------------------------------------
+
+import zipfile
+
+import pytest
+
+
+@pytest.fixture
+def create_wheel(tmp_path):
+    """Returns a function that creates a wheel in tmp_path and returns path of the wheel
+    :param str: name
+        Distribution name of package, for e.g. azure-dummy
+    :param dict: files
+        Source of each file in the wheel by its path in the wheel
+    :param str: version
+    :param str: top_level
+        Top level package written into top_level.txt of wheel if given
+    """
+
+    def create(name, files, version="1.0.0", top_level=None):
+        dist_name = name.replace("-", "_")
+        dist_info = "{0}-{1}.dist-info".format(dist_name, version)
+        wheel_path = tmp_path / "{0}-{1}-py3-none-any.whl".format(dist_name, version)
+        with zipfile.ZipFile(str(wheel_path), "w") as wheel:
+            for path, source in files.items():
+                wheel.writestr(path, source)
+            wheel.writestr(dist_info + "/METADATA", "Name: {0}\nVersion: {1}\n".format(name, version))
+            if top_level:
+                wheel.writestr(dist_info + "/top_level.txt", top_level + "\n")
+        return wheel_path
+
+    return create
@@ -6,6 +6,7 @@
 
 from apistub.nodes import DocstringParser
 from apistub.nodes import ArgType
+from apistub.nodes._docstring_parser import REGEX_CACHE_SIZE, _get_regex
 
 docstring_standard_return_type = """
 Dummy docstring to verify standard return types and param types
@@ -104,6 +105,17 @@ docstring_param_type_private = """
 :type client: ~azure.search.documents._search_index_document_batching_client_base.SearchIndexDocumentBatchingClientBase
 """
 
+docstring_fields = """
+:ivar str name: Dummy name
+:ivar id: Dummy id
+:vartype id: int
+:keyword int timeout: Timeout in seconds
+:keyword retry: Retry policy
+:paramtype retry: ~azure.core.pipeline.policies.RetryPolicy
+:param str path: Dummy path
+:keywordtype extra: str
+"""
+
 
 class TestDocStringParser:
 
@@ -165,4 +177,23 @@ class TestDocStringParser:
         self._test_variable_type(docstring_param_nested_union, "dummyarg", "typing.Union[~azure.eventhub.EventDataBatch, List[~azure.eventhub.EventData]]")
 
     def test_multi_text_analytics_type(self):
-        self._test_variable_type(docstring_multi_complex_type, "documents", "list[str] or list[~azure.ai.textanalytics.DetectLanguageInput] or list[dict[str, str]]")
\ No newline at end of file
+        self._test_variable_type(docstring_multi_complex_type, "documents", "list[str] or list[~azure.ai.textanalytics.DetectLanguageInput] or list[dict[str, str]]")
+
+    def test_fields_of_all_kinds(self):
+        parser = DocstringParser(docstring_fields)
+        assert [(x.argname, x.argtype) for x in parser.find_args("ivar")] == [("name", "str"), ("id", "int")]
+        kw_args = parser.find_args("keyword")
+        assert [(x.argname, x.argtype) for x in kw_args] == [
+            ("timeout", "int"), ("retry", "~azure.core.pipeline.policies.RetryPolicy")
+        ]
+        assert all(x.default == "..." for x in kw_args)
+        assert [(x.argname, x.argtype) for x in parser.find_args("param")] == [("path", "str")]
+        assert parser.find_type("(type|keywordtype|paramtype|vartype)", "extra") == "str"
+        assert parser.find_return_type() is None
+
+    def test_regex_cache_is_bounded(self):
+        docstring = "\n".join(":type arg{0}: str".format(x) for x in range(REGEX_CACHE_SIZE + 10))
+        parser = DocstringParser(docstring)
+        for index in range(REGEX_CACHE_SIZE + 10):
+            assert parser.find_type("(type|keywordtype|paramtype|vartype)", "arg{}".format(index)) == "str"
+        assert _get_regex.cache_info().currsize == REGEX_CACHE_SIZE
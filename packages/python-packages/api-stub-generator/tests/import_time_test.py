@@ -0,0 +1,55 @@
+# -------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for
+# license information.
+# --------------------------------------------------------------------------
+
+import os
+import subprocess
+import sys
+
+import apistub
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "benchmarks"))
+
+from import_time_benchmark import DEFAULT_BUDGET_MS, run_benchmark
+
+# Import time depends on the machine so budget of the test is a few times the budget checked by
+# benchmarks/import_time_benchmark.py. It's not exceeded on slow build agents but a heavy module imported at start up
+# again is found
+IMPORT_TIME_BUDGET_MS = 3 * DEFAULT_BUDGET_MS
+# Modules that must be imported only when an option that requires them is used
+LAZY_MODULES = [
+    "astroid",
+    "apistub.nodes",
+    "concurrent.futures",
+    "glob",
+    "inspect",
+    "multiprocessing",
+    "subprocess",
+    "zipfile",
+]
+
+
+def _run_python(code):
+    env = dict(os.environ)
+    env["PYTHONPATH"] = os.path.dirname(os.path.dirname(os.path.abspath(apistub.__file__)))
+    return subprocess.run(
+        [sys.executable, "-c", code],
+        env=env,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE,
+        universal_newlines=True,
+        check=True,
+    )
+
+
+class TestImportTime:
+
+    def test_lazy_modules_not_imported(self):
+        code = "import sys, apistub; print('\\n'.join(sorted(sys.modules)))"
+        imported = set(_run_python(code).stdout.splitlines())
+        assert [x for x in LAZY_MODULES if x in imported] == []
+
+    def test_import_time_budget(self):
+        assert run_benchmark(repeat=3) < IMPORT_TIME_BUDGET_MS
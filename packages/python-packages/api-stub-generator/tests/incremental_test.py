@@ -0,0 +1,104 @@
+# -------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for
+# license information.
+# --------------------------------------------------------------------------
+
+import io
+import types
+
+from apistub import ApiView, Diagnostic, Navigation, NavigationTag, Kind
+from apistub._apiview import write_apiview
+from apistub._incremental import IncrementalState
+from apistub._stub_generator import NodeIndex
+
+OPTIONS = {"Namespace": "azure.dummy", "Static": False}
+
+
+def _generate(pkg_root, token_file, state):
+    # Generate tokens for a module with one function and save fingerprints
+    nodeindex = NodeIndex()
+    apiview = ApiView(nodeindex, "azure-dummy", "1.0.0", "azure.dummy")
+    navigation = Navigation("azure-dummy", None)
+    navigation.set_tag(NavigationTag(Kind.type_package))
+    apiview.add_navigation(navigation)
+
+    child = types.SimpleNamespace(name="func", namespace_id="azure.dummy.func")
+    nodeindex.add("azure.dummy.func", child)
+    module_node = types.SimpleNamespace(
+        namespace="azure.dummy",
+        nodeindex=nodeindex,
+        child_nodes=[child],
+        source_files=[str(pkg_root / "azure" / "dummy" / "__init__.py")],
+    )
+    nodeindex.lookups = {}
+    token_start = len(apiview.Tokens)
+    apiview.add_line_marker("azure.dummy.func")
+    apiview.add_keyword("def", False, True)
+    apiview.add_type("~azure.dummy.func")
+    apiview.add_diagnostic("Dummy diagnostic", "azure.dummy.func")
+    module_nav = Navigation("azure.dummy", "azure.dummy")
+    module_nav.add_child(Navigation("func", "azure.dummy.func"))
+    navigation.add_child(module_nav)
+    state.add_module(module_node, nodeindex.lookups, [token_start, len(apiview.Tokens)], [0, 1], 0)
+    with io.open(token_file, "w") as json_file:
+        write_apiview(apiview, json_file)
+    state.save()
+    return apiview
+
+
+class TestIncrementalState:
+
+    def test_copy_unchanged_module(self, tmp_path):
+        pkg_root = tmp_path / "pkg"
+        (pkg_root / "azure" / "dummy").mkdir(parents=True)
+        source_file = pkg_root / "azure" / "dummy" / "__init__.py"
+        source_file.write_text("def func(): pass\n")
+        token_file = str(tmp_path / "azure-dummy_python.json")
+
+        Diagnostic.id_counter = 1
+        expected = _generate(pkg_root, token_file, IncrementalState(token_file, str(pkg_root), OPTIONS))
+        with io.open(token_file) as json_file:
+            expected_json = json_file.read()
+
+        state = IncrementalState(token_file, str(pkg_root), OPTIONS)
+        state.load()
+        assert state.find_unchanged_modules(["azure.dummy"]) == ["azure.dummy"]
+        nodeindex = NodeIndex()
+        state.add_index_entries("azure.dummy", nodeindex)
+        assert nodeindex.get_id("azure.dummy.func") == "azure.dummy.func"
+        assert state.is_lookup_valid("azure.dummy", nodeindex)
+
+        Diagnostic.id_counter = 1
+        apiview = ApiView(nodeindex, "azure-dummy", "1.0.0", "azure.dummy")
+        navigation = Navigation("azure-dummy", None)
+        navigation.set_tag(NavigationTag(Kind.type_package))
+        apiview.add_navigation(navigation)
+        state.copy_module("azure.dummy", apiview, navigation)
+        out = io.StringIO()
+        write_apiview(apiview, out)
+        assert out.getvalue() == expected_json
+        assert len(apiview.Tokens) == len(expected.Tokens)
+
+        # Module is changed if source file is modified
+        source_file.write_text("def func(**kwargs): pass\n")
+        state = IncrementalState(token_file, str(pkg_root), OPTIONS)
+        state.load()
+        assert state.find_unchanged_modules(["azure.dummy"]) == []
+
+    def test_lookup_changed(self, tmp_path):
+        pkg_root = tmp_path / "pkg"
+        (pkg_root / "azure" / "dummy").mkdir(parents=True)
+        (pkg_root / "azure" / "dummy" / "__init__.py").write_text("def func(): pass\n")
+        token_file = str(tmp_path / "azure-dummy_python.json")
+        _generate(pkg_root, token_file, IncrementalState(token_file, str(pkg_root), OPTIONS))
+
+        state = IncrementalState(token_file, str(pkg_root), OPTIONS)
+        state.load()
+        # Referred name is not available in index
+        assert not state.is_lookup_valid("azure.dummy", NodeIndex())
+
+        # Token file is not reused if it was generated using different options
+        state = IncrementalState(token_file, str(pkg_root), dict(OPTIONS, Static=True))
+        state.load()
+        assert state.find_unchanged_modules(["azure.dummy"]) == []
@@ -0,0 +1,61 @@
+# -------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for
+# license information.
+# --------------------------------------------------------------------------
+
+from apistub._module_discovery import ModuleInfo, collect_modules, find_modules
+
+
+def _create_package(root):
+    files = [
+        "setup.py",
+        "azure/synth/__init__.py",
+        "azure/synth/models.py",
+        "azure/synth/_client.py",
+        "azure/synth/_shared/__init__.py",
+        "azure/synth/aio/__init__.py",
+        "azure/synth/portion/client.py",
+        "azure/other/__init__.py",
+        "tests/test_client.py",
+    ]
+    for path in files:
+        file_path = root.joinpath(*path.split("/"))
+        file_path.parent.mkdir(parents=True, exist_ok=True)
+        file_path.write_text("")
+
+
+class TestModuleDiscovery:
+
+    def test_find_modules(self, tmp_path):
+        _create_package(tmp_path)
+        modules = find_modules(str(tmp_path))
+        assert sorted(x.name for x in modules) == [
+            "azure.other", "azure.synth", "azure.synth.aio", "azure.synth.models", "azure.synth.portion.client"
+        ]
+        assert ModuleInfo("azure.synth.models", "azure/synth/models.py", False) in modules
+        assert ModuleInfo("azure.synth.aio", "azure/synth/aio/__init__.py", True) in modules
+
+    def test_namespace_prunes_directories(self, tmp_path):
+        _create_package(tmp_path)
+        modules = find_modules(str(tmp_path), "azure.synth")
+        assert sorted(x.name for x in modules) == [
+            "azure.synth", "azure.synth.aio", "azure.synth.models", "azure.synth.portion.client"
+        ]
+
+        tree = {
+            "": (["azure", "tests"], ["setup.py"]),
+            "azure": (["synth", "other"], []),
+            "azure/synth": (["aio"], ["__init__.py", "models.py"]),
+            "azure/synth/aio": ([], ["__init__.py"]),
+        }
+        scanned = []
+
+        def list_directory(directory):
+            scanned.append(directory)
+            return tree[directory]
+
+        modules = collect_modules(list_directory, "azure.synth")
+        # Modules are returned in same order as os.walk
+        assert [x.name for x in modules] == ["azure.synth", "azure.synth.models", "azure.synth.aio"]
+        assert scanned == ["", "azure", "azure/synth", "azure/synth/aio"]
@@ -0,0 +1,55 @@
+# -------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for
+# license information.
+# --------------------------------------------------------------------------
+
+import os
+
+from apistub import StubGenerator
+from apistub._package_archive import PackageArchive
+
+
+WHEEL_FILES = {
+    "azure/archived/__init__.py": "from ._models import Model\n\n__all__ = ['Model']\n",
+    "azure/archived/_models.py": (
+        "# -*- coding: latin-1 -*-\r\nclass Model(object):\r\n    \"\"\"Mod\xe8le\"\"\"\r\n\r\n"
+        "    def get(self, name: str) -> str:\r\n        return name\r\n".encode("latin-1")
+    ),
+    "azure/archived/models.py": "from ._models import Model\n",
+    "azure/archived/_shared/__init__.py": "",
+    "azure/archived/aio/__init__.py": "",
+}
+
+
+class TestPackageArchive:
+
+    def test_find_modules(self, create_wheel):
+        wheel_path = create_wheel("azure-archived", WHEEL_FILES, top_level="azure")
+        archive = PackageArchive(str(wheel_path))
+        modules = archive.find_modules()
+        assert [x.name for x in modules] == ["azure.archived", "azure.archived.models", "azure.archived.aio"]
+        assert modules[1].source_file == "azure/archived/models.py"
+        assert archive.get_root_module_name() == "azure"
+        assert archive.read_metadata()["Version"] == "1.0.0"
+        assert archive.get_module_member("azure.archived") == "azure/archived/__init__.py"
+        assert archive.get_module_member("azure.archived._models") == "azure/archived/_models.py"
+        assert archive.get_module_member("azure.missing") is None
+        assert archive.is_directory("azure")
+        source = archive.read_source("azure/archived/_models.py")
+        assert "Mod\xe8le" in source and "\r" not in source
+        archive.close()
+
+    def test_generate_static_tokens(self, create_wheel, tmp_path):
+        wheel_path = create_wheel("azure-archived", WHEEL_FILES, top_level="azure")
+        temp_path = tmp_path / "temp"
+        temp_path.mkdir()
+        stub_generator = StubGenerator(
+            ["--pkg-path", str(wheel_path), "--temp-path", str(temp_path), "--static", "--hide-report"]
+        )
+        apiview = stub_generator.generate_tokens()
+        values = [x.Value for x in apiview.Tokens]
+        assert "azure.archived.Model" in values
+        assert "get" in values
+        # Package is parsed from wheel without extracting it
+        assert os.listdir(str(temp_path)) == []
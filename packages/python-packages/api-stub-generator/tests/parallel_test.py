@@ -0,0 +1,136 @@
+# -------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for
+# license information.
+# --------------------------------------------------------------------------
+
+import json
+
+import pytest
+
+from apistub import Diagnostic, StubGenerator
+
+PACKAGE_FILES = {
+    "setup.py": (
+        "from setuptools import setup\n\n"
+        "setup(name='parapkg', version='1.0.0', packages=['parapkg', 'parapkg.aio', 'parapkg.models'])\n"
+    ),
+    "parapkg/__init__.py": (
+        "from ._client import ParaClient\nfrom .models import Color, Widget\n\n"
+        "__all__ = ['ParaClient', 'Color', 'Widget']\n"
+    ),
+    "parapkg/_client.py": '''
+class ParaClient(object):
+    """Client
+
+    :param str endpoint: Endpoint
+    :keyword int retries: Number of retries
+    """
+
+    def __init__(self, endpoint, **kwargs):
+        self.endpoint = endpoint
+
+    def get_widget(self, name, **kwargs):
+        """Get widget
+
+        :param str name: Name of widget
+        :rtype: ~parapkg.models.Widget
+        """
+
+    def list_widgets(self, color=None):
+        """List widgets
+
+        :param color: Color of widgets
+        :type color: ~parapkg.models.Color or ~parapkg.models.Shade
+        :rtype: list[~parapkg.models.Widget]
+        """
+''',
+    "parapkg/aio/__init__.py": "from ._client_async import ParaClient\n\n__all__ = ['ParaClient']\n",
+    "parapkg/aio/_client_async.py": '''
+from ..models import Widget
+
+
+class ParaClient(object):
+    """Async client
+
+    :param str endpoint: Endpoint
+    """
+
+    def __init__(self, endpoint, **kwargs):
+        self.endpoint = endpoint
+
+    async def get_widget(self, name: str, **kwargs) -> Widget:
+        """Get widget
+
+        :param str name: Name of widget
+        :rtype: ~parapkg.models.Widget
+        """
+''',
+    "parapkg/models/__init__.py": "from ._models import Color, Widget\n\n__all__ = ['Color', 'Widget']\n",
+    "parapkg/models/_models.py": '''
+from enum import Enum
+
+
+class Color(str, Enum):
+    RED = "red"
+    BLUE = "blue"
+
+
+class Widget(object):
+    """Widget
+
+    :ivar str name: Name of widget
+    :ivar color: Color of widget
+    :vartype color: ~parapkg.models.Color
+    """
+
+    def __init__(self, **kwargs):
+        self.name = kwargs.get("name")
+''',
+}
+
+
+def _create_package(root):
+    for path, source in PACKAGE_FILES.items():
+        file_path = root.joinpath(*path.split("/"))
+        file_path.parent.mkdir(parents=True, exist_ok=True)
+        file_path.write_text(source)
+
+
+class TestParallel:
+
+    @pytest.mark.parametrize("option", ["--static", "--skip-install"])
+    def test_parallel_token_file_same_as_serial(self, tmp_path, monkeypatch, option):
+        pkg_path = tmp_path / "src"
+        _create_package(pkg_path)
+        if option == "--skip-install":
+            # Package is imported from source directory by parent and worker processes
+            monkeypatch.syspath_prepend(str(pkg_path))
+
+        parallel_runs = []
+        inspect_modules_parallel = StubGenerator._inspect_modules_parallel
+
+        def record_parallel_run(self, modules, *args):
+            parallel_runs.append(list(modules))
+            return inspect_modules_parallel(self, modules, *args)
+
+        monkeypatch.setattr(StubGenerator, "_inspect_modules_parallel", record_parallel_run)
+        token_files = []
+        for jobs in ["1", "2"]:
+            # Diagnostic IDs are generated from a counter shared by all runs in process
+            Diagnostic.id_counter = 1
+            out_path = str(tmp_path / "parapkg_jobs{}.json".format(jobs))
+            args = ["--pkg-path", str(pkg_path), "--out-path", out_path, "--hide-report", "--jobs", jobs, option]
+            token_file_path, _ = StubGenerator(args).generate_token_file()
+            with open(token_file_path) as token_file:
+                token_files.append(token_file.read())
+
+        assert [sorted(x) for x in parallel_runs] == [["parapkg", "parapkg.aio", "parapkg.models"]]
+        assert token_files[0] == token_files[1]
+        apiview = json.loads(token_files[1])
+        definitions = [x["DefinitionId"] for x in apiview["Tokens"] if x.get("DefinitionId")]
+        for name in ["parapkg.ParaClient", "parapkg.aio.ParaClient", "parapkg.models.Widget"]:
+            assert name in definitions
+        # Type names are linked across modules inspected by different workers
+        assert "parapkg.models.Widget" in [x.get("NavigateToId") for x in apiview["Tokens"]]
+        assert apiview["Diagnostics"]
@@ -0,0 +1,67 @@
+# -------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for
+# license information.
+# --------------------------------------------------------------------------
+
+import json
+
+from apistub._profiler import ProfileFrame, disable_profiler, enable_profiler, profile
+
+
+class TestProfiler:
+
+    def test_nested_timers(self, tmp_path):
+        profiler = enable_profiler("azure-dummy")
+        try:
+            with profile("inspect"):
+                for _ in range(2):
+                    with profile("azure.dummy"):
+                        with profile("docstring"):
+                            pass
+        finally:
+            disable_profiler()
+
+        report = profiler.get_report()
+        assert report["Name"] == "azure-dummy"
+        inspect_frame = report["Children"][0]
+        assert inspect_frame["Name"] == "inspect"
+        module_frame = inspect_frame["Children"][0]
+        # Repeated calls with same name are added to same frame
+        assert (module_frame["Name"], module_frame["Calls"]) == ("azure.dummy", 2)
+        assert module_frame["Children"][0]["Name"] == "docstring"
+        assert report["WallTime"] >= inspect_frame["WallTime"] >= module_frame["WallTime"]
+
+        report_path = profiler.write_report(str(tmp_path / "azure-dummy_python.json"))
+        assert report_path == str(tmp_path / "azure-dummy_python.profile.json")
+        with open(report_path) as report_file:
+            assert json.load(report_file) == report
+        stacks = (tmp_path / "azure-dummy_python.profile.folded").read_text().splitlines()
+        assert [x.rsplit(" ", 1)[0] for x in stacks] == [
+            "azure-dummy",
+            "azure-dummy;inspect",
+            "azure-dummy;inspect;azure.dummy",
+            "azure-dummy;inspect;azure.dummy;docstring",
+        ]
+
+    def test_disabled(self):
+        with profile("inspect") as frame:
+            assert frame is None
+
+    def test_merge_worker_frames(self):
+        frame = ProfileFrame("inspect")
+        worker_frame = {
+            "Name": "azure.dummy",
+            "Calls": 1,
+            "WallTime": 0.5,
+            "CpuTime": 0.4,
+            "AllocatedBlocks": 10,
+            "Children": [
+                {"Name": "Client", "Calls": 1, "WallTime": 0.2, "CpuTime": 0.2, "AllocatedBlocks": 5, "Children": []}
+            ],
+        }
+        frame.merge(worker_frame)
+        frame.merge(worker_frame)
+        module_frame = frame.children["azure.dummy"]
+        assert (module_frame.calls, module_frame.wall_time, module_frame.allocated_blocks) == (2, 1.0, 20)
+        assert module_frame.children["Client"].cpu_time == 0.4
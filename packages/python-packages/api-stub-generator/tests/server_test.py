@@ -0,0 +1,113 @@
+# -------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for
+# license information.
+# --------------------------------------------------------------------------
+
+import json
+import os
+import socket
+import threading
+import urllib.error
+import urllib.request
+
+import pytest
+
+from apistub._server import ServerMetrics, StubGeneratorServer
+
+
+WHEEL_FILES = {
+    "azure/__init__.py": "",
+    "azure/dummy/__init__.py": "def create_client(url: str) -> str:\n    return url\n",
+}
+
+
+def _post_package(server, wheel_path):
+    request = urllib.request.Request(
+        server + "/generate?filename=" + wheel_path.name, data=wheel_path.read_bytes(), method="POST"
+    )
+    with urllib.request.urlopen(request) as response:
+        return json.loads(response.read().decode("utf-8"))
+
+
+@pytest.fixture
+def stub_server(tmp_path):
+    stub_server = StubGeneratorServer(("127.0.0.1", 0), 1, ["--static", "--skip-install"], str(tmp_path))
+    thread = threading.Thread(target=stub_server.serve_forever, daemon=True)
+    thread.start()
+    yield stub_server
+    stub_server.shutdown()
+    stub_server.server_close()
+
+
+@pytest.fixture
+def server(stub_server):
+    return "http://127.0.0.1:{}".format(stub_server.server_address[1])
+
+
+class TestServer:
+
+    def test_metrics(self):
+        metrics = ServerMetrics(2)
+        for latency in [0.4, 0.1, 0.3, 0.2]:
+            metrics.start_request()
+            metrics.end_request(latency, False)
+        metrics.start_request()
+        metrics.end_request(5.0, True)
+        result = metrics.to_dict()
+        assert result["Completed"] == 4
+        assert result["Failed"] == 1
+        assert result["Pending"] == 0
+        assert result["LatencyP50"] == 0.2
+        assert result["LatencyMax"] == 0.4
+
+    def test_generate(self, server, create_wheel):
+        wheel_path = create_wheel("azure-dummy", WHEEL_FILES, top_level="azure")
+        for _ in range(2):
+            apiview = _post_package(server, wheel_path)
+            assert apiview["Name"] == "azure-dummy"
+            assert "azure.dummy.create_client" in [t["Value"] for t in apiview["Tokens"]]
+
+        with urllib.request.urlopen(server + "/metrics") as response:
+            metrics = json.loads(response.read().decode("utf-8"))
+        assert metrics["Completed"] == 2
+        assert metrics["Failed"] == 0
+
+    def test_invalid_package_name(self, server):
+        request = urllib.request.Request(server + "/generate?filename=package.txt", data=b"", method="POST")
+        with pytest.raises(urllib.error.HTTPError) as e:
+            urllib.request.urlopen(request)
+        assert e.value.code == 400
+
+    def test_truncated_upload(self, stub_server, server, tmp_path):
+        with socket.create_connection(stub_server.server_address[:2]) as client:
+            client.sendall(
+                b"POST /generate?filename=azure_dummy-1.0.0-py3-none-any.whl HTTP/1.1\r\n"
+                b"Host: localhost\r\nContent-Length: 100\r\n\r\n" + b"x" * 10
+            )
+            client.shutdown(socket.SHUT_WR)
+            response = client.makefile("rb").read().decode("utf-8")
+        assert response.startswith("HTTP/1.0 400")
+        assert "Received 10 of 100 bytes" in response
+        # Uploaded part of package is removed
+        assert os.listdir(str(tmp_path)) == []
+
+    def test_broken_worker_pool(self, stub_server, server, create_wheel, tmp_path):
+        wheel_path = create_wheel("azure-dummy", WHEEL_FILES, top_level="azure")
+        # Worker process exits unexpectedly and breaks the pool
+        broken_executor = stub_server.executor
+        with pytest.raises(Exception):
+            broken_executor.submit(os._exit, 1).result()
+
+        with pytest.raises(urllib.error.HTTPError) as e:
+            _post_package(server, wheel_path)
+        assert e.value.code == 500
+        assert "Error" in json.loads(e.value.read().decode("utf-8"))
+        assert os.listdir(str(tmp_path)) == [wheel_path.name]
+
+        # Server starts new worker processes for next request
+        assert stub_server.executor is not broken_executor
+        assert _post_package(server, wheel_path)["Name"] == "azure-dummy"
+        with urllib.request.urlopen(server + "/metrics") as response:
+            metrics = json.loads(response.read().decode("utf-8"))
+        assert (metrics["Completed"], metrics["Failed"]) == (1, 1)
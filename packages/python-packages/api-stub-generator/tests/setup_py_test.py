@@ -0,0 +1,204 @@
+# -------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for
+# license information.
+# --------------------------------------------------------------------------
+
+import ast
+import json
+import os
+import re
+import subprocess
+import sys
+import textwrap
+import types
+
+import pytest
+
+from apistub._setup_py import _StaticEvaluator, _NotStatic, clear_setup_metadata_cache, read_setup_metadata
+
+SETUP_PY = '''
+import os, re
+from setuptools import setup, find_packages
+
+PACKAGE_NAME = "azure-dummy"
+package_folder_path = PACKAGE_NAME.replace("-", "/")
+
+with open(os.path.join(package_folder_path, "_version.py"), "r") as fd:
+    version = re.search(r'^VERSION\\s*=\\s*[\\'"]([^\\'"]*)[\\'"]', fd.read(), re.MULTILINE).group(1)
+
+if not version:
+    raise RuntimeError("Cannot find version information")
+
+setup(
+    name=PACKAGE_NAME,
+    version=version,
+    packages=find_packages(exclude=["tests", "azure"]),
+)
+'''
+
+DYNAMIC_SETUP_PY = '''
+from setuptools import setup
+
+def get_name():
+    return "azure-" + "dummy"
+
+setup(name=get_name(), version="2.0.0", packages=["azure.dummy"])
+'''
+
+WARDEN_SETUP_PY = '''
+from setuptools import setup, find_packages
+import os
+from io import open
+import re
+
+PACKAGE_NAME = 'azure-dummy'
+
+with open(os.path.join('azure', 'dummy', '_version.py'), 'r') as fd:
+    version = re.search(r'^VERSION\\s*=\\s*[\\'"]([^\\'"]*)[\\'"]',
+                        fd.read(), re.MULTILINE).group(1)
+
+setup(name=PACKAGE_NAME, version=version, packages=find_packages())
+'''
+
+FORMAT_SETUP_PY = '''
+from setuptools import setup
+
+setup(name="azure-{}".format("dummy"), version="1.0.0".strip(), packages=["azure.dummy"])
+'''
+
+CONDITIONAL_SETUP_PY = '''
+import sys
+from setuptools import setup
+
+if sys.version_info >= (3, 0):
+    version = "1.0.0"
+else:
+    version = "0.9.0"
+
+setup(name="azure-dummy", version=version, packages=["azure.dummy"])
+'''
+
+# Cases shared with static setup.py parser of doc-warden. Metadata is None if setup.py must be run to find it
+STATIC_SETUP_CASES = [
+    (SETUP_PY, ("azure-dummy", "1.0.0")),
+    (WARDEN_SETUP_PY, ("azure-dummy", "1.0.0")),
+    (FORMAT_SETUP_PY, ("azure-dummy", "1.0.0")),
+    (DYNAMIC_SETUP_PY, None),
+    (CONDITIONAL_SETUP_PY, None),
+]
+
+DOC_WARDEN_SOURCE = os.path.join(
+    os.path.dirname(os.path.abspath(__file__)), "..", "..", "doc-warden", "warden", "index_packages.py"
+)
+DOC_WARDEN_DEFINITIONS = [
+    "LITERAL_NODES", "SETUP_SCRIPT", "literal_value", "parse_setup_static", "_parse_setup_content"
+]
+
+DISTUTILS_SETUP_PY = '''
+from distutils.core import setup
+
+def get_version():
+    return "3.0.0"
+
+setup(name="azure-dummy", version=get_version())
+'''
+
+
+def _is_doc_warden_definition(node):
+    if isinstance(node, ast.FunctionDef):
+        return node.name in DOC_WARDEN_DEFINITIONS
+    # Constants are assigned at module level or in an if block for each python version
+    names = [x.id for x in ast.walk(node) if isinstance(x, ast.Name) and isinstance(x.ctx, ast.Store)]
+    return isinstance(node, (ast.Assign, ast.If)) and any(x in DOC_WARDEN_DEFINITIONS for x in names)
+
+
+def _load_doc_warden_parser():
+    # doc-warden depends on packages that are not required by api stub generator so only the setup.py parser and
+    # definitions used by it are extracted from its source
+    with open(DOC_WARDEN_SOURCE) as source_file:
+        tree = ast.parse(source_file.read())
+    body = [x for x in tree.body if _is_doc_warden_definition(x)]
+    namespace = {
+        "ast": ast, "json": json, "os": os, "re": re, "subprocess": subprocess, "sys": sys, "textwrap": textwrap
+    }
+    exec(compile(ast.Module(body=body, type_ignores=[]), DOC_WARDEN_SOURCE, "exec"), namespace)
+    return types.SimpleNamespace(**namespace)
+
+
+def _create_package(root, setup_py):
+    for path in ["azure/__init__.py", "azure/dummy/__init__.py", "azure/dummy/aio/__init__.py", "tests/__init__.py"]:
+        file_path = root.joinpath(*path.split("/"))
+        file_path.parent.mkdir(parents=True, exist_ok=True)
+        file_path.write_text("")
+    (root / "azure" / "dummy" / "_version.py").write_text('VERSION = "1.0.0"\n')
+    (root / "setup.py").write_text(setup_py)
+
+
+class TestSetupPy:
+
+    def test_static_metadata(self, tmp_path):
+        _create_package(tmp_path, SETUP_PY)
+        setup_filename = str(tmp_path / "setup.py")
+        metadata = _StaticEvaluator(setup_filename, (tmp_path / "setup.py").read_bytes()).evaluate()
+        assert metadata.name == "azure-dummy"
+        assert metadata.version == "1.0.0"
+        assert metadata.packages == ["azure.dummy", "azure.dummy.aio"]
+        assert sorted(metadata.file_hashes) == sorted(
+            [setup_filename, str(tmp_path / "azure" / "dummy" / "_version.py")]
+        )
+
+    def test_dynamic_metadata(self, tmp_path):
+        _create_package(tmp_path, DYNAMIC_SETUP_PY)
+        # Name returned by a function is not evaluated statically
+        with pytest.raises(_NotStatic):
+            _StaticEvaluator(str(tmp_path / "setup.py"), (tmp_path / "setup.py").read_bytes()).evaluate()
+        current_dir = os.getcwd()
+        clear_setup_metadata_cache()
+        metadata = read_setup_metadata(str(tmp_path))
+        assert (metadata.name, metadata.version, metadata.packages) == ("azure-dummy", "2.0.0", ["azure.dummy"])
+        assert os.getcwd() == current_dir
+
+    def test_cache_is_invalidated(self, tmp_path):
+        _create_package(tmp_path, SETUP_PY)
+        clear_setup_metadata_cache()
+        metadata = read_setup_metadata(str(tmp_path))
+        assert read_setup_metadata(str(tmp_path)) is metadata
+        (tmp_path / "azure" / "dummy" / "_version.py").write_text('VERSION = "1.0.1"\n')
+        assert read_setup_metadata(str(tmp_path)).version == "1.0.1"
+
+    @pytest.mark.parametrize("setup_py, expected", STATIC_SETUP_CASES)
+    def test_static_cases(self, tmp_path, setup_py, expected):
+        _create_package(tmp_path, setup_py)
+        evaluator = _StaticEvaluator(str(tmp_path / "setup.py"), (tmp_path / "setup.py").read_bytes())
+        if expected is None:
+            with pytest.raises(_NotStatic):
+                evaluator.evaluate()
+        else:
+            metadata = evaluator.evaluate()
+            assert (metadata.name, metadata.version) == expected
+
+    @pytest.mark.skipif(not os.path.isfile(DOC_WARDEN_SOURCE), reason="doc-warden source is not available")
+    @pytest.mark.parametrize("setup_py, expected", STATIC_SETUP_CASES)
+    def test_doc_warden_static_cases(self, tmp_path, setup_py, expected):
+        parse_setup_static = _load_doc_warden_parser().parse_setup_static
+        _create_package(tmp_path, setup_py)
+        setup_filename = str(tmp_path / "setup.py")
+        parsed = ast.parse((tmp_path / "setup.py").read_bytes())
+        if expected is None:
+            with pytest.raises(ValueError):
+                parse_setup_static(setup_filename, parsed)
+        else:
+            assert parse_setup_static(setup_filename, parsed) == expected
+
+    @pytest.mark.skipif(not os.path.isfile(DOC_WARDEN_SOURCE), reason="doc-warden source is not available")
+    def test_doc_warden_distutils_setup(self, tmp_path):
+        doc_warden = _load_doc_warden_parser()
+        _create_package(tmp_path, DISTUTILS_SETUP_PY)
+        setup_filename = str(tmp_path / "setup.py")
+        content = (tmp_path / "setup.py").read_bytes()
+        with pytest.raises(ValueError):
+            doc_warden.parse_setup_static(setup_filename, ast.parse(content))
+        # setup.py is run with mocked setup of distutils
+        config = types.SimpleNamespace(verbose_output=False)
+        assert doc_warden._parse_setup_content(config, setup_filename, content) == ("azure-dummy", "3.0.0")
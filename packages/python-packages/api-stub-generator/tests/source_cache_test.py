@@ -0,0 +1,60 @@
+# -------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for
+# license information.
+# --------------------------------------------------------------------------
+
+import functools
+import importlib.util
+import inspect
+
+from apistub.nodes._source_cache import get_decorators, get_function_def, get_source
+
+sample_source = '''import functools
+
+
+def trace(func):
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        return func(*args, **kwargs)
+    return wrapper
+
+
+class Client(object):
+
+    @classmethod
+    @trace
+    def create(cls, url):
+        # type: (str) -> Client
+        return cls()
+        # Trailing comment is part of source
+
+    @functools.lru_cache()
+    async def get(self, name):
+        return name
+'''
+
+
+def _load_sample(tmp_path):
+    path = tmp_path / "sample_source_cache.py"
+    path.write_text(sample_source)
+    spec = importlib.util.spec_from_file_location("sample_source_cache", str(path))
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+class TestSourceCache:
+
+    def test_source_same_as_inspect(self, tmp_path):
+        module = _load_sample(tmp_path)
+        for func in [module.trace, module.Client.create, module.Client.get]:
+            assert get_source(func) == inspect.getsource(func)
+
+    def test_decorators(self, tmp_path):
+        module = _load_sample(tmp_path)
+        assert get_decorators(get_function_def(module.Client.create)) == ["@classmethod", "@trace"]
+        assert get_decorators(get_function_def(module.Client.get)) == []
+
+    def test_source_not_available(self):
+        assert get_function_def(functools.reduce) is None
@@ -0,0 +1,145 @@
+# -------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for
+# license information.
+# --------------------------------------------------------------------------
+
+import os
+import sys
+
+from apistub import ApiView, Navigation
+from apistub._stub_generator import NodeIndex, _clear_cached_modules, _create_module_node
+from apistub.nodes import ClassNode, EnumNode, FunctionNode, PropertyNode, VariableNode
+from apistub.nodes._static_nodes import StaticModuleNode, load_static_module, static_search_path
+
+models_source = '''
+from enum import Enum
+
+
+class Color(str, Enum):
+    RED = "red"
+    BLUE = "blue"
+
+
+class Widget(object):
+    """Widget
+
+    :ivar str name: Name of widget
+    """
+    LABEL = "widget"
+
+    def __init__(self, size=3, **kwargs):
+        self.size = size
+
+    @property
+    def area(self):
+        # type: () -> int
+        return 1
+
+    @property
+    def title(self):
+        """Title
+
+        :rtype: str
+        """
+        return ""
+
+    @title.setter
+    def title(self, value):
+        pass
+
+    @classmethod
+    def from_dict(cls, data, **kwargs):
+        # type: (dict, Any) -> Widget
+        return cls()
+
+    async def refresh(self, *, force: bool = False, **kwargs) -> "Widget":
+        pass
+
+    def _private(self):
+        pass
+'''
+
+init_source = '''
+from ._models import Color, Widget
+
+__all__ = ["Color", "Widget"]
+'''
+
+
+class TestStaticNodes:
+
+    def _create_package(self, root):
+        pkg_dir = os.path.join(root, "staticpkg")
+        os.mkdir(pkg_dir)
+        with open(os.path.join(pkg_dir, "__init__.py"), "w") as f:
+            f.write(init_source)
+        with open(os.path.join(pkg_dir, "_models.py"), "w") as f:
+            f.write(models_source)
+
+    def _parse(self, tmp_path):
+        self._create_package(str(tmp_path))
+        with static_search_path(str(tmp_path)):
+            module = load_static_module("staticpkg", str(tmp_path))
+            return StaticModuleNode("staticpkg", module, NodeIndex())
+
+    def test_module_members(self, tmp_path):
+        module_node = self._parse(tmp_path)
+        assert "staticpkg" not in sys.modules
+        assert [x.name for x in module_node.child_nodes] == ["Color", "Widget"]
+        assert all(isinstance(x, ClassNode) for x in module_node.child_nodes)
+        assert module_node.nodeindex.get_id("staticpkg.Widget") == "staticpkg.Widget"
+
+    def test_sys_path_is_restored(self, tmp_path):
+        sys_path = list(sys.path)
+        # Same package parsed again from another root path in same process is not resolved from earlier root
+        for root in [tmp_path / "v1", tmp_path / "v2"]:
+            root.mkdir()
+            self._create_package(str(root))
+            _clear_cached_modules(["staticpkg"], True)
+            module_node = _create_module_node("staticpkg", NodeIndex(), str(root), find_source_files=True)
+            assert sys.path == sys_path
+            # Names imported from other modules in package are resolved while parsing
+            assert [x.name for x in module_node.child_nodes] == ["Color", "Widget"]
+            assert os.path.join(str(root), "staticpkg", "_models.py") in module_node.source_files
+
+    def test_enum_members(self, tmp_path):
+        color = self._parse(tmp_path).child_nodes[0]
+        assert color.is_enum
+        assert color.base_class_names == ["str", "Enum"]
+        assert [(x.name, x.value) for x in color.child_nodes if isinstance(x, EnumNode)] == [("BLUE", "blue"), ("RED", "red")]
+
+    def test_class_members(self, tmp_path):
+        widget = self._parse(tmp_path).child_nodes[1]
+        properties = dict((x.name, x) for x in widget.child_nodes if isinstance(x, PropertyNode))
+        assert properties["area"].type == "int" and properties["area"].read_only
+        assert properties["title"].type == "str" and not properties["title"].read_only
+
+        variables = dict((x.name, x) for x in widget.child_nodes if isinstance(x, VariableNode))
+        assert variables["LABEL"].value == "widget"
+        assert variables["name"].type == "str"
+
+        functions = dict((x.name, x) for x in widget.child_nodes if isinstance(x, FunctionNode))
+        assert sorted(functions) == ["__init__", "from_dict", "refresh"]
+        assert functions["from_dict"].is_class_method
+        assert [x.argname for x in functions["from_dict"].args] == ["cls", "data", "**kwargs"]
+        assert functions["from_dict"].return_type == "Widget"
+
+        refresh = functions["refresh"]
+        assert refresh.is_async
+        assert [(x.argname, x.argtype, x.default) for x in refresh.args] == [
+            ("self", None, ""), ("*", None, None), ("force", "bool", "False"), ("**kwargs", None, "")
+        ]
+
+    def test_navigation(self, tmp_path):
+        module_node = self._parse(tmp_path)
+        apiview = ApiView(module_node.nodeindex, "staticpkg", "1.0.0", "staticpkg")
+        navigation = Navigation("staticpkg", None)
+        # Navigation of module is added while generating tokens
+        module_node.generate_tokens(apiview, navigation)
+        module_nav = navigation.ChildItems[0]
+        assert (module_nav.NavigationId, module_nav.Tags.TypeKind) == ("staticpkg", "namespace")
+        assert [(x.NavigationId, x.Tags.TypeKind) for x in module_nav.ChildItems] == [
+            ("staticpkg.Color", "enum"), ("staticpkg.Widget", "class")
+        ]
+        assert "staticpkg.Widget" in [x.DefinitionId for x in apiview.Tokens]
@@ -0,0 +1,88 @@
+# -------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for
+# license information.
+# --------------------------------------------------------------------------
+
+import json
+import os
+
+from apistub import StubGenerator
+from apistub._token_cache import TokenCache
+
+
+WHEEL_FILES = {
+    "azure/edge/__init__.py": "class EdgeClient(object):\n    def close(self):\n        pass\n",
+    "azure/edge/aio/__init__.py": "class AsyncEdgeClient(object):\n    pass\n",
+}
+
+
+class TestTokenCache:
+
+    def _create_file(self, path, content):
+        with open(path, "w") as f:
+            f.write(content)
+        return path
+
+    def test_cache_miss_and_hit(self, tmp_path):
+        cache = TokenCache(str(tmp_path / "cache"))
+        pkg_path = self._create_file(str(tmp_path / "pkg-1.0.0-py3-none-any.whl"), "wheel content")
+        token_path = self._create_file(str(tmp_path / "tokens.json"), '{"Name": "pkg"}')
+
+        key = cache.get_key(pkg_path)
+        assert cache.get(key) is None
+        cache.add(key, token_path)
+        cached_path = cache.get(key)
+        assert cached_path
+        with open(cached_path) as f:
+            assert f.read() == '{"Name": "pkg"}'
+
+    def test_key_changes_with_content(self, tmp_path):
+        cache = TokenCache(str(tmp_path / "cache"))
+        pkg_path = self._create_file(str(tmp_path / "pkg.whl"), "wheel content")
+        key = cache.get_key(pkg_path)
+        self._create_file(pkg_path, "updated wheel content")
+        assert key != cache.get_key(pkg_path)
+
+    def test_least_recently_used_entry_is_evicted(self, tmp_path):
+        cache = TokenCache(str(tmp_path / "cache"), max_size=25)
+        token_path = self._create_file(str(tmp_path / "tokens.json"), "x" * 10)
+        cache.add("first", token_path)
+        cache.add("second", token_path)
+        # Mark first entry as older than second entry and use it so it becomes recently used
+        first_path = cache.get("first")
+        os.utime(cache.get("second"), (0, 0))
+        os.utime(first_path, None)
+        cache.add("third", token_path)
+
+        assert cache.get("first")
+        assert cache.get("second") is None
+        assert cache.get("third")
+
+    def test_key_changes_with_options(self, tmp_path):
+        cache = TokenCache(str(tmp_path / "cache"))
+        pkg_path = self._create_file(str(tmp_path / "pkg.whl"), "wheel content")
+        assert cache.get_key(pkg_path, {"Static": True}) != cache.get_key(pkg_path, {"Static": False})
+        assert cache.get_key(pkg_path, {"Static": True}) == cache.get_key(pkg_path, {"Static": True})
+
+    def test_filtered_token_file_is_not_reused_for_other_filter(self, create_wheel, tmp_path):
+        wheel_path = create_wheel("azure-edge", WHEEL_FILES)
+
+        def generate(filter_namespace):
+            out_path = tmp_path / filter_namespace
+            out_path.mkdir()
+            stub_generator = StubGenerator([
+                "--pkg-path", str(wheel_path), "--out-path", str(out_path), "--static", "--hide-report",
+                "--cache-dir", str(tmp_path / "cache"), "--filter-namespace", filter_namespace,
+            ])
+            token_file_path, _ = stub_generator.generate_token_file()
+            with open(token_file_path) as token_file:
+                return [x["Value"] for x in json.load(token_file)["Tokens"]]
+
+        edge_values = generate("azure.edge")
+        aio_values = generate("azure.edge.aio")
+        assert "azure.edge.EdgeClient" in edge_values
+        assert "azure.edge.EdgeClient" not in aio_values
+        assert "azure.edge.aio.AsyncEdgeClient" in aio_values
+        # Token file of each filter is cached separately
+        assert len(os.listdir(str(tmp_path / "cache"))) == 2
@@ -0,0 +1,95 @@
+# -------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for
+# license information.
+# --------------------------------------------------------------------------
+
+import os
+
+import pytest
+
+from apistub import StubGenerator
+from apistub._token_sink import JsonFileSink, TokenCountSink, TokenSink
+
+
+WHEEL_FILES = {
+    "azure/sinks/__init__.py": "from ._client import Client\n\n__all__ = ['Client']\n",
+    "azure/sinks/_client.py": (
+        "class Client(object):\n"
+        "    \"\"\"Client\n\n    :ivar str endpoint: Endpoint\n    \"\"\"\n\n"
+        "    def get(self, name: str, **kwargs) -> str:\n        return name\n\n"
+        "    def close(self):\n        pass\n"
+    ),
+}
+
+
+class _FailingSink(TokenSink):
+
+    def add_token(self, token):
+        raise ValueError("Failed to add token")
+
+
+class _FailingCloseSink(TokenSink):
+
+    def add_token(self, token):
+        pass
+
+    def close(self, apiview):
+        raise IOError("Failed to write output")
+
+
+class TestTokenSink:
+
+    def _create_generator(self, create_wheel, tmp_path, *options):
+        wheel_path = create_wheel("azure-sinks", WHEEL_FILES)
+        args = ["--pkg-path", str(wheel_path), "--out-path", str(tmp_path), "--static", "--hide-report"]
+        return StubGenerator(args + list(options))
+
+    def test_sink_must_implement_add_token(self):
+        with pytest.raises(TypeError):
+            TokenSink()
+
+    def test_sinks_receive_tokens(self, create_wheel, tmp_path):
+        stub_generator = self._create_generator(create_wheel, tmp_path)
+        json_path = str(tmp_path / "streamed.json")
+        token_counter = TokenCountSink()
+        apiview = stub_generator.generate_tokens([JsonFileSink(json_path, chunk_size=7), token_counter])
+        assert token_counter.token_count == len(apiview.Tokens)
+        assert token_counter.diagnostic_count == len(apiview.Diagnostics)
+
+        # Streamed JSON file is same as token file written from API view
+        token_file_path = stub_generator.get_out_file_path(apiview.Name)
+        stub_generator.serialize_to_file(apiview, token_file_path)
+        with open(json_path) as streamed_file, open(token_file_path) as token_file:
+            assert streamed_file.read() == token_file.read()
+
+    def test_stub_file(self, create_wheel, tmp_path):
+        stub_generator = self._create_generator(create_wheel, tmp_path, "--stub-file")
+        token_file_path, _ = stub_generator.generate_token_file()
+        stub_path = stub_generator.get_stub_file_path("azure-sinks")
+        assert stub_path == os.path.splitext(token_file_path)[0] + ".pyi"
+        with open(stub_path) as stub_file:
+            lines = stub_file.read().splitlines()
+        assert "class azure.sinks.Client:" in lines
+        assert "    def close(self)" in lines
+        # Signature is listed in multiple lines same as API view
+        assert "            name: str," in lines
+        assert all(x == x.rstrip() for x in lines)
+
+    def test_sinks_are_discarded_on_failure(self, create_wheel, tmp_path):
+        stub_generator = self._create_generator(create_wheel, tmp_path, "--stub-file")
+        with pytest.raises(ValueError):
+            stub_generator.generate_tokens([_FailingSink()])
+        assert not os.path.exists(stub_generator.get_stub_file_path("azure-sinks"))
+
+    def test_sinks_are_discarded_if_close_fails(self, create_wheel, tmp_path):
+        stub_generator = self._create_generator(create_wheel, tmp_path, "--stub-file")
+        json_path = str(tmp_path / "streamed.json")
+        json_sink = JsonFileSink(json_path)
+        with pytest.raises(IOError):
+            stub_generator.generate_tokens([_FailingCloseSink(), json_sink])
+        # Stub file sink is closed before the failing sink. Sinks after it are discarded
+        assert os.path.exists(stub_generator.get_stub_file_path("azure-sinks"))
+        assert not os.path.exists(json_path)
+        assert json_sink._encoded_tokens.closed
+        assert stub_generator.archive is None
@@ -0,0 +1,48 @@
+# -------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for
+# license information.
+# --------------------------------------------------------------------------
+
+import pytest
+
+from apistub import Token, TokenKind
+from apistub._apiview import APIViewEncoder, APIViewSerializer
+
+# JSON of tokens generated before tokens used slots
+EXPECTED_JSON = (
+    '[{"Kind": 4, "Value": "class"}, '
+    '{"Kind": 6, "DefinitionId": "azure.dummy.Model", "Value": "Model"}, '
+    '{"Kind": 2, "Value": " "}, '
+    '{"Kind": 6, "NavigateToId": "azure.dummy.Model", "Value": "Model"}]'
+)
+
+
+def _create_tokens():
+    definition = Token("Model", TokenKind.TypeName)
+    definition.set_definition_id("azure.dummy.Model")
+    reference = Token("Model", TokenKind.TypeName)
+    reference.set_navigation_id("azure.dummy.Model")
+    return [Token("class", TokenKind.Keyword), definition, Token(" ", TokenKind.Whitespace), reference]
+
+
+class TestToken:
+
+    def test_json_is_unchanged(self):
+        assert APIViewEncoder().encode(_create_tokens()) == EXPECTED_JSON
+        assert APIViewSerializer().encode(_create_tokens()) == EXPECTED_JSON
+
+    def test_token_has_no_dict(self):
+        token = Token("Model", TokenKind.TypeName)
+        assert not hasattr(token, "__dict__")
+        with pytest.raises(AttributeError):
+            token.Name = "Model"
+
+    def test_values_are_interned(self):
+        # Values created at run time are same object when they are equal
+        first = Token("".join(["Mod", "el"]))
+        second = Token("".join(["Mo", "del"]))
+        assert first.Value is second.Value
+        second.set_value("".join(["Wid", "get"]))
+        assert second.Value == "Widget"
+        assert second.Value is Token("Widget").Value
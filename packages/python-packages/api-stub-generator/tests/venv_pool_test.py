@@ -0,0 +1,131 @@
+# -------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for
+# license information.
+# --------------------------------------------------------------------------
+
+import os
+import subprocess
+import sys
+
+import pytest
+
+from apistub._venv_pool import LEASE_FILE_EXTENSION, READY_FILE, VirtualEnv, VirtualEnvPool, _get_source_hash
+
+APISTUB_PATH = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Leases a virtual environment and exits without returning it
+LEASE_AND_EXIT_SOURCE = """
+import os, sys
+from apistub._venv_pool import VirtualEnvPool
+venv_path, _ = VirtualEnvPool(sys.argv[1], size=1, common_packages=[])._try_lease()
+assert venv_path
+os._exit(0)
+"""
+
+
+def _create_ready_venvs(pool):
+    # Mark virtual environments as ready so tests do not create real virtual environments
+    for index in range(pool.size):
+        venv_path = os.path.join(pool.pool_path, "venv{}".format(index))
+        os.makedirs(venv_path)
+        with open(os.path.join(venv_path, READY_FILE), "w") as ready_file:
+            ready_file.write("test")
+
+
+class TestVirtualEnvPool:
+
+    def _create_pool(self, tmp_path, size=1):
+        pool = VirtualEnvPool(str(tmp_path / "pool"), size=size, common_packages=[])
+        _create_ready_venvs(pool)
+        return pool
+
+    def test_lease_and_release(self, tmp_path):
+        pool = self._create_pool(tmp_path, size=2)
+        with pool.lease() as first_venv:
+            with pool.lease() as second_venv:
+                assert first_venv.path != second_venv.path
+                with open(first_venv.path + LEASE_FILE_EXTENSION) as lease_file:
+                    assert lease_file.read() == str(os.getpid())
+        # Both virtual environments are free after release
+        with pool.lease(timeout=0) as venv:
+            assert venv.path == first_venv.path
+            with pool.lease(timeout=0) as venv:
+                assert venv.path == second_venv.path
+
+    def test_release_on_error(self, tmp_path):
+        pool = self._create_pool(tmp_path)
+        with pytest.raises(ValueError):
+            with pool.lease():
+                raise ValueError("Failed to parse package")
+        with pool.lease(timeout=0) as venv:
+            assert venv.is_ready()
+
+    def test_exhausted_pool_times_out(self, tmp_path):
+        pool = self._create_pool(tmp_path)
+        with pool.lease():
+            with pytest.raises(RuntimeError):
+                with pool.lease(timeout=0):
+                    pass
+            # Pool shared by another instance is also exhausted
+            other_pool = VirtualEnvPool(pool.pool_path, size=1, common_packages=[])
+            assert other_pool._try_lease() == (None, None)
+
+    def test_stale_lease_is_reclaimed(self, tmp_path):
+        pool = self._create_pool(tmp_path)
+        env = dict(os.environ)
+        env["PYTHONPATH"] = APISTUB_PATH
+        subprocess.check_call([sys.executable, "-c", LEASE_AND_EXIT_SOURCE, pool.pool_path], env=env)
+        lease_path = os.path.join(pool.pool_path, "venv0" + LEASE_FILE_EXTENSION)
+        with open(lease_path) as lease_file:
+            dead_pid = lease_file.read()
+        assert dead_pid != str(os.getpid())
+
+        with pool.lease(timeout=0) as venv:
+            with open(lease_path) as lease_file:
+                assert lease_file.read() == str(os.getpid())
+            # Reclaimed lease is not taken by another process while it is held
+            assert VirtualEnvPool(pool.pool_path, size=1, common_packages=[])._try_lease() == (None, None)
+
+    def test_existing_venv_is_reused(self, tmp_path, monkeypatch):
+        pool = self._create_pool(tmp_path)
+        created_paths = []
+        monkeypatch.setattr(VirtualEnv, "create", lambda venv, packages: created_paths.append(venv.path))
+        for _ in range(2):
+            with pool.lease() as venv:
+                assert venv.path == os.path.join(pool.pool_path, "venv0")
+        assert created_paths == []
+
+    def test_venv_is_created_on_first_lease(self, tmp_path, monkeypatch):
+        pool = VirtualEnvPool(str(tmp_path / "pool"), size=1, common_packages=[])
+
+        def create(venv, packages):
+            os.makedirs(venv.path)
+            open(os.path.join(venv.path, READY_FILE), "w").close()
+            created_paths.append(venv.path)
+
+        created_paths = []
+        monkeypatch.setattr(VirtualEnv, "create", create)
+        for _ in range(2):
+            with pool.lease():
+                pass
+        assert created_paths == [os.path.join(pool.pool_path, "venv0")]
+
+    def test_apistub_is_copied_once(self, tmp_path):
+        pool = VirtualEnvPool(str(tmp_path / "pool"), size=1, common_packages=[])
+        apistub_path = pool.get_apistub_path()
+        assert os.path.exists(os.path.join(apistub_path, "apistub", "_venv_pool.py"))
+        assert not os.path.exists(os.path.join(apistub_path, "apistub", "__pycache__"))
+        assert pool.get_apistub_path() == apistub_path
+
+    def test_source_hash_changes_with_source(self, tmp_path):
+        source_path = tmp_path / "apistub"
+        (source_path / "nodes").mkdir(parents=True)
+        (source_path / "nodes" / "_class_node.py").write_text("class ClassNode: pass\n")
+        source_hash = _get_source_hash(str(source_path))
+        # Compiled files are not part of the hash
+        (source_path / "__pycache__").mkdir()
+        (source_path / "__pycache__" / "_version.cpython-38.pyc").write_bytes(b"pyc")
+        assert _get_source_hash(str(source_path)) == source_hash
+        (source_path / "nodes" / "_class_node.py").write_text("class ClassNode: pass\n# Fixed\n")
+        assert _get_source_hash(str(source_path)) != source_hash
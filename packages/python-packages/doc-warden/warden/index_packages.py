@@ -7,7 +7,10 @@ from .warden_common import check_match, walk_directory_for_pattern, get_omitted_
 from .PackageInfo import PackageInfo
 import json
 import os
+import sys
 import ast
+import hashlib
+import subprocess
 from jinja2 import Template
 import xml.etree.ElementTree as ET
 import textwrap
@@ -361,55 +364,153 @@ def unrecognized_option(configuration):
 
 # opens setup.py and leverages AST to intercept the parameters TO setup.py 
 # this easily allows us to examine the values that may originate from outside this file (like VERSION)
-def parse_setup(config, setup_filename):
-    mock_setup = textwrap.dedent('''\
+# runs setup.py in a separate process with a mocked `setup` so a misbehaving setup.py can't change the state
+# (current directory, sys.modules) of warden itself
+SETUP_SCRIPT = textwrap.dedent('''\
+    import json, sys
+    import setuptools
+    calls = []
     def setup(*args, **kwargs):
-        __setup_calls__.append((args, kwargs))
-    ''')
-
-    parsed_mock_setup = ast.parse(mock_setup, filename=setup_filename)
-    with open(setup_filename, 'rt') as setup_file:
-        try:
-            parsed = ast.parse(setup_file.read())
-        except:
-            if config.verbose_output:
-                print('{} was unparsable.'.format(setup_filename))
-            return None, None
-        for index, node in enumerate(parsed.body[:]):
-            if (
-                not isinstance(node, ast.Expr) or
-                not isinstance(node.value, ast.Call) or
-                not hasattr(node.value.func, 'id') or
-                node.value.func.id != 'setup'
-            ):
-                continue
-            parsed.body[index:index] = parsed_mock_setup.body
-            break
+        calls.append(kwargs)
+    setuptools.setup = setup
+    # setup.py that imports setup from distutils must not run the real setup either
+    try:
+        import distutils.core
+        distutils.core.setup = setup
+    except ImportError:
+        pass
+    sys.argv = [sys.argv[1]]
+    with open(sys.argv[0], 'rb') as setup_file:
+        code = compile(setup_file.read(), sys.argv[0], 'exec')
+    exec(code, {'__name__': '__main__', '__file__': sys.argv[0]})
+    print(json.dumps([calls[0].get('name'), calls[0].get('version')]))
+''')
+
+# (pkg_id, version) of each setup.py parsed in this run, keyed by path and content hash
+_setup_cache = {}
+
+def parse_setup(config, setup_filename):
+    with open(setup_filename, 'rb') as setup_file:
+        content = setup_file.read()
 
-    fixed = ast.fix_missing_locations(parsed)
-    codeobj = compile(fixed, setup_filename, 'exec')
-    local_vars = {}
-    global_vars = {'__setup_calls__': []}
-    current_dir = os.getcwd()
-    working_dir = os.path.dirname(setup_filename)
-    os.chdir(working_dir)
+    key = (os.path.abspath(setup_filename), hashlib.sha256(content).hexdigest())
+    if key not in _setup_cache:
+        _setup_cache[key] = _parse_setup_content(config, setup_filename, content)
+    return _setup_cache[key]
 
+def _parse_setup_content(config, setup_filename, content):
     try:
-        exec(codeobj, global_vars, local_vars)
+        parsed = ast.parse(content)
     except:
         if config.verbose_output:
-            print('{} ran into an exception during exec'.format(setup_filename))
+            print('{} was unparsable.'.format(setup_filename))
         return None, None
 
-    os.chdir(current_dir)
+    # the common forms of setup.py can be evaluated from the syntax tree without running it
     try:
-        _, kwargs = global_vars['__setup_calls__'][0]
-    except:
+        return parse_setup_static(setup_filename, parsed)
+    except ValueError:
+        pass
+
+    # Popen is used instead of subprocess.run to support python 3.4
+    process = subprocess.Popen(
+        [sys.executable, '-c', SETUP_SCRIPT, os.path.abspath(setup_filename)],
+        cwd = os.path.dirname(os.path.abspath(setup_filename)),
+        stdout = subprocess.PIPE,
+        stderr = subprocess.PIPE,
+        universal_newlines = True)
+    stdout, _ = process.communicate()
+    if process.returncode != 0:
         if config.verbose_output:
-            print('{} had no kwargs'.format(setup_filename))
+            print('{} ran into an exception during exec'.format(setup_filename))
         return None, None
 
-    version = kwargs['version']
-    pkg_id = kwargs['name']
+    pkg_id, version = json.loads(stdout.strip().splitlines()[-1])
+    return pkg_id, version
 
+# python 3.8 parses all literals as ast.Constant. earlier versions use a node type for each kind of literal
+if sys.version_info >= (3, 8):
+    LITERAL_NODES = (ast.Constant,)
+else:
+    LITERAL_NODES = (ast.Str, ast.Num, ast.NameConstant)
+
+def literal_value(node):
+    if sys.version_info >= (3, 8):
+        return node.value
+    if isinstance(node, ast.Num):
+        return node.n
+    return node.value if isinstance(node, ast.NameConstant) else node.s
+
+# evaluates `name` and `version` passed to `setup` using only literals, names assigned unconditionally at module
+# level (including within `with` blocks), string methods and a version read from a file with `re.search`.
+# raises ValueError for anything else.
+# api-stub-generator has a similar evaluator, but doc-warden is a separate distribution that supports older python
+# versions and can't depend on it. only name and version are needed here so `packages` and `find_packages` are
+# not evaluated and anything less common is left to the subprocess fallback
+def parse_setup_static(setup_filename, parsed):
+    setup_dir = os.path.dirname(os.path.abspath(setup_filename))
+    # name -> (value expression, names visible where it was assigned). None if assigned conditionally
+    scope = {}
+    setup_call = None
+    setup_scope = None
+
+    nodes = list(parsed.body)
+    while nodes:
+        node = nodes.pop(0)
+        if isinstance(node, ast.Assign) and len(node.targets) == 1 and isinstance(node.targets[0], ast.Name):
+            scope[node.targets[0].id] = (node.value, dict(scope))
+        elif isinstance(node, ast.With):
+            for item in node.items:
+                if isinstance(item.optional_vars, ast.Name):
+                    scope[item.optional_vars.id] = (item.context_expr, dict(scope))
+            nodes[0:0] = node.body
+        elif isinstance(node, ast.Expr) and isinstance(node.value, ast.Call) and getattr(node.value.func, 'id', None) == 'setup':
+            setup_call, setup_scope = node.value, dict(scope)
+            break
+        elif not isinstance(node, (ast.Import, ast.ImportFrom)):
+            for child in ast.walk(node):
+                if isinstance(child, ast.Name) and isinstance(child.ctx, ast.Store):
+                    scope[child.id] = None
+
+    if setup_call is None:
+        raise ValueError('setup call is not found at module level')
+
+    def evaluate(node, scope):
+        if isinstance(node, LITERAL_NODES):
+            return literal_value(node)
+        if isinstance(node, ast.Name):
+            if scope.get(node.id) is None:
+                raise ValueError('{} is not assigned statically'.format(node.id))
+            value, value_scope = scope[node.id]
+            return evaluate(value, value_scope)
+        if isinstance(node, ast.Attribute) and getattr(node.value, 'id', None) == 're':
+            return getattr(re, node.attr)
+        if isinstance(node, ast.Call) and not node.keywords:
+            args = [evaluate(arg, scope) for arg in node.args]
+            func = node.func
+            if isinstance(func, ast.Name) and func.id == 'open':
+                return ('file', os.path.join(setup_dir, args[0]))
+            if isinstance(func, ast.Attribute):
+                if ast.dump(func) == ast.dump(ast.parse('os.path.join', mode='eval').body):
+                    return os.path.join(*args)
+                if ast.dump(func) == ast.dump(ast.parse('re.search', mode='eval').body):
+                    return re.search(*args)
+                target = evaluate(func.value, scope)
+                if isinstance(target, str) and func.attr in ('replace', 'format', 'strip'):
+                    return getattr(target, func.attr)(*args)
+                if isinstance(target, tuple) and target[0] == 'file' and func.attr == 'read':
+                    with open(target[1], 'r') as opened_file:
+                        return opened_file.read()
+                if func.attr == 'group' and hasattr(target, 'group'):
+                    return target.group(*args)
+        raise ValueError('unsupported expression at line {}'.format(getattr(node, 'lineno', '?')))
+
+    kwargs = dict((keyword.arg, keyword.value) for keyword in setup_call.keywords)
+    try:
+        pkg_id = evaluate(kwargs['name'], setup_scope)
+        version = evaluate(kwargs['version'], setup_scope)
+    except (KeyError, IndexError, TypeError, IOError) as e:
+        raise ValueError(str(e))
+    if not isinstance(pkg_id, str) or not isinstance(version, str):
+        raise ValueError('name or version is not a string')
     return pkg_id, version
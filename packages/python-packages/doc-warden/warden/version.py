@@ -1 +1 @@
-VERSION = '0.7.1'
+VERSION = '0.7.2'